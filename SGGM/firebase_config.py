@@ -1,9 +1,12 @@
+import logging
 import os
 
 import firebase_admin
 from django.conf import settings
 from firebase_admin import credentials
 
+logger = logging.getLogger(__name__)
+
 
 def initialize_firebase():
     """
@@ -18,25 +21,21 @@ def initialize_firebase():
             )
 
             if not os.path.exists(cred_path):
-                print(
-                    f"❌ ERRO: Arquivo serviceAccountKey.json não encontrado em: {cred_path}"
+                logger.error(
+                    "serviceAccountKey.json não encontrado em %s; baixe o arquivo "
+                    "do Firebase Console e coloque neste caminho.",
+                    cred_path,
                 )
-                print("   Baixe o arquivo do Firebase Console e coloque neste caminho.")
                 return False
 
             cred = credentials.Certificate(cred_path)
             firebase_admin.initialize_app(cred)
 
-            print("✅ Firebase Admin SDK inicializado com sucesso!")
-            print(f"   Credenciais: {cred_path}")
+            logger.info("Firebase Admin SDK inicializado com %s", cred_path)
             return True
 
-        except Exception as e:
-            print(f"❌ Erro ao inicializar Firebase: {e}")
-            import traceback
-
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Erro ao inicializar o Firebase Admin SDK")
             return False
     else:
-        print("ℹ️ Firebase Admin SDK já está inicializado")
         return True
@@ -3,10 +3,12 @@ Configurações base compartilhadas por todos os ambientes.
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # ==============================================================================
 # BASE
@@ -66,6 +68,8 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 # ==============================================================================
 MIDDLEWARE = [
+    "core.metrics.MetricasMiddleware",
+    "core.instrumentation.InstrumentacaoMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -122,6 +126,46 @@ DATABASES = {
 #     }
 # }
 
+# ==============================================================================
+# CACHE
+# ==============================================================================
+# Padrão: memória do processo, aceito só com DEBUG. Fora dele, a checagem
+# core.E001 (core/checks.py) exige um cache compartilhado entre os workers
+# (ex.: CACHE_URL=redis://localhost:6379/1): a lista de negação dos refresh
+# tokens (core.api.tokens) e as respostas do Idempotency-Key
+# (core.api.idempotencia) precisam valer para todos eles
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# ==============================================================================
+# PASSWORD HASHERS
+# ==============================================================================
+# SENHA_HASHER escolhe o hasher das senhas novas: "pbkdf2" (padrão do Django),
+# "scrypt" ou "argon2" (requer o pacote argon2-cffi). Os demais continuam
+# aceitos para senhas antigas, que são regravadas com o escolhido no login.
+HASHERS_SENHA = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+}
+SENHA_HASHER = env("SENHA_HASHER", default="pbkdf2")
+if SENHA_HASHER not in HASHERS_SENHA:
+    raise ImproperlyConfigured(
+        f"SENHA_HASHER inválido: {SENHA_HASHER!r} "
+        f"(opções: {', '.join(HASHERS_SENHA)})"
+    )
+if SENHA_HASHER == "argon2":
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured("SENHA_HASHER=argon2 requer o pacote argon2-cffi")
+PASSWORD_HASHERS = [
+    HASHERS_SENHA[SENHA_HASHER],
+    *(hasher for nome, hasher in HASHERS_SENHA.items() if nome != SENHA_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+AUTHENTICATION_BACKENDS = ["core.backends.LoginBackend"]
+
 # ==============================================================================
 # PASSWORD VALIDATORS
 # ==============================================================================
@@ -165,30 +209,42 @@ EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
 # ==============================================================================
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.api.authentication.JWTAutenticacaoPorClaims",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
+        "core.api.renderers.MessagePackRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
+        "core.api.parsers.MessagePackParser",
         "rest_framework.parsers.MultiPartParser",
         "rest_framework.parsers.FormParser",
     ],
+    # Proxies reversos à frente da aplicação (nginx, balanceador). Com 0, o
+    # IP dos limites de requisição é o REMOTE_ADDR e o X-Forwarded-For,
+    # que o cliente pode forjar, é ignorado
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
 }
 
 # ==============================================================================
 # SIMPLE JWT
 # ==============================================================================
+# Access curto; o refresh é rotacionado a cada uso e os já usados ficam numa
+# lista de negação no cache (core.api.tokens), sem tabelas no banco
 SIMPLE_JWT = {
-    "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
+    "ACCESS_TOKEN_LIFETIME": timedelta(
+        minutes=env.int("JWT_ACCESS_MINUTOS", default=15)
+    ),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
-    "ROTATE_REFRESH_TOKENS": False,
+    "ROTATE_REFRESH_TOKENS": True,
+    # O app token_blacklist gravaria cada refresh no banco
     "BLACKLIST_AFTER_ROTATION": False,
-    "UPDATE_LAST_LOGIN": True,
+    # last_login é gravado em lote pelo LoginService (SGGM_LOGIN)
+    "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "VERIFYING_KEY": None,
@@ -202,6 +258,98 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
 }
 
+SGGM_LOGIN = {
+    "ULTIMO_LOGIN_INTERVALO": env.int("ULTIMO_LOGIN_INTERVALO", default=10),
+}
+
+# Log de alterações do /api/sync/: registros mais novos que o atraso ainda
+# não são entregues; os mais velhos que a retenção são expurgados pelo
+# comando expurgar_registros_alteracao (cron diário)
+SGGM_SINCRONIZACAO = {
+    "ATRASO_COMMIT_SEGUNDOS": env.int("SYNC_ATRASO_COMMIT_SEGUNDOS", default=2),
+    "RETENCAO_DIAS": env.int("SYNC_RETENCAO_DIAS", default=90),
+}
+
+# Lembretes push antes de eventos e ensaios (comando enviar_lembretes,
+# a cada JANELA_MINUTOS)
+SGGM_LEMBRETES = {
+    "ANTECEDENCIA_EVENTO_HORAS": env.int("LEMBRETE_EVENTO_HORAS", default=24),
+    "ANTECEDENCIA_ENSAIO_HORAS": env.int("LEMBRETE_ENSAIO_HORAS", default=3),
+    "JANELA_MINUTOS": env.int("LEMBRETE_JANELA_MINUTOS", default=5),
+}
+
+# Token bucket por músico nos endpoints de escrita (core.api.throttling);
+# capacidades e taxas por escopo podem ser ajustadas em "ESCOPOS"
+SGGM_LIMITES = {
+    "HABILITADO": env.bool("LIMITES_HABILITADO", default=True),
+    "ESCOPOS": {},
+}
+
+# Papel do usuário lido das claims do token (core.api.authentication); a
+# versão das credenciais é reconferida no banco a cada VERIFICACAO_TTL segundos
+SGGM_AUTENTICACAO = {
+    "VERIFICACAO_TTL": env.int("AUTENTICACAO_VERIFICACAO_TTL", default=60),
+}
+
+# ==============================================================================
+# PUB/SUB — eventos ao vivo (SSE)
+# ==============================================================================
+# Sem PUBSUB_REDIS_URL as atualizações só chegam a assinantes do mesmo processo.
+PUBSUB_REDIS_URL = env("PUBSUB_REDIS_URL", default="")
+SGGM_PUBSUB = (
+    {"BACKEND": "core.pubsub.RedisBackend", "OPTIONS": {"url": PUBSUB_REDIS_URL}}
+    if PUBSUB_REDIS_URL
+    else {"BACKEND": "core.pubsub.MemoriaBackend", "OPTIONS": {}}
+)
+
+# ==============================================================================
+# LOGGING
+# ==============================================================================
+LOG_LEVEL = env("LOG_LEVEL", default="INFO")
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "padrao": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "padrao"},
+    },
+    "loggers": {
+        "core": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+        "SGGM": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+        "sggm.perf": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+# ==============================================================================
+# PROFILING — instrumentação amostrada (core.instrumentation)
+# ==============================================================================
+SGGM_PROFILING = {
+    "HABILITADO": env.bool("PROFILING_HABILITADO", default=False),
+    "AMOSTRAGEM": env.float("PROFILING_AMOSTRAGEM", default=0.01),
+    "LIMIAR_LENTO_MS": env.int("PROFILING_LIMIAR_LENTO_MS", default=1000),
+    # "", "cprofile" ou "pyinstrument" (requer o pacote pyinstrument)
+    "CAPTURA": env("PROFILING_CAPTURA", default=""),
+    "DIRETORIO": env("PROFILING_DIRETORIO", default=str(BASE_DIR / "profiles")),
+}
+
+# ==============================================================================
+# MÉTRICAS — endpoint /metrics (core.metrics)
+# ==============================================================================
+SGGM_METRICAS = {
+    "HABILITADO": env.bool("METRICAS_HABILITADO", default=True),
+    # Snapshots dos workers (gunicorn) somados em /metrics; os de processos
+    # encerrados são descartados. Vazio = métricas apenas do processo que responde
+    "DIRETORIO": env(
+        "METRICAS_DIRETORIO",
+        default=os.path.join(tempfile.gettempdir(), "sggm-metricas"),
+    ),
+    "INTERVALO_GRAVACAO": env.int("METRICAS_INTERVALO_GRAVACAO", default=5),
+    # Sem token, /metrics só responde com DEBUG
+    "TOKEN": env("METRICAS_TOKEN", default=""),
+}
+
 # ==============================================================================
 # DEFAULT PRIMARY KEY
 # ==============================================================================
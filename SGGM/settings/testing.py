@@ -50,6 +50,7 @@ CORS_ALLOW_HEADERS = [
     "authorization",
     "content-type",
     "dnt",
+    "idempotency-key",
     "origin",
     "user-agent",
     "x-csrftoken",
@@ -82,3 +83,6 @@ LOGGING = {
     "version": 1,
     "disable_existing_loggers": True,
 }
+
+# Cache local em memória é suficiente aqui (checagem core.E001)
+EXIGIR_CACHE_COMPARTILHADO = False
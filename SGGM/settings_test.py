@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 # ==============================================================================
 MIDDLEWARE = [
+    "core.metrics.MetricasMiddleware",
+    "core.instrumentation.InstrumentacaoMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -111,12 +113,15 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 100,
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
+        "core.api.renderers.MessagePackRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
+        "core.api.parsers.MessagePackParser",
         "rest_framework.parsers.MultiPartParser",
         "rest_framework.parsers.FormParser",
     ],
+    "NUM_PROXIES": 0,
 }
 
 # ==============================================================================
@@ -134,6 +139,16 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
 AUTH_PASSWORD_VALIDATORS = []
+AUTHENTICATION_BACKENDS = ["core.backends.LoginBackend"]
+
+# Limites de requisição desligados (ligados só nos testes deles)
+SGGM_LIMITES = {"HABILITADO": False}
+
+# last_login gravado na hora (sem a thread de gravação em lote)
+SGGM_LOGIN = {"ULTIMO_LOGIN_INTERVALO": 0}
+
+# Registros de alteração entregues na hora (atraso só nos testes dele)
+SGGM_SINCRONIZACAO = {"ATRASO_COMMIT_SEGUNDOS": 0}
 
 # ==============================================================================
 # EMAIL
@@ -198,3 +213,6 @@ class DisableMigrations:
 
 
 MIGRATION_MODULES = DisableMigrations()
+
+# Cache local em memória é suficiente aqui (checagem core.E001)
+EXIGIR_CACHE_COMPARTILHADO = False
@@ -1,12 +1,13 @@
 from django.urls import include, path
-from rest_framework_simplejwt.views import TokenRefreshView
-
 from core.admin import admin_site
-from core.api.views import MyTokenObtainPairView
+from core.api.views import MyTokenObtainPairView, MyTokenRefreshView, TokenRevogarView
+from core.metrics import metricas_view
 
 urlpatterns = [
     path("admin/", admin_site.urls),
     path("api/", include("core.api.urls")),
     path("api/login/", MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/token/refresh/", MyTokenRefreshView.as_view(), name="token_refresh"),
+    path("api/token/revogar/", TokenRevogarView.as_view(), name="token_revogar"),
+    path("metrics", metricas_view, name="metrics"),
 ]
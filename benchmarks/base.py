@@ -0,0 +1,59 @@
+"""
+Utilitários compartilhados pelos benchmarks: configuração do Django,
+criação de um banco descartável com dados sintéticos e estatísticas.
+"""
+
+import io
+import os
+import statistics
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from pathlib import Path  # noqa: E402
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connections  # noqa: E402
+from core.api.serializers import MyTokenObtainPairSerializer  # noqa: E402
+
+
+def preparar_banco(musicos=30, eventos=60, musicas=100, por_evento=5):
+    """Recria o banco do benchmark e o popula. Retorna o usuário líder."""
+    connections.close_all()
+    Path(settings.DATABASES["default"]["NAME"]).unlink(missing_ok=True)
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+    call_command(
+        "seed_benchmark",
+        musicos=musicos,
+        eventos=eventos,
+        musicas=musicas,
+        escalas_por_evento=por_evento,
+        force=True,
+        verbosity=0,
+        stdout=io.StringIO(),
+    )
+    return User.objects.get(username="bench_0")
+
+
+def cabecalho_jwt(user):
+    # Mesmas claims do login, para o caminho de autenticação sem consultas
+    token = MyTokenObtainPairSerializer.get_token(user).access_token
+    return f"Bearer {token}"
+
+
+def resumir(tempos, duracao_total):
+    """Estatísticas em milissegundos de uma lista de durações em segundos."""
+    ordenados = sorted(tempos)
+    p95 = ordenados[max(0, int(len(ordenados) * 0.95) - 1)]
+    return {
+        "requisicoes": len(tempos),
+        "req_por_s": round(len(tempos) / duracao_total, 1),
+        "p50_ms": round(statistics.median(ordenados) * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+    }
@@ -0,0 +1,96 @@
+"""
+Benchmark de throughput: caminho síncrono (DRF) vs. assíncrono (ORM async).
+
+Uso:
+    python -m benchmarks.bench_async --requisicoes 300 --concorrencia 20
+
+O caminho síncrono é exercitado por um pool de threads (como workers sync do
+gunicorn); o assíncrono por corrotinas concorrentes em um único event loop.
+O resultado é impresso como JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.base import cabecalho_jwt, preparar_banco, resumir
+
+# Importados após o django.setup() feito em benchmarks.base
+from django.test import AsyncClient, Client
+
+from core.models import Evento
+
+
+def rotas(user):
+    evento_passado = Evento.objects.filter(comentarios_performance__isnull=False)
+    evento_id = evento_passado.values_list("id", flat=True).first()
+    musico_id = user.musico.id
+    # Cada par devolve o mesmo payload: mesmos filtros, ordem e tamanho de página
+    return {
+        "eventos_proximos": ("/api/eventos/proximos/", "/api/async/eventos/proximos/"),
+        "musicos_me": ("/api/musicos/me/", "/api/async/musicos/me/"),
+        "escalas_por_musico": (
+            f"/api/escalas/?musico={musico_id}",
+            f"/api/async/escalas/?musico={musico_id}",
+        ),
+        "comentarios_por_evento": (
+            f"/api/comentarios/?evento={evento_id}",
+            f"/api/async/comentarios/?evento={evento_id}",
+        ),
+    }
+
+
+def medir_sync(url, auth, requisicoes, concorrencia):
+    def chamar(_):
+        inicio = time.perf_counter()
+        response = Client().get(url, HTTP_AUTHORIZATION=auth)
+        assert response.status_code == 200, (url, response.status_code)
+        return time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        tempos = list(pool.map(chamar, range(requisicoes)))
+    return resumir(tempos, time.perf_counter() - inicio)
+
+
+async def medir_async(url, auth, requisicoes, concorrencia):
+    client = AsyncClient()
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def chamar():
+        async with semaforo:
+            inicio = time.perf_counter()
+            response = await client.get(url, headers={"AUTHORIZATION": auth})
+            assert response.status_code == 200, (url, response.status_code)
+            return time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    tempos = await asyncio.gather(*(chamar() for _ in range(requisicoes)))
+    return resumir(tempos, time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    args = parser.parse_args()
+
+    lider = preparar_banco()
+    auth = cabecalho_jwt(lider)
+
+    resultado = {}
+    for nome, (url_sync, url_async) in rotas(lider).items():
+        resultado[nome] = {
+            "sync": medir_sync(url_sync, auth, args.requisicoes, args.concorrencia),
+            "async": asyncio.run(
+                medir_async(url_async, auth, args.requisicoes, args.concorrencia)
+            ),
+        }
+
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
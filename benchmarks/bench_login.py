@@ -0,0 +1,99 @@
+"""
+Benchmark de throughput do login (POST /api/login/).
+
+Uso:
+    python -m benchmarks.bench_login --logins 200 --concorrencia 20
+    python -m benchmarks.bench_login --hashers pbkdf2,scrypt,argon2
+
+Para cada hasher de senha (argon2 requer o pacote argon2-cffi), mede logins
+concorrentes (pool de threads, como workers sync do gunicorn) com o
+``last_login`` gravado a cada login (como o ``UPDATE_LAST_LOGIN`` do Simple
+JWT) e em lote pelo ``LoginService``, com as consultas SQL de um login. O
+resultado é impresso como JSON.
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.base import preparar_banco, resumir
+
+# Importados após o django.setup() feito em benchmarks.base
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.management.commands.seed_benchmark import SENHA_PADRAO
+from core.services import LoginService
+
+HASHERS = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+}
+
+MODOS_ULTIMO_LOGIN = {"sincrono": 0, "em_lote": 10}
+
+
+def logar(username):
+    inicio = time.perf_counter()
+    response = Client().post(
+        "/api/login/", {"username": username, "password": SENHA_PADRAO}
+    )
+    assert response.status_code == 200, (username, response.status_code)
+    return time.perf_counter() - inicio
+
+
+def medir_logins(usernames, logins, concorrencia):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        tempos = list(
+            pool.map(logar, (usernames[i % len(usernames)] for i in range(logins)))
+        )
+    return resumir(tempos, time.perf_counter() - inicio)
+
+
+def medir_hasher(hasher, usernames, args):
+    resultado = {}
+    with override_settings(PASSWORD_HASHERS=[HASHERS[hasher]]):
+        User.objects.filter(username__in=usernames).update(
+            password=make_password(SENHA_PADRAO)
+        )
+        for modo, intervalo in MODOS_ULTIMO_LOGIN.items():
+            with override_settings(SGGM_LOGIN={"ULTIMO_LOGIN_INTERVALO": intervalo}):
+                resultado[modo] = medir_logins(
+                    usernames, args.logins, args.concorrencia
+                )
+                with CaptureQueriesContext(connection) as consultas:
+                    logar(usernames[0])
+                resultado[modo]["consultas_por_login"] = len(consultas.captured_queries)
+                LoginService.descarregar()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--hashers", default="pbkdf2,scrypt")
+    args = parser.parse_args()
+
+    preparar_banco()
+    usernames = list(
+        User.objects.filter(username__startswith="bench_").values_list(
+            "username", flat=True
+        )
+    )
+
+    resultado = {
+        hasher: medir_hasher(hasher, usernames, args)
+        for hasher in args.hashers.split(",")
+    }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
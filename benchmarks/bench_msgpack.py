@@ -0,0 +1,86 @@
+"""
+Benchmark de formato de resposta: JSON vs. MessagePack.
+
+Uso:
+    python -m benchmarks.bench_msgpack --repeticoes 200
+
+Para a listagem de eventos (EventoSerializer aninhado) e de músicas, mede o
+tamanho do payload (bruto e com gzip, como trafega com compressão no proxy)
+e o tempo de codificação de cada renderer. O resultado é impresso como JSON.
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+
+from benchmarks.base import cabecalho_jwt, preparar_banco
+
+# Importados após o django.setup() feito em benchmarks.base
+from django.test import Client
+from rest_framework.renderers import JSONRenderer
+
+from core.api.renderers import MSGPACK_MEDIA_TYPE, MessagePackRenderer
+
+ROTAS = {
+    "eventos": "/api/eventos/",
+    "musicas": "/api/musicas/",
+}
+
+FORMATOS = {
+    "json": ("application/json", JSONRenderer()),
+    "msgpack": (MSGPACK_MEDIA_TYPE, MessagePackRenderer()),
+}
+
+
+def medir_codificacao(renderer, dados, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        renderer.render(dados)
+        tempos.append(time.perf_counter() - inicio)
+    return round(statistics.median(tempos) * 1000, 3)
+
+
+def medir_rota(client, url, auth, repeticoes):
+    # Dados já serializados (dicts/listas), comuns aos dois renderers
+    response = client.get(url, HTTP_AUTHORIZATION=auth)
+    assert response.status_code == 200, (url, response.status_code)
+    dados = response.data
+
+    resultado = {}
+    for nome, (media_type, renderer) in FORMATOS.items():
+        response = client.get(url, HTTP_AUTHORIZATION=auth, HTTP_ACCEPT=media_type)
+        assert response["Content-Type"].startswith(media_type), response["Content-Type"]
+        resultado[nome] = {
+            "bytes": len(response.content),
+            "bytes_gzip": len(gzip.compress(response.content)),
+            "codificacao_p50_ms": medir_codificacao(renderer, dados, repeticoes),
+        }
+
+    resultado["reducao_bytes_pct"] = round(
+        100 * (1 - resultado["msgpack"]["bytes"] / resultado["json"]["bytes"]), 1
+    )
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    parser.add_argument("--eventos", type=int, default=100)
+    args = parser.parse_args()
+
+    lider = preparar_banco(eventos=args.eventos)
+    auth = cabecalho_jwt(lider)
+    client = Client()
+
+    resultado = {
+        nome: medir_rota(client, url, auth, args.repeticoes)
+        for nome, url in ROTAS.items()
+    }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
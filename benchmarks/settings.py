@@ -0,0 +1,29 @@
+"""
+Settings para os scripts de benchmark.
+
+Herda de settings_test, mas usa SQLite em arquivo (compartilhado entre as
+threads do caminho síncrono) e a autenticação JWT real da produção.
+"""
+
+import tempfile
+from pathlib import Path
+
+from SGGM.settings_test import *  # noqa: F401,F403
+from SGGM.settings_test import REST_FRAMEWORK
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": str(Path(tempfile.gettempdir()) / "sggm_benchmark.sqlite3"),
+    }
+}
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "core.api.authentication.JWTAutenticacaoPorClaims",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "rest_framework.permissions.IsAuthenticated",
+    ],
+}
@@ -1,3 +1,4 @@
+import logging
 from datetime import timedelta
 
 from django.contrib import admin
@@ -8,7 +9,18 @@ from django.template.response import TemplateResponse
 from django.urls import path
 from django.utils.timezone import now
 
-from .models import Artista, Escala, Evento, Instrumento, Musica, Musico
+from .models import (
+    Artista,
+    Escala,
+    Evento,
+    Instrumento,
+    ItemRepertorio,
+    Musica,
+    Musico,
+    SerieEvento,
+)
+
+logger = logging.getLogger(__name__)
 
 
 # =====================================================
@@ -121,6 +133,16 @@ class EscalaInline(admin.TabularInline):
     )
 
 
+# =====================================================
+# INLINE REPERTÓRIO (dentro do Evento)
+# =====================================================
+class ItemRepertorioInline(admin.TabularInline):
+    model = ItemRepertorio
+    extra = 1
+    autocomplete_fields = ("musica",)
+    fields = ("musica", "posicao")
+
+
 # =====================================================
 # EVENTO
 # =====================================================
@@ -131,8 +153,7 @@ class EventoAdmin(admin.ModelAdmin):
     date_hierarchy = "data_evento"
     ordering = ("-data_evento",)
 
-    autocomplete_fields = ("repertorio",)
-    inlines = [EscalaInline]
+    inlines = [ItemRepertorioInline, EscalaInline]
 
     fieldsets = (
         (
@@ -150,7 +171,7 @@ class EventoAdmin(admin.ModelAdmin):
         (
             "Detalhes",
             {
-                "fields": ("descricao", "repertorio"),
+                "fields": ("descricao",),
                 "classes": ("collapse",),
             },
         ),
@@ -205,6 +226,30 @@ class EventoAdmin(admin.ModelAdmin):
         return super().get_fieldsets(request, obj)
 
 
+# =====================================================
+# SÉRIE DE EVENTOS
+# =====================================================
+class SerieEventoAdmin(admin.ModelAdmin):
+    list_display = (
+        "nome",
+        "frequencia",
+        "dia_semana",
+        "horario",
+        "gerado_ate",
+        "ativa",
+    )
+    list_filter = ("frequencia", "tipo", "ativa")
+    search_fields = ("nome", "local")
+    autocomplete_fields = ("evento_modelo",)
+    readonly_fields = ("gerado_ate",)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        from core.services import RecorrenciaService
+
+        RecorrenciaService.gerar(obj)
+
+
 # =====================================================
 # ESCALA
 # =====================================================
@@ -320,12 +365,7 @@ class CustomAdminSite(admin.AdminSite):
     def dashboard_view(self, request):
         hoje = now()
 
-        print("\n" + "=" * 50)
-        print("🔍 [DASHBOARD] Iniciando dashboard_view")
-        print(f"   User: {request.user.username}")
-
         # ✅ SEMPRE calcular estatísticas gerais PRIMEIRO (para todos)
-        print("   📊 Calculando estatísticas gerais...")
 
         total_musicos = Musico.objects.all().count()
         total_musicas = Musica.objects.count()
@@ -337,11 +377,6 @@ class CustomAdminSite(admin.AdminSite):
             evento__data_evento__year=hoje.year,
         ).count()
 
-        print(f"   📊 Total Músicos: {total_musicos}")
-        print(f"   📊 Total Músicas: {total_musicas}")
-        print(f"   📊 Eventos futuros: {eventos_futuros}")
-        print(f"   📊 Escalas no mês: {escalas_mes}")
-
         periodo_bloqueio = hoje - timedelta(days=15)
 
         musicas_recentes = Musica.objects.filter(
@@ -410,11 +445,6 @@ class CustomAdminSite(admin.AdminSite):
             total_eventos=Count("eventos")
         ).order_by("-total_eventos")[:5]
 
-        print(f"   📊 Ranking músicas: {ranking_musicas.count()}")
-        print(
-            f"   📊 Próximo evento: {proximo_evento.nome if proximo_evento else 'Nenhum'}"
-        )
-
         # ✅ Contexto base com todas as estatísticas (para todos)
         context = dict(
             self.each_context(request),
@@ -435,7 +465,6 @@ class CustomAdminSite(admin.AdminSite):
         if hasattr(request.user, "musico"):
             musico = request.user.musico
             is_musico_comum = musico.tipo_usuario == "MUSICO"
-            print(f"   👤 Tipo usuário: {musico.tipo_usuario}")
 
             if is_musico_comum:
                 minhas_escalas = Escala.objects.filter(musico=musico)
@@ -465,11 +494,15 @@ class CustomAdminSite(admin.AdminSite):
                     }
                 )
 
-                print(f"   📊 Minhas escalas: {context['total_minhas_escalas']}")
-
-        print("✅ [DASHBOARD] Contexto preparado")
-        print(f"   Context keys: {list(context.keys())}")
-        print("=" * 50 + "\n")
+        logger.debug(
+            "Dashboard de %s: %s músicos, %s músicas, %s eventos futuros, "
+            "%s escalas no mês",
+            request.user.username,
+            total_musicos,
+            total_musicas,
+            eventos_futuros,
+            escalas_mes,
+        )
 
         return TemplateResponse(request, "admin/dashboard.html", context)
 
@@ -500,5 +533,6 @@ admin_site.register(Musico, MusicoAdmin)
 admin_site.register(Musica, MusicaAdmin)
 admin_site.register(Artista, ArtistaAdmin)
 admin_site.register(Evento, EventoAdmin)
+admin_site.register(SerieEvento, SerieEventoAdmin)
 admin_site.register(Escala, EscalaAdmin)
 admin_site.register(Instrumento, InstrumentoAdmin)
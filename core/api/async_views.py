@@ -0,0 +1,324 @@
+"""
+Caminho de leitura assíncrono (ASGI) para os endpoints mais consultados pelo
+app mobile em polling. As views usam o ORM assíncrono do Django e não passam
+pelo DRF; os dados são carregados por completo (select/prefetch) antes da
+serialização, que então roda sem nenhum acesso ao banco.
+"""
+
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Exists, OuterRef, Prefetch
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.timezone import now
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.api.authentication import JWTAutenticacaoPorClaims
+from core.api.permissions import Papel
+from core.models import (
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    ItemRepertorio,
+    Musica,
+    Musico,
+    ReacaoComentario,
+)
+from core.pubsub import canal_evento, get_backend
+
+from .renderers import MSGPACK_MEDIA_TYPE, empacotar
+from .serializers import (
+    ComentarioPerformanceAsyncSerializer,
+    EscalaSerializer,
+    EventoSerializer,
+    MusicoSerializer,
+)
+
+ESCALAS_SELECT = ("musico", "musico__user", "musico__instrumento_principal", "evento")
+# Mesma ordem padrão do EscalaViewSet síncrono
+ESCALAS_ORDEM = ("-evento__data_evento", "id")
+
+# Intervalo (s) entre comentários de keep-alive no stream SSE
+SSE_KEEPALIVE = 15
+
+
+# =====================================================
+# RESPOSTA (JSON ou MessagePack)
+# =====================================================
+def responder(request, dados, status_code=status.HTTP_200_OK):
+    """Mesma negociação das views DRF: MessagePack se o cliente aceitar."""
+    if MSGPACK_MEDIA_TYPE in request.headers.get("Accept", ""):
+        return HttpResponse(
+            empacotar(dados), content_type=MSGPACK_MEDIA_TYPE, status=status_code
+        )
+    return JsonResponse(dados, status=status_code, safe=False)
+
+
+# =====================================================
+# AUTENTICAÇÃO
+# =====================================================
+_autenticacao_jwt = JWTAutenticacaoPorClaims()
+
+
+def _papel(request):
+    """
+    ``Papel`` do usuário da requisição (JWT ou sessão), pela mesma
+    autenticação e regra de papéis das views DRF. None se não autenticado.
+    """
+    try:
+        resultado = _autenticacao_jwt.authenticate(request)
+    except AuthenticationFailed:
+        return None
+    user = resultado[0] if resultado else request.user
+    return Papel(user) if user.is_authenticated else None
+
+
+def requer_autenticacao(view):
+    """Injeta ``request.sggm_papel`` ou responde 401."""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        papel = await sync_to_async(_papel)(request)
+        if papel is None:
+            return responder(
+                request,
+                {"detail": "As credenciais de autenticação não foram fornecidas."},
+                status_code=status.HTTP_401_UNAUTHORIZED,
+            )
+        request.sggm_papel = papel
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+# =====================================================
+# PAGINAÇÃO (mesmo formato do PageNumberPagination)
+# =====================================================
+async def paginar(request, queryset):
+    """Retorna (dados_de_paginacao, objetos) ou None para página inválida."""
+    try:
+        pagina = int(request.GET.get("page", 1))
+    except (TypeError, ValueError):
+        return None
+
+    tamanho = api_settings.PAGE_SIZE
+    total = await queryset.acount()
+    ultima = max(1, -(-total // tamanho))
+    if pagina < 1 or pagina > ultima:
+        return None
+
+    inicio = (pagina - 1) * tamanho
+    objetos = [obj async for obj in queryset[inicio : inicio + tamanho]]
+
+    url = request.build_absolute_uri()
+    proxima = replace_query_param(url, "page", pagina + 1) if pagina < ultima else None
+    if pagina == 1:
+        anterior = None
+    elif pagina == 2:
+        anterior = remove_query_param(url, "page")
+    else:
+        anterior = replace_query_param(url, "page", pagina - 1)
+
+    return {"count": total, "next": proxima, "previous": anterior}, objetos
+
+
+def _filtrar_por_ids(request, queryset, campos):
+    """Aplica filtros ``?campo=<id>``; retorna (queryset, resposta_de_erro)."""
+    for campo in campos:
+        valor = request.GET.get(campo)
+        if not valor:
+            continue
+        if not valor.isdigit():
+            return None, responder(
+                request,
+                {campo: ["Informe um número inteiro válido."]},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = queryset.filter(**{f"{campo}_id": int(valor)})
+    return queryset, None
+
+
+def _pagina_invalida(request):
+    return responder(
+        request, {"detail": "Página inválida."}, status_code=status.HTTP_404_NOT_FOUND
+    )
+
+
+# =====================================================
+# VIEWS
+# =====================================================
+@require_GET
+@requer_autenticacao
+async def eventos_proximos(request):
+    """
+    Lista próximos eventos (futuros).
+    GET /api/async/eventos/proximos/?limit=10
+    """
+    try:
+        limit = int(request.GET.get("limit", 10))
+        limit = max(1, min(limit, 100))
+    except (ValueError, TypeError):
+        limit = 10
+
+    queryset = (
+        Evento.objects.filter(data_evento__gte=now())
+        .order_by("data_evento")
+        .prefetch_related(
+            Prefetch(
+                "repertorio",
+                queryset=Musica.objects.select_related("artista").order_by(
+                    *ItemRepertorio.ORDEM_MUSICAS
+                ),
+            ),
+            Prefetch(
+                "escalas",
+                queryset=Escala.objects.select_related(
+                    "musico", "musico__user", "musico__instrumento_principal"
+                ).prefetch_related("instrumentos"),
+            ),
+        )[:limit]
+    )
+    eventos = [evento async for evento in queryset]
+
+    return responder(request, EventoSerializer(eventos, many=True).data)
+
+
+@require_GET
+@requer_autenticacao
+async def musicos_me(request):
+    """
+    Retorna o perfil do músico autenticado.
+    GET /api/async/musicos/me/
+    """
+    papel = request.sggm_papel
+    if papel.musico is None:
+        return responder(
+            request,
+            {
+                "error": "Usuário não possui perfil de músico",
+                "details": "Este usuário não está vinculado a um perfil de músico",
+            },
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+    # Com autenticação por claims, o músico do papel só tem id e tipo
+    musico = await Musico.objects.select_related("user", "instrumento_principal").aget(
+        pk=papel.musico.pk
+    )
+    return responder(request, MusicoSerializer(musico).data)
+
+
+@require_GET
+@requer_autenticacao
+async def escalas_listar(request):
+    """
+    Lista escalas visíveis ao usuário, com filtro opcional por músico/evento.
+    GET /api/async/escalas/?musico=<id>&evento=<id>
+    """
+    papel = request.sggm_papel
+    queryset = (
+        Escala.objects.select_related(*ESCALAS_SELECT)
+        .prefetch_related("instrumentos")
+        .order_by(*ESCALAS_ORDEM)
+    )
+
+    if not papel.is_lider:
+        if papel.musico is None:
+            queryset = queryset.none()
+        else:
+            queryset = queryset.filter(musico_id=papel.musico.id)
+
+    queryset, erro = _filtrar_por_ids(request, queryset, ("musico", "evento"))
+    if erro:
+        return erro
+
+    pagina = await paginar(request, queryset)
+    if pagina is None:
+        return _pagina_invalida(request)
+
+    dados, escalas = pagina
+    dados["results"] = EscalaSerializer(escalas, many=True).data
+    return responder(request, dados)
+
+
+@require_GET
+@requer_autenticacao
+async def comentarios_listar(request):
+    """
+    Lista comentários de performance com filtros opcionais.
+    GET /api/async/comentarios/?evento=<id>&musica=<id>
+    """
+    papel = request.sggm_papel
+    musico = papel.musico
+    if musico is None:
+        return responder(
+            request,
+            {"detail": "Você não tem permissão para executar essa ação."},
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+
+    queryset = ComentarioPerformance.objects.select_related(
+        "evento", "musica", "autor"
+    ).annotate(
+        total_reacoes=Count("reacoes"),
+        eu_curto=Exists(
+            ReacaoComentario.objects.filter(
+                comentario=OuterRef("pk"), musico_id=musico.id
+            )
+        ),
+    )
+
+    queryset, erro = _filtrar_por_ids(request, queryset, ("evento", "musica"))
+    if erro:
+        return erro
+
+    pagina = await paginar(request, queryset)
+    if pagina is None:
+        return _pagina_invalida(request)
+
+    dados, comentarios = pagina
+    dados["results"] = ComentarioPerformanceAsyncSerializer(
+        comentarios,
+        many=True,
+        context={"musico": musico, "is_lider": papel.is_lider},
+    ).data
+    return responder(request, dados)
+
+
+@require_GET
+@requer_autenticacao
+async def evento_stream(request, pk):
+    """
+    Stream SSE com atualizações ao vivo do evento: confirmações de escala
+    ("confirmacao"), novos comentários ("comentario") e totais de reações
+    ("reacao"). Requer servidor ASGI.
+    GET /api/async/eventos/{id}/stream/
+    """
+    if not await Evento.objects.filter(pk=pk).aexists():
+        return responder(
+            request,
+            {"detail": "Não encontrado."},
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+    async def eventos():
+        async with get_backend().assinar(canal_evento(pk)) as assinatura:
+            yield f"retry: 5000\n: evento {pk}\n\n"
+            while True:
+                mensagem = await assinatura.receber(timeout=SSE_KEEPALIVE)
+                if mensagem is None:
+                    yield ": ping\n\n"
+                    continue
+                conteudo = json.loads(mensagem)
+                dados = json.dumps(conteudo["dados"], ensure_ascii=False)
+                yield f"event: {conteudo['tipo']}\ndata: {dados}\n\n"
+
+    response = StreamingHttpResponse(eventos(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
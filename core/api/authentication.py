@@ -0,0 +1,153 @@
+"""
+Autenticação JWT sem consulta ao banco por requisição.
+
+O ``JWTAuthentication`` padrão carrega o ``User`` a cada requisição e as
+permissões ainda buscam ``user.musico`` (e, em ``is_lider()``, de novo o
+usuário). Aqui o principal é montado a partir das claims do token
+(``user_id``, ``username``, ``is_superuser``, ``musico_id``,
+``tipo_usuario``): são instâncias reais de ``User`` e ``Musico`` com os
+demais campos adiados, então o código existente continua funcionando e
+só consulta o banco se precisar de um campo que não veio no token.
+
+Revogação: o token carrega a claim ``versao``, uma impressão digital da
+senha, do status e do papel do usuário. Ela é comparada com a versão
+atual, guardada em cache por ``VERIFICACAO_TTL`` segundos e descartada
+quando o usuário ou o músico são salvos. Trocar a senha, desativar o
+usuário ou mudar o papel invalida os tokens emitidos antes (em outros
+processos, no máximo após o TTL). Configuração em
+``settings.SGGM_AUTENTICACAO``:
+
+    SGGM_AUTENTICACAO = {
+        "VERIFICACAO_TTL": 60,  # segundos
+    }
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.crypto import salted_hmac
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from core.metrics import registrar_cache
+from core.models import Musico
+
+PADRAO = {"VERIFICACAO_TTL": 60}
+
+CACHE_VERSAO = "auth:versao"
+# Usuário inexistente ou inativo (None não distingue ausência no cache)
+_REVOGADO = ""
+
+
+def configuracao():
+    return {**PADRAO, **getattr(settings, "SGGM_AUTENTICACAO", {})}
+
+
+# -------------------------
+# VERSÃO DAS CREDENCIAIS
+# -------------------------
+def versao_credenciais(
+    password, username, is_superuser, musico_id=None, tipo_usuario=None
+):
+    """Impressão digital do que o token afirma sobre o usuário."""
+    valor = f"{password}|{username}|{is_superuser}|{musico_id}|{tipo_usuario}"
+    return salted_hmac("core.api.authentication", valor).hexdigest()[:16]
+
+
+def versao_do_usuario(user):
+    """Versão atual de ``user`` (usada ao emitir o token)."""
+    musico = getattr(user, "musico", None)
+    return versao_credenciais(
+        user.password,
+        user.username,
+        user.is_superuser,
+        musico.id if musico else None,
+        musico.tipo_usuario if musico else None,
+    )
+
+
+def versao_atual(user_id):
+    """Versão vigente no banco, em cache; ``_REVOGADO`` se inativo."""
+    chave = f"{CACHE_VERSAO}:{user_id}"
+    versao = cache.get(chave)
+    registrar_cache("auth_versao", hit=versao is not None)
+    if versao is None:
+        linha = (
+            User.objects.filter(pk=user_id, is_active=True)
+            .values_list(
+                "password",
+                "username",
+                "is_superuser",
+                "musico__id",
+                "musico__tipo_usuario",
+            )
+            .first()
+        )
+        versao = versao_credenciais(*linha) if linha else _REVOGADO
+        cache.set(chave, versao, configuracao()["VERIFICACAO_TTL"])
+    return versao
+
+
+def invalidar_versao(*user_ids):
+    """Descarta a versão em cache (chamado ao salvar usuário ou músico)."""
+    cache.delete_many([f"{CACHE_VERSAO}:{user_id}" for user_id in user_ids])
+
+
+# -------------------------
+# PRINCIPAL A PARTIR DAS CLAIMS
+# -------------------------
+def _instancia(modelo, valores):
+    """Instância "carregada" só com ``valores``; os demais campos ficam adiados."""
+    campos = [f.attname for f in modelo._meta.concrete_fields if f.attname in valores]
+    return modelo.from_db(
+        DEFAULT_DB_ALIAS, campos, [valores[campo] for campo in campos]
+    )
+
+
+def usuario_das_claims(token):
+    """Monta ``User`` (e ``user.musico``) a partir das claims, sem consultas."""
+    user = _instancia(
+        User,
+        {
+            # simplejwt grava o user_id como texto
+            "id": User._meta.pk.to_python(token["user_id"]),
+            "username": token.get("username", ""),
+            "is_superuser": token.get("is_superuser", False),
+            "is_active": True,
+        },
+    )
+    musico = None
+    if token.get("musico_id"):
+        musico = _instancia(
+            Musico,
+            {
+                "id": token["musico_id"],
+                "user_id": user.id,
+                "tipo_usuario": token["tipo_usuario"],
+            },
+        )
+        Musico.user.field.set_cached_value(musico, user)
+    # Cache None: hasattr(user, "musico") é False sem ir ao banco
+    User.musico.related.set_cached_value(user, musico)
+    return user
+
+
+class JWTAutenticacaoPorClaims(JWTAuthentication):
+    """
+    ``JWTAuthentication`` que confia nas claims do token, após conferir a
+    versão das credenciais. Tokens emitidos antes da claim ``versao``
+    seguem pelo caminho padrão (com consulta).
+    """
+
+    def get_user(self, validated_token):
+        if "user_id" not in validated_token:
+            raise InvalidToken("Token sem identificação do usuário")
+        if "versao" not in validated_token:
+            return super().get_user(validated_token)
+
+        if validated_token["versao"] != versao_atual(validated_token["user_id"]):
+            raise AuthenticationFailed(
+                "Token revogado; faça login novamente", code="token_revogado"
+            )
+        return usuario_das_claims(validated_token)
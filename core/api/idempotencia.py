@@ -0,0 +1,104 @@
+"""
+Cabeçalho ``Idempotency-Key`` para POSTs que o app repete em redes instáveis
+(criar escala, comentar, reagir).
+
+A primeira requisição com uma chave reserva a chave no cache e, ao terminar,
+guarda status e corpo da resposta por ``TTL``. Repetições com a mesma chave,
+do mesmo usuário e na mesma rota, recebem a resposta guardada (com
+``Idempotent-Replayed: true``) sem passar pelo banco nem pelo Firebase.
+Enquanto a primeira ainda está em andamento, a repetição recebe 409. Reusar
+a chave com outro corpo resulta em 422. Respostas 5xx não são guardadas,
+para que a repetição tente de novo.
+
+A repetição pode cair em outro worker, então o cache precisa ser
+compartilhado (``CACHE_URL``); fora de DEBUG, a checagem ``core.E001``
+impede subir com o cache local em memória.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+CABECALHO = "Idempotency-Key"
+CACHE_PREFIXO = "idempotencia"
+TTL = 60 * 60 * 24
+TTL_EM_ANDAMENTO = 60
+TAMANHO_MAXIMO = 255
+
+
+def _resumo(dados):
+    corpo = json.dumps(dados, sort_keys=True, default=str)
+    return hashlib.sha256(corpo.encode()).hexdigest()
+
+
+def _chave(request, chave_cliente):
+    rota = f"{request.method}:{request.path}:{chave_cliente}"
+    resumo = hashlib.sha256(rota.encode()).hexdigest()
+    return f"{CACHE_PREFIXO}:{request.user.pk}:{resumo}"
+
+
+def idempotente(metodo):
+    """Decorator para métodos de ViewSet/APIView (ver docstring do módulo)."""
+
+    @wraps(metodo)
+    def wrapper(self, request, *args, **kwargs):
+        chave_cliente = request.headers.get(CABECALHO)
+        if not chave_cliente or not request.user.is_authenticated:
+            return metodo(self, request, *args, **kwargs)
+        if len(chave_cliente) > TAMANHO_MAXIMO:
+            return Response(
+                {"detail": f"{CABECALHO} deve ter até {TAMANHO_MAXIMO} caracteres"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        chave = _chave(request, chave_cliente)
+        corpo = _resumo(request.data)
+        if not cache.add(chave, {"corpo": corpo}, TTL_EM_ANDAMENTO):
+            return _repetida(cache.get(chave), corpo)
+
+        try:
+            response = metodo(self, request, *args, **kwargs)
+        except Exception:
+            cache.delete(chave)
+            raise
+
+        if response.status_code >= 500:
+            cache.delete(chave)
+        else:
+            # Dados simples (sem ReturnDict/serializer) para ir ao cache
+            dados = json.loads(JSONRenderer().render(response.data) or b"null")
+            cache.set(
+                chave,
+                {"corpo": corpo, "status": response.status_code, "dados": dados},
+                TTL,
+            )
+        return response
+
+    return wrapper
+
+
+def _repetida(guardada, corpo):
+    if guardada is None:
+        # Expirou entre o add e o get: o cliente pode tentar de novo
+        guardada = {"corpo": corpo}
+    if guardada["corpo"] != corpo:
+        return Response(
+            {"detail": f"{CABECALHO} já usada com outro corpo de requisição"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if "status" not in guardada:
+        return Response(
+            {"detail": "Requisição com esta chave ainda em andamento"},
+            status=status.HTTP_409_CONFLICT,
+            headers={"Retry-After": "1"},
+        )
+    return Response(
+        guardada["dados"],
+        status=guardada["status"],
+        headers={"Idempotent-Replayed": "true"},
+    )
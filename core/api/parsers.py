@@ -0,0 +1,17 @@
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .renderers import MSGPACK_MEDIA_TYPE
+
+
+class MessagePackParser(BaseParser):
+    """Aceita corpos de requisição com ``Content-Type: application/msgpack``."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"Erro ao interpretar MessagePack - {exc}")
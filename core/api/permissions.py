@@ -1,5 +1,69 @@
+import logging
+
+from django.utils import timezone
 from rest_framework import permissions
 
+from core.metrics import PAPEIS
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================================
+# PAPEL DO USUÁRIO (resolvido uma vez por requisição)
+# =====================================================
+class Papel:
+    """
+    Quem é o usuário da requisição: músico vinculado e se é superusuário,
+    líder ou admin. Consultado por permissões, querysets e serializers
+    no lugar de repetir ``hasattr(user, "musico")`` em cada um.
+    """
+
+    __slots__ = ("user", "musico", "is_superuser", "is_lider", "is_admin")
+
+    def __init__(self, user):
+        self.user = user
+        self.is_superuser = bool(user.is_authenticated and user.is_superuser)
+        # RelatedObjectDoesNotExist também é AttributeError
+        self.musico = getattr(user, "musico", None)
+        tipo = self.musico.tipo_usuario if self.musico else None
+        self.is_lider = self.is_superuser or tipo in ("LIDER", "ADMIN")
+        self.is_admin = self.is_superuser or tipo == "ADMIN"
+
+    @property
+    def autenticado(self):
+        return self.user.is_authenticated
+
+    def e_o_musico(self, musico_id):
+        """O usuário é o músico ``musico_id``?"""
+        return self.musico is not None and self.musico.id == musico_id
+
+
+def papel_do_request(request):
+    """
+    ``Papel`` de ``request.user``, memorizado na ``HttpRequest`` (a mesma
+    por trás do ``Request`` do DRF e do contexto dos serializers).
+    """
+    http_request = getattr(request, "_request", request)
+    user = request.user
+    papel = getattr(http_request, "_sggm_papel", None)
+    if papel is None or papel.user is not user:
+        papel = Papel(user)
+        http_request._sggm_papel = papel
+        if not user.is_authenticated:
+            origem = "anonimo"
+        elif user.get_deferred_fields():
+            # Montado a partir das claims do token (core.api.authentication)
+            origem = "token"
+        else:
+            origem = "banco"
+        PAPEIS.inc(origem=origem)
+    return papel
+
+
+# =====================================================
+# PERMISSÕES
+# =====================================================
+
 
 class IsLiderOrReadOnly(permissions.BasePermission):
     """
@@ -8,23 +72,18 @@ class IsLiderOrReadOnly(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
+        papel = papel_do_request(request)
+
         # Usuário deve estar autenticado
-        if not request.user.is_authenticated:
+        if not papel.autenticado:
             return False
 
         # Permitir leitura para qualquer usuário autenticado
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Superusuários têm acesso total
-        if request.user.is_superuser:
-            return True
-
-        # Para operações de escrita, verificar se é líder
-        if hasattr(request.user, "musico"):
-            return request.user.musico.is_lider()
-
-        return False
+        # Para operações de escrita, verificar se é líder (ou superusuário)
+        return papel.is_lider
 
 
 class IsAdminUser(permissions.BasePermission):
@@ -33,19 +92,8 @@ class IsAdminUser(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        # Usuário deve estar autenticado
-        if not request.user.is_authenticated:
-            return False
-
-        # Superusuários têm acesso total
-        if request.user.is_superuser:
-            return True
-
-        # Verificar se tem perfil de músico admin
-        if hasattr(request.user, "musico"):
-            return request.user.musico.is_admin()
-
-        return False
+        papel = papel_do_request(request)
+        return papel.autenticado and papel.is_admin
 
 
 class IsMusicoOwnerOrLider(permissions.BasePermission):
@@ -69,23 +117,18 @@ class IsMusicoOwnerOrLider(permissions.BasePermission):
         """
         Verificação no nível da view (antes de recuperar o objeto).
         """
+        papel = papel_do_request(request)
+
         # Usuário deve estar autenticado
-        if not request.user.is_authenticated:
+        if not papel.autenticado:
             return False
 
         # Leitura permitida para todos os usuários autenticados
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Superusuários têm acesso total
-        if request.user.is_superuser:
-            return True
-
-        # Para escrita, verificar se usuário tem perfil de músico
-        if hasattr(request.user, "musico"):
-            return True
-
-        return False
+        # Para escrita: superusuário ou usuário com perfil de músico
+        return papel.is_superuser or papel.musico is not None
 
     def has_object_permission(self, request, view, obj):
         """
@@ -95,22 +138,14 @@ class IsMusicoOwnerOrLider(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Superusuários têm acesso total
-        if request.user.is_superuser:
-            return True
-
-        # Verificar se usuário tem perfil de músico
-        if not hasattr(request.user, "musico"):
-            return False
+        papel = papel_do_request(request)
 
-        musico_logado = request.user.musico
-
-        # Líder pode editar qualquer perfil (todos os campos)
-        if musico_logado.is_lider():
+        # Superusuários, líderes e admins podem editar qualquer perfil
+        if papel.is_lider:
             return True
 
         # Músico comum: só pode editar seu próprio perfil
-        if obj.id != musico_logado.id:
+        if not papel.e_o_musico(obj.id):
             return False
 
         # Verificar se está editando apenas campos permitidos
@@ -127,9 +162,10 @@ class IsMusicoOwnerOrLider(permissions.BasePermission):
             # Verificar se está tentando editar campos não permitidos
             campos_nao_permitidos = submitted_fields - self.MUSICO_EDITABLE_FIELDS
             if campos_nao_permitidos:
-                # Log para debug
-                print(
-                    f"❌ Músico {musico_logado.nome} tentou editar campos não permitidos: {campos_nao_permitidos}"
+                logger.info(
+                    "Músico %s tentou editar campos não permitidos: %s",
+                    papel.musico.id,
+                    sorted(campos_nao_permitidos),
                 )
                 return False
 
@@ -146,7 +182,8 @@ class IsMusicoOwner(permissions.BasePermission):
         """
         Verifica se o usuário está autenticado e tem perfil de músico.
         """
-        if not request.user.is_authenticated:
+        papel = papel_do_request(request)
+        if not papel.autenticado:
             return False
 
         # Leitura permitida
@@ -154,7 +191,7 @@ class IsMusicoOwner(permissions.BasePermission):
             return True
 
         # Para escrita, deve ter perfil de músico
-        return hasattr(request.user, "musico")
+        return papel.musico is not None
 
     def has_object_permission(self, request, view, obj):
         """
@@ -165,10 +202,7 @@ class IsMusicoOwner(permissions.BasePermission):
             return True
 
         # Verificar se é o próprio músico
-        if hasattr(request.user, "musico"):
-            return obj.id == request.user.musico.id
-
-        return False
+        return papel_do_request(request).e_o_musico(obj.id)
 
 
 class CanEditOwnFields(permissions.BasePermission):
@@ -189,22 +223,17 @@ class CanEditOwnFields(permissions.BasePermission):
         """
         Verificação no nível da view.
         """
-        if not request.user.is_authenticated:
+        papel = papel_do_request(request)
+        if not papel.autenticado:
             return False
 
         # Leitura sempre permitida para autenticados
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Superusuários e líderes podem editar tudo
-        if request.user.is_superuser:
-            return True
-
-        if hasattr(request.user, "musico") and request.user.musico.is_lider():
-            return True
-
-        # Músicos comuns: verificar campos (será validado em has_object_permission)
-        return hasattr(request.user, "musico")
+        # Superusuários e líderes podem editar tudo; músicos comuns têm os
+        # campos validados em has_object_permission
+        return papel.is_lider or papel.musico is not None
 
     def has_object_permission(self, request, view, obj):
         """
@@ -214,21 +243,14 @@ class CanEditOwnFields(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Superusuários têm acesso total
-        if request.user.is_superuser:
-            return True
-
-        if not hasattr(request.user, "musico"):
-            return False
-
-        musico_logado = request.user.musico
+        papel = papel_do_request(request)
 
-        # Líderes podem editar qualquer campo de qualquer músico
-        if musico_logado.is_lider():
+        # Superusuários e líderes podem editar qualquer campo de qualquer músico
+        if papel.is_lider:
             return True
 
         # Músico comum: deve ser o próprio
-        if obj.id != musico_logado.id:
+        if not papel.e_o_musico(obj.id):
             return False
 
         # Verificar se está tentando editar apenas campos permitidos
@@ -248,30 +270,23 @@ class IsAutorOuLider(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and hasattr(request.user, "musico")
+        papel = papel_do_request(request)
+        return papel.autenticado and papel.musico is not None
 
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        if request.user.is_superuser:
-            return True
-
-        if not hasattr(request.user, "musico"):
-            return False
-
-        musico = request.user.musico
+        papel = papel_do_request(request)
 
-        if musico.is_lider():
+        if papel.is_lider:
             return True
 
-        if obj.autor != musico:
+        if not papel.e_o_musico(obj.autor_id):
             return False
 
         # Bloquear edição (não deleção) após 24h
         if request.method in ["PUT", "PATCH"]:
-            from django.utils import timezone
-
             delta = timezone.now() - obj.criado_em
             if delta.total_seconds() > 86400:
                 return False
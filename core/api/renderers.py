@@ -0,0 +1,29 @@
+import msgpack
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Reaproveita as conversões do JSON do DRF (datetime, Decimal, UUID, lazy str...)
+_encoder = JSONEncoder()
+
+
+def empacotar(dados):
+    return msgpack.packb(dados, default=_encoder.default, use_bin_type=True)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderiza a resposta em MessagePack, selecionado via
+    ``Accept: application/msgpack`` (ou ``?format=msgpack``).
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return empacotar(data)
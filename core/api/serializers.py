@@ -1,9 +1,20 @@
+import logging
+
 from django.contrib.auth.models import (
     User,
 )
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
+from core.api.authentication import versao_atual, versao_do_usuario
+from core.api.permissions import Papel, papel_do_request
+from core.api.tokens import RefreshTokenRotativo
 from core.models import (
     Artista,
     ComentarioPerformance,
@@ -13,7 +24,11 @@ from core.models import (
     Musica,
     Musico,
     ReacaoComentario,
+    SerieEvento,
 )
+from core.services import LoginService, RepertorioService
+
+logger = logging.getLogger(__name__)
 
 
 # -------------------------
@@ -145,10 +160,7 @@ class MusicoCreateSerializer(serializers.ModelSerializer):
             user=user, **validated_data  # ✅ Só contém campos válidos do modelo Musico
         )
 
-        print(f"✅ Músico criado: {musico.nome}")
-        print(f"   Username: {username}")
-        print(f"   Email: {email}")
-        print(f"   Senha padrão: {senha_padrao}")
+        logger.info("Músico %s criado para o usuário %s", musico.id, username)
 
         return musico
 
@@ -369,19 +381,30 @@ class EscalaSerializer(serializers.ModelSerializer):
         return data
 
     # ── NOVO: M2M precisa de create/update explícito ──────────────
+    # validate() já checou disponibilidade e duplicidade: o modelo não
+    # revalida (validar=False) e o banco garante a unicidade em corridas
     def create(self, validated_data):
         instrumentos = validated_data.pop("instrumentos")
-        escala = Escala.objects.create(**validated_data)
+        escala = Escala(**validated_data)
+        self._salvar(escala)
         escala.instrumentos.set(instrumentos)
         return escala
 
     def update(self, instance, validated_data):
         instrumentos = validated_data.pop("instrumentos", None)
-        instance = super().update(instance, validated_data)
+        for campo, valor in validated_data.items():
+            setattr(instance, campo, valor)
+        self._salvar(instance)
         if instrumentos is not None:
             instance.instrumentos.set(instrumentos)
         return instance
 
+    def _salvar(self, escala):
+        try:
+            escala.save(validar=False)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+
 
 class EscalaCreateSerializer(serializers.ModelSerializer):
     """Serializer específico para criar escalas (aceita nome do instrumento)"""
@@ -413,7 +436,7 @@ class EscalaCreateSerializer(serializers.ModelSerializer):
                 defaults={"nome": nome_instr.strip().title()},
             )
             if created:
-                print(f"✅ Novo instrumento criado: {instrumento.nome}")
+                logger.info("Novo instrumento criado: %s", instrumento.nome)
 
         return Escala.objects.create(
             instrumento_no_evento=instrumento, **validated_data
@@ -426,14 +449,14 @@ class EscalaCreateSerializer(serializers.ModelSerializer):
 class EventoSerializer(serializers.ModelSerializer):
     """Serializer para eventos"""
 
-    repertorio = MusicaSerializer(many=True, read_only=True)
+    repertorio = MusicaSerializer(many=True, read_only=True, source="musicas_em_ordem")
     repertorio_ids = serializers.PrimaryKeyRelatedField(
         queryset=Musica.objects.all(),
         write_only=True,
         many=True,
         source="repertorio",
         required=False,
-        help_text="IDs das músicas do repertório",
+        help_text="IDs das músicas do repertório, na ordem do evento",
     )
     escalas = EscalaSerializer(many=True, read_only=True)
     tipo_display = serializers.CharField(source="get_tipo_display", read_only=True)
@@ -476,9 +499,26 @@ class EventoSerializer(serializers.ModelSerializer):
             "escalas",
             "total_escalas",
             "total_musicas",
+            "serie",
             "criado_em",
         ]
-        read_only_fields = ["id", "criado_em"]
+        read_only_fields = ["id", "serie", "criado_em"]
+
+    def create(self, validated_data):
+        musicas = validated_data.pop("repertorio", None)
+        evento = super().create(validated_data)
+        if musicas:
+            RepertorioService.substituir(evento, [musica.id for musica in musicas])
+        return evento
+
+    def update(self, instance, validated_data):
+        musicas = validated_data.pop("repertorio", None)
+        evento = super().update(instance, validated_data)
+        if musicas is not None:
+            RepertorioService.substituir(evento, [musica.id for musica in musicas])
+            # O prefetch de "repertorio" ficou desatualizado
+            getattr(evento, "_prefetched_objects_cache", {}).pop("repertorio", None)
+        return evento
 
     def validate_data_evento(self, value):
         """Valida se a data do evento não é no passado"""
@@ -493,55 +533,112 @@ class EventoSerializer(serializers.ModelSerializer):
         return value
 
 
+# -------------------------
+# SÉRIE DE EVENTOS (RECORRÊNCIA)
+# -------------------------
+class SerieEventoSerializer(serializers.ModelSerializer):
+    """Serializer para séries de eventos recorrentes"""
+
+    frequencia_display = serializers.CharField(
+        source="get_frequencia_display", read_only=True
+    )
+
+    def validate(self, data):
+        # Reaproveita SerieEvento.clean() com os valores atuais + enviados
+        campos = ("frequencia", "semana_do_mes", "data_inicio", "data_fim")
+        valores = {
+            campo: data.get(campo, getattr(self.instance, campo, None))
+            for campo in campos
+            if campo in data or self.instance is not None
+        }
+        try:
+            SerieEvento(**valores).clean()
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+        return data
+
+    class Meta:
+        model = SerieEvento
+        fields = [
+            "id",
+            "nome",
+            "tipo",
+            "local",
+            "descricao",
+            "frequencia",
+            "frequencia_display",
+            "intervalo",
+            "dia_semana",
+            "semana_do_mes",
+            "horario",
+            "antecedencia_ensaio",
+            "data_inicio",
+            "data_fim",
+            "evento_modelo",
+            "copiar_escala",
+            "copiar_repertorio",
+            "gerado_ate",
+            "ativa",
+            "criado_em",
+        ]
+        read_only_fields = ["id", "gerado_ate", "criado_em"]
+
+
 # -------------------------
 # TOKEN JWT
 # -------------------------
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Serializer customizado para JWT com informações do músico"""
 
+    token_class = RefreshTokenRotativo
+
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
+        papel = Papel(user)
 
         # Adicionar informações básicas do usuário
         token["username"] = user.username
         token["email"] = user.email
+        token["is_superuser"] = user.is_superuser
+        token["is_lider"] = papel.is_lider
+        token["is_admin"] = papel.is_admin
+        # Conferida a cada requisição (ver core.api.authentication)
+        token["versao"] = versao_do_usuario(user)
 
         # Adicionar informações do músico ao token
-        if hasattr(user, "musico"):
-            musico = user.musico
+        musico = papel.musico
+        if musico is not None:
             token["musico_id"] = musico.id
             token["nome"] = musico.nome
             token["tipo_usuario"] = musico.tipo_usuario
-            token["is_lider"] = musico.is_lider()
-            token["is_admin"] = musico.is_admin()
             token["status"] = musico.status
             token["instrumento_principal"] = (
                 musico.instrumento_principal.nome
                 if musico.instrumento_principal
                 else None
             )
-        else:
-            token["is_lider"] = user.is_superuser
-            token["is_admin"] = user.is_superuser
 
         return token
 
     def validate(self, attrs):
+        # Usuário, músico e instrumento já vêm juntos do LoginBackend
         data = super().validate(attrs)
+        LoginService.registrar_ultimo_login(self.user)
+        papel = Papel(self.user)
 
         # Adicionar informações extras na resposta
         data["username"] = self.user.username
-        data["email"] = self.user.email
+        data["is_lider"] = papel.is_lider
+        data["is_admin"] = papel.is_admin
 
-        if hasattr(self.user, "musico"):
-            musico = self.user.musico
+        musico = papel.musico
+        if musico is not None:
             data["musico_id"] = musico.id
             data["nome"] = musico.nome
+            data["email"] = musico.email
             data["tipo_usuario"] = musico.tipo_usuario
             data["tipo_usuario_display"] = musico.get_tipo_usuario_display()
-            data["is_lider"] = musico.is_lider()
-            data["is_admin"] = musico.is_admin()
             data["status"] = musico.status
             data["precisa_mudar_senha"] = musico.precisa_mudar_senha
             data["instrumento_principal"] = (
@@ -553,14 +650,46 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
                 else None
             )
         else:
-            data["is_lider"] = self.user.is_superuser
-            data["is_admin"] = self.user.is_superuser
+            data["musico_id"] = None
+            data["nome"] = self.user.get_full_name() or self.user.username
+            data["email"] = self.user.email
+            data["tipo_usuario"] = "USER"
             data["precisa_mudar_senha"] = False
             data["message"] = "Usuário sem perfil de músico vinculado"
 
         return data
 
 
+class TokenRotativoRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh com rotação: o token usado é negado no cache e um novo refresh
+    volta junto com o access. Usuário ativo e papel são conferidos pela
+    versão das credenciais em cache, sem consulta ao banco.
+    """
+
+    token_class = RefreshTokenRotativo
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+
+        if "versao" in refresh.payload:
+            if refresh["versao"] != versao_atual(user_id):
+                raise AuthenticationFailed(
+                    "Token revogado; faça login novamente", code="token_revogado"
+                )
+        elif not User.objects.filter(pk=user_id, is_active=True).exists():
+            # Token emitido antes da claim "versao"
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        if not refresh.negar():
+            raise InvalidToken("Token já utilizado")
+        refresh.rotacionar()
+        return {"access": str(refresh.access_token), "refresh": str(refresh)}
+
+
 class ArtistaSerializer(serializers.ModelSerializer):
     total_musicas = serializers.IntegerField(source="musicas.count", read_only=True)
 
@@ -611,20 +740,23 @@ class ComentarioPerformanceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "autor", "criado_em", "editado_em"]
 
-    def get_eu_curto(self, obj):
+    def _papel(self):
         request = self.context.get("request")
-        if request and hasattr(request.user, "musico"):
-            return obj.reacoes.filter(musico=request.user.musico).exists()
+        return papel_do_request(request) if request else None
+
+    def get_eu_curto(self, obj):
+        papel = self._papel()
+        if papel and papel.musico is not None:
+            return obj.reacoes.filter(musico_id=papel.musico.id).exists()
         return False
 
     def get_pode_editar(self, obj):
-        request = self.context.get("request")
-        if not request or not hasattr(request.user, "musico"):
+        papel = self._papel()
+        if not papel or papel.musico is None:
             return False
-        musico = request.user.musico
-        if musico.is_lider():
+        if papel.is_lider:
             return True
-        if obj.autor != musico:
+        if not papel.e_o_musico(obj.autor_id):
             return False
         from django.utils import timezone
 
@@ -649,8 +781,7 @@ class ComentarioPerformanceSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
-        request = self.context["request"]
-        validated_data["autor"] = request.user.musico
+        validated_data["autor"] = papel_do_request(self.context["request"]).musico
 
         # ── Bloquear comentário se evento ainda não aconteceu ──
         from django.utils.timezone import now
@@ -666,3 +797,28 @@ class ComentarioPerformanceSerializer(serializers.ModelSerializer):
             )
 
         return super().create(validated_data)
+
+
+class ComentarioPerformanceAsyncSerializer(ComentarioPerformanceSerializer):
+    """
+    Variante somente leitura usada pelas views assíncronas: reações e
+    "eu curto" vêm de anotações da queryset e o papel do usuário vem do
+    contexto, para que a serialização não faça nenhuma consulta.
+    """
+
+    total_reacoes = serializers.IntegerField(read_only=True)
+
+    def get_eu_curto(self, obj):
+        return bool(getattr(obj, "eu_curto", False))
+
+    def get_pode_editar(self, obj):
+        musico = self.context.get("musico")
+        if musico is None:
+            return False
+        if self.context.get("is_lider"):
+            return True
+        if obj.autor_id != musico.id:
+            return False
+        from django.utils import timezone
+
+        return (timezone.now() - obj.criado_em).total_seconds() <= 86400
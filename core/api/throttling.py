@@ -0,0 +1,159 @@
+"""
+Limites de requisição (token bucket) para endpoints de escrita chamados pelo
+app com frequência: reações, token FCM, confirmação de escala e login.
+
+Cada músico (ou IP, sem autenticação) tem um balde por escopo com até
+``CAPACIDADE`` fichas, repostas a ``POR_MINUTO`` fichas por minuto. O estado
+fica no cache em duas chaves: o contador de fichas usadas, alterado só com
+``incr``/``decr`` atômicos, e o instante de referência da reposição. Quando
+o balde esvazia, o DRF responde 429 com ``Retry-After``. Configuração em
+``settings.SGGM_LIMITES``:
+
+    SGGM_LIMITES = {
+        "HABILITADO": True,
+        "ESCOPOS": {"reagir": {"CAPACIDADE": 20, "POR_MINUTO": 60}, ...},
+    }
+"""
+
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from core.api.permissions import papel_do_request
+from core.metrics import LIMITES
+
+PADRAO = {
+    "HABILITADO": True,
+    "ESCOPOS": {
+        "reagir": {"CAPACIDADE": 20, "POR_MINUTO": 60},
+        "fcm_token": {"CAPACIDADE": 5, "POR_MINUTO": 2},
+        "confirmar": {"CAPACIDADE": 10, "POR_MINUTO": 20},
+        "login": {"CAPACIDADE": 10, "POR_MINUTO": 5},
+        "login_usuario": {"CAPACIDADE": 20, "POR_MINUTO": 2},
+    },
+}
+
+# Baldes parados por mais que FOLGA_TTL vezes o tempo de enchê-los expiram
+# (e voltam cheios, como voltariam de qualquer forma)
+FOLGA_TTL = 10
+
+
+def configuracao():
+    config = {**PADRAO, **getattr(settings, "SGGM_LIMITES", {})}
+    config["ESCOPOS"] = {**PADRAO["ESCOPOS"], **config["ESCOPOS"]}
+    return config
+
+
+def consumir(chave, capacidade, por_minuto):
+    """
+    Retira uma ficha do balde ``chave``. Retorna None se havia ficha ou os
+    segundos até a próxima ficha, se o balde estava vazio.
+    """
+    taxa = por_minuto / 60
+    ttl = max(60, math.ceil(FOLGA_TTL * capacidade / taxa))
+    chave_inicio, chave_uso = f"{chave}:inicio", f"{chave}:uso"
+    agora = time.time()
+
+    if cache.add(chave_inicio, agora, ttl):
+        # Balde novo (ou expirado): cheio
+        cache.set(chave_uso, 0, ttl)
+        inicio = agora
+    else:
+        inicio = cache.get(chave_inicio, agora)
+    try:
+        usado = cache.incr(chave_uso)
+    except ValueError:
+        cache.add(chave_uso, 0, ttl)
+        usado = cache.incr(chave_uso)
+
+    # Fichas concedidas desde o início: capacidade + reposição
+    concedido = capacidade + taxa * (agora - inicio)
+    if usado > concedido:
+        # Requisição recusada não consome ficha
+        cache.decr(chave_uso)
+        return (usado - concedido) / taxa
+
+    if concedido - usado > capacidade - 1:
+        # Balde ficou parado e "encheu além da borda": reancora o início
+        # para que o crédito acumulado não passe da capacidade
+        cache.set(chave_inicio, agora - (usado - 1) / taxa, ttl)
+        cache.touch(chave_uso, ttl)
+    return None
+
+
+class LimiteTokenBucket(BaseThrottle):
+    """Throttle do DRF por músico e por escopo (ver ``SGGM_LIMITES``)."""
+
+    escopo = None
+
+    def identificador(self, request):
+        papel = papel_do_request(request)
+        if papel.musico is not None:
+            return f"musico:{papel.musico.id}"
+        if papel.autenticado:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        self.espera = None
+        config = configuracao()
+        if not config["HABILITADO"]:
+            return True
+
+        limite = config["ESCOPOS"][self.escopo]
+        chave = f"limite:{self.escopo}:{self.identificador(request)}"
+        self.espera = consumir(chave, limite["CAPACIDADE"], limite["POR_MINUTO"])
+        permitido = self.espera is None
+        LIMITES.inc(
+            escopo=self.escopo, resultado="permitido" if permitido else "bloqueado"
+        )
+        return permitido
+
+    def wait(self):
+        return self.espera
+
+
+class LimiteReagir(LimiteTokenBucket):
+    escopo = "reagir"
+
+
+class LimiteFcmToken(LimiteTokenBucket):
+    escopo = "fcm_token"
+
+
+class LimiteConfirmar(LimiteTokenBucket):
+    escopo = "confirmar"
+
+
+def _username(request):
+    dados = request.data if isinstance(request.data, dict) else {}
+    return str(dados.get("username", "")).strip().lower()
+
+
+class LimiteLogin(LimiteTokenBucket):
+    """
+    Por IP e usuário: a equipe inteira costuma entrar pela mesma rede
+    (Wi-Fi da igreja) na mesma hora, e um limite só por IP a bloquearia.
+    O IP vem do ``REMOTE_ADDR`` ou, atrás de proxies, do X-Forwarded-For
+    conforme ``REST_FRAMEWORK["NUM_PROXIES"]``.
+    """
+
+    escopo = "login"
+
+    def identificador(self, request):
+        return f"ip:{self.get_ident(request)}:{_username(request)}"
+
+
+class LimiteLoginUsuario(LimiteTokenBucket):
+    """
+    Só por usuário, de qualquer IP: segura tentativas contra uma conta
+    vindas de endereços diferentes. Mais folgado que ``LimiteLogin``.
+    """
+
+    escopo = "login_usuario"
+
+    def identificador(self, request):
+        return f"usuario:{_username(request)}"
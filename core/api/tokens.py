@@ -0,0 +1,83 @@
+"""
+Refresh tokens rotativos com lista de negação no cache.
+
+A cada ``/api/token/refresh/`` o refresh token usado entra na lista de
+negação (cache, com TTL até a expiração dele) e um novo é emitido. Nada vai
+para tabelas SQL, ao contrário do app ``token_blacklist`` do Simple JWT.
+
+Todos os refresh tokens de um login compartilham a claim ``familia``. Se um
+token já rotacionado for apresentado de novo (possível vazamento), a família
+inteira é revogada e o usuário precisa fazer login outra vez. Com vários
+workers, o cache precisa ser compartilhado (``CACHE_URL``).
+"""
+
+from uuid import uuid4
+
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_to_epoch
+
+CACHE_NEGADO = "jwt:negado"
+CACHE_FAMILIA = "jwt:familia_negada"
+
+
+class RefreshTokenRotativo(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["familia"] = uuid4().hex
+        return token
+
+    # -------------------------
+    # CHAVES
+    # -------------------------
+    def _chave_jti(self):
+        return f"{CACHE_NEGADO}:{self[api_settings.JTI_CLAIM]}"
+
+    def _chave_familia(self):
+        familia = self.payload.get("familia")
+        return f"{CACHE_FAMILIA}:{familia}" if familia else None
+
+    def _segundos_restantes(self):
+        return max(1, self["exp"] - datetime_to_epoch(self.current_time))
+
+    # -------------------------
+    # VERIFICAÇÃO
+    # -------------------------
+    def verify(self):
+        super().verify()
+        chaves = [self._chave_jti(), self._chave_familia()]
+        negados = cache.get_many([chave for chave in chaves if chave])
+        if chaves[1] in negados:
+            raise TokenError("Sessão revogada; faça login novamente")
+        if chaves[0] in negados:
+            # Reuso de um token já rotacionado: revoga a família toda
+            self.negar_familia()
+            raise TokenError("Token já utilizado; faça login novamente")
+
+    # -------------------------
+    # NEGAÇÃO
+    # -------------------------
+    def negar(self) -> bool:
+        """
+        Nega este token até expirar. Retorna False se ele já estava negado
+        (outra requisição o usou ao mesmo tempo).
+        """
+        return cache.add(self._chave_jti(), True, self._segundos_restantes())
+
+    def negar_familia(self):
+        """Revoga todos os refresh tokens do mesmo login."""
+        chave = self._chave_familia()
+        if chave is None:
+            self.negar()
+            return
+        ttl = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+        cache.set(chave, True, ttl)
+
+    def rotacionar(self):
+        """Transforma este token no seu sucessor (novo jti, iat e exp)."""
+        self.set_jti()
+        self.set_exp(from_time=self.current_time)
+        self.set_iat(at_time=self.current_time)
@@ -2,7 +2,9 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from ..views import logout_view
+from . import async_views
 from .views import (
+    AgendaIcsView,
     ArtistaViewSet,
     ComentarioPerformanceViewSet,
     EscalaViewSet,
@@ -10,12 +12,15 @@ from .views import (
     InstrumentoViewSet,
     MusicaViewSet,
     MusicoViewSet,
+    SerieEventoViewSet,
+    SincronizacaoView,
 )
 
 router = DefaultRouter()
 router.register(r"musicos", MusicoViewSet)
 router.register(r"musicas", MusicaViewSet)
 router.register(r"eventos", EventoViewSet)
+router.register(r"series", SerieEventoViewSet)
 router.register(r"escalas", EscalaViewSet)
 router.register(r"instrumentos", InstrumentoViewSet)
 router.register(r"artistas", ArtistaViewSet, basename="artista")
@@ -24,6 +29,30 @@ router.register(
 )
 
 urlpatterns = [
+    path(
+        "musicos/<int:pk>/agenda.ics",
+        AgendaIcsView.as_view(),
+        name="musico-agenda-ics",
+    ),
     path("", include(router.urls)),
     path("logout/", logout_view, name="logout"),
+    path("sync/", SincronizacaoView.as_view(), name="sync"),
+    # Caminho de leitura assíncrono (ASGI)
+    path(
+        "async/eventos/proximos/",
+        async_views.eventos_proximos,
+        name="async-evento-proximos",
+    ),
+    path(
+        "async/eventos/<int:pk>/stream/",
+        async_views.evento_stream,
+        name="async-evento-stream",
+    ),
+    path("async/musicos/me/", async_views.musicos_me, name="async-musico-me"),
+    path("async/escalas/", async_views.escalas_listar, name="async-escala-list"),
+    path(
+        "async/comentarios/",
+        async_views.comentarios_listar,
+        name="async-comentario-list",
+    ),
 ]
@@ -1,27 +1,66 @@
+import logging
+
 from django.core.exceptions import ValidationError
 from django.db.models import Prefetch
+from django.http import HttpResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date
 from django.utils.timezone import now
-from rest_framework import status, viewsets
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.exceptions import ValidationError as DRFValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
-
-from core.api.permissions import IsAutorOuLider, IsLiderOrReadOnly, IsMusicoOwnerOrLider
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from core.api.idempotencia import idempotente
+from core.api.permissions import (
+    IsAutorOuLider,
+    IsLiderOrReadOnly,
+    IsMusicoOwnerOrLider,
+    papel_do_request,
+)
+from core.api.throttling import (
+    LimiteConfirmar,
+    LimiteFcmToken,
+    LimiteLogin,
+    LimiteLoginUsuario,
+    LimiteReagir,
+)
+from core.api.tokens import RefreshTokenRotativo
+from core.metrics import LOGINS
 from core.models import (
     Artista,
     ComentarioPerformance,
     Escala,
     Evento,
     Instrumento,
+    ItemRepertorio,
     Musica,
     Musico,
     ReacaoComentario,
+    SerieEvento,
+)
+from core.pubsub import publicar_evento
+from core.services import (
+    AgendaService,
+    CifraService,
+    DuplicacaoService,
+    GerenciadorEscala,
+    ImportacaoService,
+    NotificationService,
+    RecorrenciaService,
+    RepertorioService,
+    SetlistService,
+    SincronizacaoService,
 )
-from core.services import NotificationService
 from core.services.compartilhamento_service import CompartilhamentoService
 
 from .serializers import (
@@ -33,53 +72,37 @@ from .serializers import (
     MusicaSerializer,
     MusicoCreateSerializer,
     MusicoSerializer,
+    SerieEventoSerializer,
+    TokenRotativoRefreshSerializer,
 )
+from .serializers import MyTokenObtainPairSerializer as TokenComMusicoSerializer
+
+logger = logging.getLogger(__name__)
 
 
 # =====================================================
 # JWT LOGIN CUSTOMIZADO
 # =====================================================
-class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+class MyTokenObtainPairSerializer(TokenComMusicoSerializer):
     """
-    Serializer customizado para incluir dados do músico no token JWT.
+    Serializer do login: claims e dados do músico vêm de
+    ``TokenComMusicoSerializer``; aqui só o registro em log.
     """
 
     def validate(self, attrs):
-        # Obtém o token padrão
         data = super().validate(attrs)
 
-        # Log de login
-        print(f"🔐 Login - User: {self.user.username}")
-
-        # Adiciona informações extras do músico
-        if hasattr(self.user, "musico"):
-            musico = self.user.musico
-            data.update(
-                {
-                    "musico_id": musico.id,
-                    "nome": musico.nome,
-                    "username": self.user.username,
-                    "email": musico.email,
-                    "tipo_usuario": musico.tipo_usuario,
-                    "is_lider": musico.tipo_usuario in ["LIDER", "ADMIN"],
-                    "is_admin": musico.tipo_usuario == "ADMIN",
-                }
-            )
-            print(f"✅ Login bem-sucedido: {musico.nome} ({musico.tipo_usuario})")
+        if data["musico_id"] is not None:
+            logger.info(
+                "Login: %s (%s, músico %s)",
+                self.user.username,
+                data["tipo_usuario"],
+                data["musico_id"],
+            )
         else:
-            # Usuário sem perfil de músico
-            data.update(
-                {
-                    "musico_id": None,
-                    "nome": self.user.get_full_name() or self.user.username,
-                    "username": self.user.username,
-                    "email": self.user.email,
-                    "tipo_usuario": "USER",
-                    "is_lider": False,
-                    "is_admin": self.user.is_superuser,
-                }
+            logger.warning(
+                "Login de usuário sem perfil de músico: %s", self.user.username
             )
-            print(f"⚠️ Login de usuário sem perfil de músico: {self.user.username}")
 
         return data
 
@@ -90,6 +113,42 @@ class MyTokenObtainPairView(TokenObtainPairView):
     """
 
     serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = [LimiteLogin, LimiteLoginUsuario]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Também recebe as respostas de erro (credenciais inválidas, 400)
+        if request.method == "POST":
+            LOGINS.inc(resultado="sucesso" if response.status_code == 200 else "falha")
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class MyTokenRefreshView(TokenRefreshView):
+    """
+    Renova o access token e rotaciona o refresh token.
+    POST /api/token/refresh/  Body: {"refresh": "..."}
+    """
+
+    serializer_class = TokenRotativoRefreshSerializer
+
+
+class TokenRevogarView(APIView):
+    """
+    Logout do app: revoga o refresh token e todos os que vieram dele.
+    POST /api/token/revogar/  Body: {"refresh": "..."}
+    """
+
+    authentication_classes = ()
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        dados = request.data if isinstance(request.data, dict) else {}
+        try:
+            refresh = RefreshTokenRotativo(dados.get("refresh", ""))
+        except TokenError:
+            # Expirado, inválido ou já revogado: nada a fazer
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        refresh.negar_familia()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 # =====================================================
@@ -100,20 +159,39 @@ class MusicoPermissionMixin:
     Mixin para lógica comum de verificação de permissões de músicos.
     """
 
-    def is_lider_or_admin(self, user):
+    @property
+    def papel(self):
+        """Papel do usuário, resolvido uma vez por requisição."""
+        return papel_do_request(self.request)
+
+    def is_lider_or_admin(self):
         """Verifica se o usuário é líder ou admin."""
-        if user.is_superuser:
-            return True
-        return hasattr(user, "musico") and user.musico.tipo_usuario in [
-            "LIDER",
-            "ADMIN",
-        ]
+        return self.papel.is_lider
 
     def get_musico_or_403(self, request):
         """Retorna o músico do request ou erro 403."""
-        if not hasattr(request.user, "musico"):
+        if self.papel.musico is None:
             raise PermissionDenied("Usuário não possui perfil de músico")
-        return request.user.musico
+        return self.papel.musico
+
+
+def _linhas_importacao(request, aceita_texto=False):
+    """
+    Linhas de uma importação em lote: arquivo no campo "arquivo"
+    (multipart), lista JSON no corpo ou, se ``aceita_texto``, texto colado
+    no campo "texto". Levanta ValueError se nada disso for enviado.
+    """
+    arquivo = request.FILES.get("arquivo")
+    if arquivo is not None:
+        return ImportacaoService.ler_arquivo(arquivo.read(), arquivo.name)
+    if isinstance(request.data, list):
+        return request.data
+    if aceita_texto and request.data.get("texto"):
+        return ImportacaoService.ler_texto(request.data["texto"])
+    raise ValueError(
+        "Envie uma lista JSON, o campo 'arquivo'"
+        + (" ou o campo 'texto'" if aceita_texto else "")
+    )
 
 
 # =====================================================
@@ -142,22 +220,15 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         """
         # ✅ Usar super() para respeitar o queryset base
         queryset = super().get_queryset()
-        user = self.request.user
+        papel = self.papel
 
-        # Superuser vê todos
-        if user.is_superuser:
+        # Superuser, líder e admin veem todos
+        if papel.is_lider:
             return queryset
 
-        # Verificar se tem perfil de músico
-        if hasattr(user, "musico"):
-            musico = user.musico
-
-            # Líder/Admin vê todos
-            if musico.tipo_usuario in ["LIDER", "ADMIN"]:
-                return queryset
-
-            # Músico comum vê apenas seu perfil
-            return queryset.filter(id=musico.id)
+        # Músico comum vê apenas seu perfil
+        if papel.musico is not None:
+            return queryset.filter(id=papel.musico.id)
 
         # Usuário sem perfil de músico não vê nada
         return queryset.none()
@@ -177,24 +248,10 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
                 MusicoUpdateSelfSerializer,
             )
 
-            user = self.request.user
-
-            # Superuser sempre pode usar serializer completo
-            if user.is_superuser:
+            # Superuser, líder e admin usam o serializer completo; músico
+            # comum (ou usuário sem músico), o limitado
+            if self.papel.is_lider:
                 return MusicoUpdateLiderSerializer
-
-            # Verificar se tem perfil de músico
-            if hasattr(user, "musico"):
-                musico = user.musico
-
-                # Líder/Admin usa serializer completo
-                if musico.tipo_usuario in ["LIDER", "ADMIN"]:
-                    return MusicoUpdateLiderSerializer
-
-                # Músico comum usa serializer limitado
-                return MusicoUpdateSelfSerializer
-
-            # Fallback
             return MusicoUpdateSelfSerializer
 
         # Leitura: usa serializer padrão
@@ -206,7 +263,7 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         Retorna o perfil do músico autenticado.
         GET /api/musicos/me/
         """
-        if not hasattr(request.user, "musico"):
+        if self.papel.musico is None:
             return Response(
                 {
                     "error": "Usuário não possui perfil de músico",
@@ -215,10 +272,17 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = self.get_serializer(request.user.musico)
+        # Com autenticação por claims, o músico do papel só tem id e tipo
+        musico = self.queryset.get(pk=self.papel.musico.pk)
+        serializer = self.get_serializer(musico)
         return Response(serializer.data)
 
-    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        throttle_classes=[LimiteFcmToken],
+    )
     def atualizar_fcm_token(self, request):
         """
         Atualizar token FCM do músico autenticado.
@@ -226,7 +290,7 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
 
         Body: {"fcm_token": "string"} ou "" para limpar
         """
-        if not hasattr(request.user, "musico"):
+        if self.papel.musico is None:
             return Response(
                 {"error": "Usuário não possui perfil de músico"},
                 status=status.HTTP_404_NOT_FOUND,
@@ -240,19 +304,18 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        musico = request.user.musico
+        musico = self.papel.musico
 
         # Atualizar ou limpar token
         if token == "":
             musico.fcm_token = None
             musico.save(update_fields=["fcm_token"])
-            print(f"🗑️ Token FCM limpo para {musico.nome}")
+            logger.info("Token FCM limpo para o músico %s", musico.id)
             message = "Token limpo com sucesso"
         else:
             musico.fcm_token = token
             musico.save(update_fields=["fcm_token"])
-            print(f"✅ Token FCM atualizado para {musico.nome}")
-            print(f"   Token (30 primeiros chars): {token[:30]}...")
+            logger.info("Token FCM atualizado para o músico %s", musico.id)
             message = "Token atualizado com sucesso"
 
         return Response(
@@ -275,7 +338,7 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
             "confirmar_senha": "string"
         }
         """
-        if not hasattr(request.user, "musico"):
+        if self.papel.musico is None:
             return Response(
                 {"error": "Usuário não possui perfil de músico"},
                 status=status.HTTP_404_NOT_FOUND,
@@ -318,7 +381,7 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         user.set_password(senha_nova)
         user.save()
 
-        print(f"🔐 Senha alterada para {user.musico.nome}")
+        logger.info("Senha alterada pelo usuário %s", user.username)
 
         return Response(
             {
@@ -328,6 +391,41 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsLiderOrReadOnly],
+    )
+    def importar(self, request):
+        """
+        Importa músicos em lote (apenas líderes).
+        POST /api/musicos/importar/
+
+        Body: lista JSON de músicos ou arquivo .csv/.json no campo
+        "arquivo" (multipart). Colunas: nome, email, telefone, endereco,
+        instrumento, tipo_usuario, status. Responde com o relatório por linha.
+        """
+        try:
+            linhas = _linhas_importacao(request)
+            relatorio = ImportacaoService.importar_musicos(linhas)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(
+            "Importação de músicos por %s: %s criados, %s com erro",
+            request.user.username,
+            relatorio["criados"],
+            relatorio["erros"],
+        )
+        return Response(
+            relatorio,
+            status=(
+                status.HTTP_201_CREATED
+                if relatorio["criados"]
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
     @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
     def escalas(self, request, pk=None):
         """
@@ -353,6 +451,24 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         serializer = EscalaSerializer(escalas, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
+    def agenda(self, request, pk=None):
+        """
+        Retorna a URL de assinatura do calendário (.ics) do músico.
+        GET /api/musicos/{id}/agenda/
+        """
+        musico = self.get_object()
+        token = AgendaService.gerar_token(musico.id)
+        url = reverse("musico-agenda-ics", kwargs={"pk": musico.id})
+
+        return Response(
+            {
+                "musico_id": musico.id,
+                "token": token,
+                "url": request.build_absolute_uri(f"{url}?token={token}"),
+            }
+        )
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def disponiveis(self, request):
         """
@@ -362,7 +478,7 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         Apenas líderes e admins podem acessar.
         """
         # Verificar permissão
-        if not self.is_lider_or_admin(request.user):
+        if not self.is_lider_or_admin():
             return Response(
                 {"error": "Sem permissão para acessar esta lista"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -380,6 +496,39 @@ class MusicoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+class AgendaIcsView(APIView):
+    """
+    Feed iCalendar assinável com as escalas e ensaios do músico.
+    GET /api/musicos/{id}/agenda.ics?token=...
+
+    Apps de calendário não enviam o cabeçalho JWT, por isso o acesso é
+    autorizado pelo token assinado retornado em /api/musicos/{id}/agenda/.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk=None):
+        if not AgendaService.token_valido(pk, request.query_params.get("token")):
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+        feed = AgendaService.obter_feed(pk)
+        if feed is None:
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+        if request.headers.get("If-None-Match") == feed["etag"]:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                feed["conteudo"], content_type="text/calendar; charset=utf-8"
+            )
+            response["Content-Disposition"] = f'inline; filename="agenda-{pk}.ics"'
+
+        response["ETag"] = feed["etag"]
+        response["Cache-Control"] = "private, max-age=900"
+        return response
+
+
 class MusicaViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gerenciar músicas do repertório.
@@ -394,6 +543,54 @@ class MusicaViewSet(viewsets.ModelViewSet):
     ordering_fields = ["titulo", "compositor", "created_at"]
     ordering = ["titulo"]
 
+    @action(detail=True, methods=["get"])
+    def cifra(self, request, pk=None):
+        """
+        Cifra da música, opcionalmente transposta.
+        GET /api/musicas/{id}/cifra/?tom=G
+
+        Sem ``tom`` devolve a cifra no tom original. O tom de origem é o
+        campo ``tom`` da música ou, se vazio, o do primeiro acorde.
+        """
+        musica = self.get_object()
+        try:
+            cifra = CifraService.cifra_no_tom(musica, request.query_params.get("tom"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"id": musica.id, "titulo": musica.titulo, **cifra})
+
+    @action(detail=False, methods=["post"])
+    def importar(self, request):
+        """
+        Importa músicas em lote, criando os artistas que faltarem.
+        POST /api/musicas/importar/
+
+        Body: lista JSON, arquivo .csv/.json/.txt no campo "arquivo"
+        (multipart) ou {"texto": "Título - Artista\n..."}. Colunas: titulo,
+        artista, tom, link_cifra, link_youtube, conteudo_cifra.
+        """
+        try:
+            linhas = _linhas_importacao(request, aceita_texto=True)
+            relatorio = ImportacaoService.importar_musicas(linhas)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(
+            "Importação de músicas por %s: %s criadas, %s existentes, %s com erro",
+            request.user.username,
+            relatorio["criadas"],
+            relatorio["existentes"],
+            relatorio["erros"],
+        )
+        if relatorio["criadas"]:
+            codigo = status.HTTP_201_CREATED
+        elif relatorio["existentes"]:
+            codigo = status.HTTP_200_OK
+        else:
+            codigo = status.HTTP_400_BAD_REQUEST
+        return Response(relatorio, status=codigo)
+
 
 class EscalaViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
     """
@@ -414,9 +611,12 @@ class EscalaViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
 
     serializer_class = EscalaSerializer
     permission_classes = [IsAuthenticated, IsLiderOrReadOnly]
+    # Não há DEFAULT_FILTER_BACKENDS: sem isto os filtros abaixo são ignorados
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ["confirmado", "evento", "musico"]
     ordering_fields = ["evento__data_evento", "created_at"]
-    ordering = ["-evento__data_evento"]
+    # Mesma ordem de /api/async/escalas/ (id desempata a paginação)
+    ordering = ["-evento__data_evento", "id"]
 
     def get_queryset(self):
         """
@@ -424,25 +624,19 @@ class EscalaViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         """
         # ✅ Usar super() para respeitar o queryset base
         queryset = super().get_queryset()
-        user = self.request.user
+        papel = self.papel
 
-        # Superuser vê todas
-        if user.is_superuser:
+        # Superuser, líder e admin veem todas
+        if papel.is_lider:
             return queryset
 
-        # Verificar se tem perfil de músico
-        if hasattr(user, "musico"):
-            musico = user.musico
-
-            # Líder/Admin vê todas
-            if musico.tipo_usuario in ["LIDER", "ADMIN"]:
-                return queryset
-
-            # Músico comum vê apenas suas escalas
-            return queryset.filter(musico=musico)
+        # Músico comum vê apenas suas escalas
+        if papel.musico is not None:
+            return queryset.filter(musico_id=papel.musico.id)
 
         return queryset.none()
 
+    @idempotente
     def create(self, request, *args, **kwargs):
         """
         Cria escala e envia notificação para o músico escalado.
@@ -455,26 +649,27 @@ class EscalaViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
             # Buscar escala criada com relacionamentos
             escala = self.get_queryset().get(id=response.data["id"])
 
-            print("\n🎵 Nova escala criada:")
-            print(f"   ID: {escala.id}")
-            print(f"   Músico: {escala.musico.nome} (ID: {escala.musico.id})")
-            print(f"   Evento: {escala.evento.nome}")
-            print(f"   Data: {escala.evento.data_evento}")
+            logger.info(
+                "Escala %s criada: músico %s no evento %s",
+                escala.id,
+                escala.musico_id,
+                escala.evento_id,
+            )
 
             # Enviar notificação se músico tem token FCM
             if escala.musico.fcm_token:
-                print(f"📤 Enviando notificação para {escala.musico.nome}...")
-
                 sucesso = NotificationService.enviar_notificacao_escala(
                     musico=escala.musico, evento=escala.evento
                 )
 
-                if sucesso:
-                    print("✅ Notificação enviada com sucesso!")
-                else:
-                    print("❌ Falha ao enviar notificação")
+                if not sucesso:
+                    logger.warning(
+                        "Falha ao notificar o músico %s da escala %s",
+                        escala.musico_id,
+                        escala.id,
+                    )
             else:
-                print(f"⚠️ Músico {escala.musico.nome} não possui FCM token cadastrado")
+                logger.info("Músico %s sem token FCM cadastrado", escala.musico_id)
 
             return response
 
@@ -482,19 +677,21 @@ class EscalaViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
             raise
 
         except ValidationError as e:
-            print(f"❌ Erro de validação: {e}")
+            logger.info("Escala recusada na validação: %s", e)
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"❌ Erro inesperado: {type(e).__name__}: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("Erro inesperado ao criar escala")
             return Response(
                 {"detail": f"Erro ao criar escala: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        throttle_classes=[LimiteConfirmar],
+    )
     def confirmar(self, request, pk=None):
         """
         Confirma presença do músico na escala.
@@ -505,32 +702,41 @@ class EscalaViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         escala = self.get_object()
 
         # Verificar permissão
-        if hasattr(request.user, "musico"):
-            musico = request.user.musico
-
-            # Apenas o próprio músico, líderes ou admins podem confirmar
-            if musico.id != escala.musico.id and musico.tipo_usuario not in [
-                "LIDER",
-                "ADMIN",
-            ]:
-                return Response(
-                    {"error": "Você não pode confirmar a escala de outro músico"},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-        else:
+        papel = self.papel
+        if papel.musico is None:
             return Response(
                 {"error": "Usuário não possui perfil de músico"},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
+        # Apenas o próprio músico, líderes ou admins podem confirmar
+        if not (papel.e_o_musico(escala.musico_id) or papel.is_lider):
+            return Response(
+                {"error": "Você não pode confirmar a escala de outro músico"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
         # Atualizar confirmação
         confirmado = request.data.get("confirmado", True)
         escala.confirmado = confirmado
         escala.save(update_fields=["confirmado"])
 
-        print(
-            f"{'✅' if confirmado else '❌'} Escala {escala.id} "
-            f"{'confirmada' if confirmado else 'desconfirmada'} por {musico.nome}"
+        logger.info(
+            "Escala %s %s pelo músico %s",
+            escala.id,
+            "confirmada" if confirmado else "desconfirmada",
+            papel.musico.id,
+        )
+
+        publicar_evento(
+            escala.evento_id,
+            "confirmacao",
+            {
+                "escala_id": escala.id,
+                "musico_id": escala.musico_id,
+                "musico": escala.musico.nome,
+                "confirmado": escala.confirmado,
+            },
         )
 
         return Response(
@@ -543,13 +749,90 @@ class EscalaViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
             }
         )
 
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        throttle_classes=[LimiteConfirmar],
+    )
+    def confirmar_lote(self, request):
+        """
+        Confirma presença em várias escalas de uma vez.
+        POST /api/escalas/confirmar_lote/
+
+        Body: {"escalas": [1, 2, 3], "confirmado": true}
+
+        O músico só confirma as próprias escalas; líderes, as de qualquer um.
+        Ou todas são alteradas, ou nenhuma. Os líderes recebem uma única
+        notificação com as escalas confirmadas.
+        """
+        papel = self.papel
+        if papel.musico is None:
+            return Response(
+                {"error": "Usuário não possui perfil de músico"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        confirmado = request.data.get("confirmado", True)
+        if not isinstance(confirmado, bool):
+            return Response(
+                {"error": "O campo 'confirmado' deve ser true ou false"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            alteradas = GerenciadorEscala.confirmar_lote(
+                request.data.get("escalas"),
+                confirmado,
+                musico_id=None if papel.is_lider else papel.musico.id,
+            )
+        except ValidationError as e:
+            return Response(
+                {"error": " ".join(e.messages)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        logger.info(
+            "%s escalas %s em lote pelo músico %s",
+            len(alteradas),
+            "confirmadas" if confirmado else "desconfirmadas",
+            papel.musico.id,
+        )
+
+        for escala in alteradas:
+            publicar_evento(
+                escala["evento_id"],
+                "confirmacao",
+                {
+                    "escala_id": escala["id"],
+                    "musico_id": escala["musico_id"],
+                    "musico": escala["musico__nome"],
+                    "confirmado": confirmado,
+                },
+            )
+        NotificationService.enviar_notificacao_confirmacoes(
+            papel.musico, alteradas, confirmado
+        )
+
+        return Response(
+            {
+                "status": f"Presença {'confirmada' if confirmado else 'desconfirmada'}",
+                "confirmado": confirmado,
+                "escalas_alteradas": [escala["id"] for escala in alteradas],
+            }
+        )
+
 
 class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar eventos com otimizações agressivas.
     """
 
-    queryset = Evento.objects.prefetch_related("repertorio").all()
+    queryset = Evento.objects.prefetch_related(
+        Prefetch(
+            "repertorio",
+            queryset=Musica.objects.order_by(*ItemRepertorio.ORDEM_MUSICAS),
+        )
+    ).all()
 
     serializer_class = EventoSerializer
     permission_classes = [IsAuthenticated, IsLiderOrReadOnly]
@@ -580,11 +863,15 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         # Aplicar prefetch adicional
         return queryset.prefetch_related(escalas_prefetch)
 
-    @action(
-        detail=True,
-        methods=["post"],
-        permission_classes=[IsAuthenticated, IsLiderOrReadOnly],
-    )
+    def _evento_sem_prefetch(self, pk):
+        """
+        Como get_object(), mas sem os prefetches de escalas e repertório do
+        get_queryset, que as ações de repertório não usam.
+        """
+        evento = get_object_or_404(Evento, pk=pk)
+        self.check_object_permissions(self.request, evento)
+        return evento
+
     @action(detail=True, methods=["get"], url_path="compartilhar")
     def compartilhar(self, request, pk=None):
         """
@@ -597,15 +884,22 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         except ValueError as e:
             return Response({"detail": str(e)}, status=404)
 
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsLiderOrReadOnly],
+    )
     def adicionar_repertorio(self, request, pk=None):
         """
-        Adicionar músicas ao repertório do evento.
+        Adicionar músicas ao repertório do evento (no fim, ou a partir do
+        índice "posicao").
         POST /api/eventos/{id}/adicionar_repertorio/
 
-        Body: {"musicas": [1, 2, 3]}
+        Body: {"musicas": [1, 2, 3], "posicao": 0}
         """
-        evento = self.get_object()
+        evento = self._evento_sem_prefetch(pk)
         musica_ids = request.data.get("musicas", [])
+        posicao = request.data.get("posicao")
 
         # Validação: lista vazia
         if not musica_ids:
@@ -621,6 +915,12 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if posicao is not None and (not isinstance(posicao, int) or posicao < 0):
+            return Response(
+                {"error": "O campo 'posicao' deve ser um índice a partir de 0"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         # Validar se as músicas existem
         musicas_existentes = Musica.objects.filter(id__in=musica_ids).values_list(
             "id", flat=True
@@ -638,11 +938,11 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Adicionar músicas ao repertório
-        evento.repertorio.add(*ids_encontrados)
+        # Adicionar músicas ao repertório, na ordem enviada
+        ordem = RepertorioService.adicionar(evento, musica_ids, posicao)
 
-        print(
-            f"✅ {len(ids_encontrados)} músicas adicionadas ao evento '{evento.nome}'"
+        logger.info(
+            "%s músicas adicionadas ao evento %s", len(ids_encontrados), evento.id
         )
 
         return Response(
@@ -650,8 +950,9 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
                 "status": "Repertório atualizado",
                 "evento_id": evento.id,
                 "evento_nome": evento.nome,
-                "total_musicas": evento.repertorio.count(),
+                "total_musicas": len(ordem),
                 "musicas_adicionadas": len(ids_encontrados),
+                "repertorio": ordem,
             },
             status=status.HTTP_200_OK,
         )
@@ -666,8 +967,10 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         Substitui o repertório do evento pela lista enviada (replace completo).
         PUT /api/eventos/{id}/atualizar_repertorio/
         Body: { "musicas": [1, 2, 3] }
+
+        Só as músicas que saem, entram ou mudam de lugar são gravadas.
         """
-        evento = self.get_object()
+        evento = self._evento_sem_prefetch(pk)
         musica_ids = request.data.get("musicas", [])
 
         if not isinstance(musica_ids, list):
@@ -691,19 +994,188 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # set() substitui toda a M2M — remove as antigas e adiciona as novas
-        evento.repertorio.set(musica_ids)
+        ordem = RepertorioService.substituir(evento, musica_ids)
 
         return Response(
             {
                 "status": "Repertório atualizado",
                 "evento_id": evento.id,
                 "evento_nome": evento.nome,
-                "total_musicas": evento.repertorio.count(),
+                "total_musicas": len(ordem),
+                "repertorio": ordem,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(
+        detail=True,
+        methods=["patch"],
+        url_path="repertorio",
+        permission_classes=[IsAuthenticated, IsLiderOrReadOnly],
+    )
+    def reordenar_repertorio(self, request, pk=None):
+        """
+        Aplica operações de inserir/mover/remover no repertório, em ordem.
+        PATCH /api/eventos/{id}/repertorio/
+        Body: {"operacoes": [
+            {"acao": "mover", "musica": 12, "posicao": 0},
+            {"acao": "inserir", "musica": 15, "posicao": 2},
+            {"acao": "remover", "musica": 9}
+        ]} (ou só a lista). "posicao" é o índice, a partir de 0, na lista
+        resultante.
+        """
+        evento = self._evento_sem_prefetch(pk)
+        operacoes = (
+            request.data
+            if isinstance(request.data, list)
+            else request.data.get("operacoes")
+        )
+        try:
+            ordem = RepertorioService.aplicar(evento, operacoes)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "status": "Repertório atualizado",
+                "evento_id": evento.id,
+                "total_musicas": len(ordem),
+                "repertorio": ordem,
             },
             status=status.HTTP_200_OK,
         )
 
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsLiderOrReadOnly],
+    )
+    def duplicar(self, request, pk=None):
+        """
+        Cria uma cópia do evento em outra data, com o mesmo repertório e a
+        mesma equipe (músicos indisponíveis na nova data ficam de fora).
+        POST /api/eventos/{id}/duplicar/
+        Body: {"data_evento": "2025-06-08T19:00", "data_hora_ensaio": "...",
+               "nome": "..."}  (só data_evento é obrigatório)
+        """
+        evento = self._evento_sem_prefetch(pk)
+
+        # Mesma conversão dos serializers: datas com offset/"Z" viram
+        # datetimes sem fuso (USE_TZ=False), comparáveis com now()
+        campo_data = serializers.DateTimeField()
+        datas = {}
+        for campo in ("data_evento", "data_hora_ensaio"):
+            valor = request.data.get(campo)
+            try:
+                datas[campo] = campo_data.to_internal_value(valor) if valor else None
+            except DRFValidationError:
+                return Response(
+                    {"error": f"Data inválida em '{campo}'"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if datas["data_evento"] is None:
+            return Response(
+                {"error": "Informe a data do novo evento em 'data_evento'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if datas["data_evento"] < now():
+            return Response(
+                {"error": "A data do evento não pode ser no passado."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            copia = DuplicacaoService.duplicar(
+                evento,
+                datas["data_evento"],
+                data_hora_ensaio=datas["data_hora_ensaio"],
+                nome=request.data.get("nome"),
+            )
+        except ValidationError as e:
+            return Response({"error": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+
+        novo = copia["evento"]
+        logger.info(
+            "Evento %s duplicado como %s (%s escalas, %s puladas)",
+            evento.id,
+            novo.id,
+            copia["escalas_copiadas"],
+            len(copia["puladas"]),
+        )
+        return Response(
+            {
+                "id": novo.id,
+                "nome": novo.nome,
+                "data_evento": novo.data_evento,
+                "data_hora_ensaio": novo.data_hora_ensaio,
+                "escalas_copiadas": copia["escalas_copiadas"],
+                "musicas_copiadas": copia["musicas_copiadas"],
+                "musicos_indisponiveis": [
+                    {"musico_id": escala.musico_id, "nome": escala.musico.nome}
+                    for escala in copia["puladas"]
+                ],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=True, methods=["get"])
+    def setlist(self, request, pk=None):
+        """
+        Todas as cifras do repertório em uma resposta, para uso offline.
+        GET /api/eventos/{id}/setlist/?tons=12:A,15:Bb
+
+        Resposta comprimida (brotli/gzip conforme Accept-Encoding), com ETag
+        (304 em If-None-Match) e suporte a Range/If-Range para retomar o
+        download interrompido.
+        """
+        evento = self._evento_sem_prefetch(pk)
+
+        try:
+            tons = SetlistService.interpretar_tons(request.query_params.get("tons"))
+            codificacao = SetlistService.negociar_codificacao(
+                request.headers.get("Accept-Encoding", "")
+            )
+            pacote = SetlistService.obter(evento, tons, codificacao)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        etag, conteudo = pacote["etag"], pacote["conteudo"]
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [valor.strip() for valor in if_none_match.split(",")]:
+            response = HttpResponseNotModified()
+        else:
+            intervalo = None
+            if_range = request.headers.get("If-Range")
+            if if_range is None or if_range == etag:
+                intervalo = SetlistService.intervalo(
+                    request.headers.get("Range"), len(conteudo)
+                )
+
+            if intervalo is False:
+                response = HttpResponse(
+                    status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+                )
+                response["Content-Range"] = f"bytes */{len(conteudo)}"
+            elif intervalo:
+                inicio, fim = intervalo
+                response = HttpResponse(
+                    conteudo[inicio : fim + 1],
+                    content_type="application/json",
+                    status=status.HTTP_206_PARTIAL_CONTENT,
+                )
+                response["Content-Range"] = f"bytes {inicio}-{fim}/{len(conteudo)}"
+            else:
+                response = HttpResponse(conteudo, content_type="application/json")
+
+            if codificacao != "identity" and intervalo is not False:
+                response["Content-Encoding"] = codificacao
+
+        response["ETag"] = etag
+        patch_vary_headers(response, ["Accept-Encoding"])
+        response["Accept-Ranges"] = "bytes"
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def proximos(self, request):
         """
@@ -717,6 +1189,9 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         except (ValueError, TypeError):
             limit = 10
 
+        # Gera as próximas ocorrências das séries recorrentes (1x por dia)
+        RecorrenciaService.estender_se_necessario()
+
         # Usar get_queryset() para respeitar otimizações
         eventos = (
             self.get_queryset()
@@ -728,6 +1203,55 @@ class EventoViewSet(MusicoPermissionMixin, viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+class SerieEventoViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet para séries de eventos recorrentes (cultos semanais, células...).
+    Ao criar a série, as ocorrências do horizonte padrão já são geradas.
+    """
+
+    queryset = SerieEvento.objects.all()
+    serializer_class = SerieEventoSerializer
+    permission_classes = [IsAuthenticated, IsLiderOrReadOnly]
+    filterset_fields = ["tipo", "frequencia", "ativa"]
+    search_fields = ["nome", "local"]
+    ordering = ["nome"]
+
+    def perform_create(self, serializer):
+        serie = serializer.save()
+        RecorrenciaService.gerar(serie)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsLiderOrReadOnly],
+    )
+    def gerar(self, request, pk=None):
+        """
+        Gera as ocorrências até a data informada.
+        POST /api/series/{id}/gerar/
+        Body: {"ate": "2025-12-31"}  (padrão: hoje + horizonte)
+        """
+        serie = self.get_object()
+        ate = request.data.get("ate")
+        if ate:
+            ate = parse_date(str(ate))
+            if ate is None:
+                return Response(
+                    {"error": "Data inválida em 'ate' (use AAAA-MM-DD)"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        ids = RecorrenciaService.gerar(serie, ate)
+        return Response(
+            {
+                "serie_id": serie.id,
+                "eventos_criados": ids,
+                "gerado_ate": serie.gerado_ate,
+            },
+            status=status.HTTP_201_CREATED if ids else status.HTTP_200_OK,
+        )
+
+
 class InstrumentoViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gerenciar instrumentos.
@@ -804,7 +1328,17 @@ class ComentarioPerformanceViewSet(MusicoPermissionMixin, viewsets.ModelViewSet)
         context["request"] = self.request
         return context
 
-    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    @idempotente
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        throttle_classes=[LimiteReagir],
+    )
+    @idempotente
     def reagir(self, request, pk=None):
         """
         Toggle de curtida 👍 no comentário.
@@ -821,6 +1355,7 @@ class ComentarioPerformanceViewSet(MusicoPermissionMixin, viewsets.ModelViewSet)
         if not criada:
             reacao.delete()
             total = ReacaoComentario.objects.filter(comentario=comentario).count()
+            self._publicar_reacao(comentario, total)
 
             return Response(
                 {
@@ -831,6 +1366,7 @@ class ComentarioPerformanceViewSet(MusicoPermissionMixin, viewsets.ModelViewSet)
             )
 
         total = ReacaoComentario.objects.filter(comentario=comentario).count()
+        self._publicar_reacao(comentario, total)
 
         return Response(
             {
@@ -839,3 +1375,81 @@ class ComentarioPerformanceViewSet(MusicoPermissionMixin, viewsets.ModelViewSet)
             },
             status=status.HTTP_201_CREATED,
         )
+
+    @staticmethod
+    def _publicar_reacao(comentario, total):
+        publicar_evento(
+            comentario.evento_id,
+            "reacao",
+            {"comentario_id": comentario.id, "total_reacoes": total},
+        )
+
+
+# =====================================================
+# SINCRONIZAÇÃO INCREMENTAL (APP MOBILE)
+# =====================================================
+class SincronizacaoView(APIView):
+    """
+    Delta de eventos, escalas, músicas, artistas, instrumentos e comentários
+    desde o cursor informado.
+    GET /api/sync/?since=<cursor>
+
+    Sem ``since`` (ou com cursor expirado) responde ``{"reset": true,
+    "cursor": N}``: o app refaz a carga completa pelos endpoints de listagem
+    e passa a sincronizar a partir de N. Cada recurso traz os objetos
+    ``salvos`` (mesmo formato da listagem) e os ids ``removidos``; enquanto
+    ``mais`` for true, o app repete a chamada com o novo cursor.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    # Recurso -> ViewSet cuja listagem o app espelha (queryset e permissões)
+    VIEWSETS = {
+        "eventos": EventoViewSet,
+        "escalas": EscalaViewSet,
+        "musicas": MusicaViewSet,
+        "artistas": ArtistaViewSet,
+        "instrumentos": InstrumentoViewSet,
+        "comentarios": ComentarioPerformanceViewSet,
+    }
+
+    def get(self, request):
+        since = request.query_params.get("since")
+        if not since:
+            return Response(
+                {"reset": True, "cursor": SincronizacaoService.cursor_atual()}
+            )
+        if not since.isdigit():
+            return Response(
+                {"since": ["Informe um cursor numérico válido."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        delta = SincronizacaoService.alteracoes_desde(int(since))
+        if delta is None:
+            return Response(
+                {"reset": True, "cursor": SincronizacaoService.cursor_atual()}
+            )
+
+        dados = {"reset": False, "cursor": delta["cursor"], "mais": delta["mais"]}
+        for recurso, ids in delta["alteracoes"].items():
+            dados[recurso] = self._serializar(request, recurso, ids)
+        return Response(dados)
+
+    def _serializar(self, request, recurso, ids):
+        if not ids["salvos"]:
+            return {"salvos": [], "removidos": ids["removidos"]}
+
+        viewset = self.VIEWSETS[recurso](
+            request=request, format_kwarg=None, action="list", kwargs={}
+        )
+        objetos = list(viewset.get_queryset().filter(pk__in=ids["salvos"]))
+
+        # Objetos que o usuário deixou de enxergar saem do cache do app
+        visiveis = {obj.pk for obj in objetos}
+        removidos = ids["removidos"] + [
+            pk for pk in ids["salvos"] if pk not in visiveis
+        ]
+
+        serializer = viewset.get_serializer(objetos, many=True)
+        return {"salvos": serializer.data, "removidos": removidos}
@@ -11,4 +11,4 @@ class CoreConfig(AppConfig):
         """
         Executado quando o Django carrega o app.
         """
-        pass
+        from core import checks, signals  # noqa: F401
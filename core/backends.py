@@ -0,0 +1,36 @@
+"""
+Backend de autenticação usado no login (API e admin).
+
+Igual ao ``ModelBackend``, mas busca usuário, músico e instrumento principal
+em uma única consulta: o token e a resposta do login (``get_token`` e
+``validate`` do ``MyTokenObtainPairSerializer``) usam esses dados sem voltar
+ao banco.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class LoginBackend(ModelBackend):
+    SELECT_RELATED = ("musico", "musico__instrumento_principal")
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.select_related(*self.SELECT_RELATED).get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            # Mesmo custo de um hash, como no ModelBackend (timing attack)
+            UserModel().set_password(password)
+            return None
+        # Rehash transparente: se o hasher preferido mudou (SENHA_HASHER),
+        # check_password regrava a senha com ele
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,40 @@
+"""
+Verificações de configuração (``manage.py check``), executadas na
+inicialização dos comandos e do servidor.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Backends cujo conteúdo fica na memória de cada processo
+CACHES_LOCAIS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def cache_compartilhado(app_configs, **kwargs):
+    """
+    Estado que precisa ser visto por todos os workers fica no cache: a lista
+    de negação dos refresh tokens rotativos (``core.api.tokens``) e as
+    respostas guardadas pelo ``Idempotency-Key`` (``core.api.idempotencia``).
+    Com cache local, um refresh já usado continua valendo e uma repetição
+    que cai em outro processo executa a escrita de novo.
+    """
+    if settings.DEBUG or not getattr(settings, "EXIGIR_CACHE_COMPARTILHADO", True):
+        return []
+
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend not in CACHES_LOCAIS:
+        return []
+    return [
+        Error(
+            f"O cache padrão ({backend}) não é compartilhado entre processos.",
+            hint=(
+                "Defina CACHE_URL (ex.: redis://localhost:6379/1): a negação "
+                "de refresh tokens e o Idempotency-Key dependem dele."
+            ),
+            id="core.E001",
+        )
+    ]
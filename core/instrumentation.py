@@ -0,0 +1,292 @@
+"""
+Instrumentação amostrada de requisições.
+
+Configurada via ``settings.SGGM_PROFILING``:
+
+    SGGM_PROFILING = {
+        "HABILITADO": False,        # desligado: o middleware nem é carregado
+        "AMOSTRAGEM": 0.01,         # fração das requisições instrumentadas
+        "LIMIAR_LENTO_MS": 1000,    # acima disso a captura é gravada
+        "CAPTURA": "",              # "", "cprofile" ou "pyinstrument"
+        "DIRETORIO": "profiles",    # onde as capturas são gravadas
+    }
+
+Cada requisição amostrada gera uma linha no logger ``sggm.perf`` com o tempo
+total e os spans acumulados: ``db`` (todas as consultas SQL), ``renderizacao``
+(renderização da resposta DRF), ``externo`` (chamadas a serviços externos,
+como o FCM) e quaisquer outros marcados com ``span("nome")``. Fora de uma
+requisição amostrada, ``span`` não faz nada.
+"""
+
+import cProfile
+import logging
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("sggm.perf")
+
+_trace = ContextVar("sggm_trace", default=None)
+
+PADRAO = {
+    "HABILITADO": False,
+    "AMOSTRAGEM": 0.01,
+    "LIMIAR_LENTO_MS": 1000,
+    "CAPTURA": "",
+    "DIRETORIO": "profiles",
+}
+
+
+def configuracao():
+    return {**PADRAO, **getattr(settings, "SGGM_PROFILING", {})}
+
+
+class Trace:
+    """Spans acumulados de uma requisição: nome -> [duração (s), quantidade]."""
+
+    def __init__(self):
+        self.spans = {}
+
+    def adicionar(self, nome, duracao):
+        span = self.spans.setdefault(nome, [0.0, 0])
+        span[0] += duracao
+        span[1] += 1
+
+    def resumo(self):
+        return {
+            nome: {"ms": round(duracao * 1000, 2), "n": quantidade}
+            for nome, (duracao, quantidade) in self.spans.items()
+        }
+
+
+@contextmanager
+def span(nome):
+    """Acumula o tempo do bloco no trace da requisição atual, se houver."""
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.adicionar(nome, time.perf_counter() - inicio)
+
+
+# -------------------------
+# BANCO DE DADOS
+# -------------------------
+def _cronometrar_consulta(execute, sql, params, many, context):
+    trace = _trace.get()
+    if trace is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        trace.adicionar("db", time.perf_counter() - inicio)
+
+
+def _instalar_na_conexao(sender, connection, **kwargs):
+    if _cronometrar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_cronometrar_consulta)
+
+
+# -------------------------
+# CAPTURA DE PROFILE
+# -------------------------
+class _CapturaCProfile:
+    extensao = "prof"
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+
+    def iniciar(self):
+        try:
+            self._profiler.enable()
+        except ValueError:
+            # Outro profiler já ativo (ex.: requisição concorrente)
+            return False
+        return True
+
+    def parar(self):
+        self._profiler.disable()
+
+    def gravar(self, caminho):
+        self._profiler.dump_stats(caminho)
+
+
+class _CapturaPyinstrument:
+    extensao = "html"
+
+    def __init__(self, async_mode="disabled"):
+        from pyinstrument import Profiler
+
+        self._profiler = Profiler(async_mode=async_mode)
+
+    def iniciar(self):
+        self._profiler.start()
+        return True
+
+    def parar(self):
+        self._profiler.stop()
+
+    def gravar(self, caminho):
+        Path(caminho).write_text(self._profiler.output_html(), encoding="utf-8")
+
+
+# -------------------------
+# MIDDLEWARE
+# -------------------------
+class InstrumentacaoMiddleware:
+    """
+    Mede requisições amostradas e registra os spans no logger ``sggm.perf``.
+    Com ``CAPTURA`` definida, grava o profile das requisições mais lentas que
+    ``LIMIAR_LENTO_MS`` em ``DIRETORIO``. O cProfile só enxerga a thread da
+    requisição, por isso nas views assíncronas apenas o pyinstrument captura.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = configuracao()
+        if not config["HABILITADO"]:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.amostragem = config["AMOSTRAGEM"]
+        self.limiar = config["LIMIAR_LENTO_MS"] / 1000
+        self.captura = config["CAPTURA"]
+        self.diretorio = Path(config["DIRETORIO"])
+
+        if self.captura not in ("", "cprofile", "pyinstrument"):
+            raise ImproperlyConfigured(
+                f"SGGM_PROFILING['CAPTURA'] inválida: {self.captura!r}"
+            )
+        if self.captura == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError as exc:
+                raise ImproperlyConfigured(
+                    "CAPTURA='pyinstrument' requer o pacote 'pyinstrument'."
+                ) from exc
+
+        connection_created.connect(_instalar_na_conexao, dispatch_uid="sggm_perf_db")
+        from django.db import connections
+
+        for conexao in connections.all(initialized_only=True):
+            _instalar_na_conexao(None, conexao)
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.amostragem:
+            return self.get_response(request)
+
+        captura = self._nova_captura(assincrona=False)
+        trace = Trace()
+        token = _trace.set(trace)
+        ativa = captura is not None and captura.iniciar()
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            duracao = time.perf_counter() - inicio
+            if ativa:
+                captura.parar()
+            _trace.reset(token)
+        self._finalizar(request, response, trace, duracao, captura if ativa else None)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.amostragem:
+            return await self.get_response(request)
+
+        captura = (
+            self._nova_captura(assincrona=True)
+            if self.captura == "pyinstrument"
+            else None
+        )
+        trace = Trace()
+        token = _trace.set(trace)
+        ativa = captura is not None and captura.iniciar()
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            duracao = time.perf_counter() - inicio
+            if ativa:
+                captura.parar()
+            _trace.reset(token)
+        self._finalizar(request, response, trace, duracao, captura if ativa else None)
+        return response
+
+    def process_template_response(self, request, response):
+        # Respostas DRF são renderizadas depois da view: mede a renderização
+        trace = _trace.get()
+        if trace is not None:
+            inicio = time.perf_counter()
+
+            def registrar(renderizada):
+                trace.adicionar("renderizacao", time.perf_counter() - inicio)
+                return renderizada
+
+            response.add_post_render_callback(registrar)
+        return response
+
+    def _nova_captura(self, assincrona):
+        if self.captura == "cprofile":
+            return _CapturaCProfile()
+        if self.captura == "pyinstrument":
+            return _CapturaPyinstrument("enabled" if assincrona else "disabled")
+        return None
+
+    def _finalizar(self, request, response, trace, duracao, captura):
+        spans = trace.resumo()
+        arquivo = None
+        if captura is not None and duracao >= self.limiar:
+            arquivo = self._gravar(request, duracao, captura)
+
+        logger.info(
+            "%s %s %s %.1fms %s",
+            request.method,
+            request.path,
+            response.status_code,
+            duracao * 1000,
+            " ".join(f"{nome}={s['ms']}ms/{s['n']}" for nome, s in spans.items()),
+            extra={
+                "metodo": request.method,
+                "caminho": request.path,
+                "status": response.status_code,
+                "duracao_ms": round(duracao * 1000, 2),
+                "spans": spans,
+                "profile": arquivo,
+            },
+        )
+
+    def _gravar(self, request, duracao, captura):
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        rota = re.sub(r"[^A-Za-z0-9]+", "_", request.path).strip("_") or "raiz"
+        nome = (
+            f"{time.strftime('%Y%m%d-%H%M%S')}_{request.method}_{rota}"
+            f"_{int(duracao * 1000)}ms.{captura.extensao}"
+        )
+        caminho = self.diretorio / nome
+        try:
+            captura.gravar(caminho)
+        except OSError:
+            logger.exception("Falha ao gravar profile em %s", caminho)
+            return None
+        return str(caminho)
@@ -0,0 +1,167 @@
+"""
+Executa todas as rotas GET de ``core/api/urls.py`` pelo test client e mede
+latência (p50/p95), consultas SQL por requisição e bytes da resposta.
+
+    python manage.py seed_benchmark
+    python manage.py benchmark_api --repeticoes 20 --saida benchmark.json
+
+A saída é JSON com chaves ordenadas, para comparar (diff) entre commits.
+"""
+
+import json
+import re
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.api import urls as api_urls
+from core.models import Musico
+from core.services import AgendaService
+
+# Rotas que não terminam (SSE) ou que alteram estado
+ROTAS_IGNORADAS = {"async-evento-stream", "logout"}
+
+# Parâmetro pk nas rotas do router (regex) e nas rotas com path()
+ROTA_PK = re.compile(r"<int:pk>|\(\?P<pk>[^)]*\)")
+
+
+def _percentil(valores, percentual):
+    ordenados = sorted(valores)
+    return ordenados[max(0, int(round(len(ordenados) * percentual)) - 1)]
+
+
+def coletar_rotas(padroes=None, prefixo="/api/"):
+    """Lista (nome, rota, view) das URLs da API, expandindo includes."""
+    rotas = []
+    for padrao in padroes if padroes is not None else api_urls.urlpatterns:
+        if isinstance(padrao, URLResolver):
+            rotas += coletar_rotas(padrao.url_patterns, prefixo + str(padrao.pattern))
+        elif isinstance(padrao, URLPattern):
+            rotas.append((padrao.name, prefixo + str(padrao.pattern), padrao))
+    return rotas
+
+
+def _aceita_get(padrao):
+    callback = padrao.callback
+    acoes = getattr(callback, "actions", None)
+    if acoes is not None:
+        return "get" in acoes
+    classe = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+    if classe is not None:
+        return hasattr(classe, "get")
+    return True
+
+
+def _modelo(padrao):
+    classe = getattr(padrao.callback, "cls", None)
+    queryset = getattr(classe, "queryset", None)
+    return queryset.model if queryset is not None else None
+
+
+class Command(BaseCommand):
+    help = "Mede latência, consultas e bytes de todas as rotas GET da API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeticoes", type=int, default=10)
+        parser.add_argument(
+            "--usuario",
+            help="Username autenticado nas requisições (padrão: primeiro líder)",
+        )
+        parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+
+    def handle(self, *args, **options):
+        user = self._usuario(options["usuario"])
+        client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+
+        resultado = {}
+        # O test client usa o host "testserver"
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for nome, rota, padrao in coletar_rotas():
+                if nome in ROTAS_IGNORADAS or "format" in rota:
+                    continue
+                if not _aceita_get(padrao):
+                    continue
+                url = self._montar_url(rota, padrao, user)
+                if url is None:
+                    self.stderr.write(f"⚠️ Sem dados para {nome} ({rota}), ignorada")
+                    continue
+                resultado[nome] = self._medir(client, url, options["repeticoes"])
+
+        saida = json.dumps(resultado, indent=2, sort_keys=True, ensure_ascii=False)
+        if options["saida"]:
+            with open(options["saida"], "w", encoding="utf-8") as arquivo:
+                arquivo.write(saida + "\n")
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ {len(resultado)} rotas medidas em {options['saida']}"
+                )
+            )
+        else:
+            self.stdout.write(saida)
+
+    def _usuario(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"Usuário '{username}' não encontrado.")
+
+        musico = (
+            Musico.objects.filter(
+                tipo_usuario__in=["LIDER", "ADMIN"], user__isnull=False
+            )
+            .select_related("user")
+            .order_by("id")
+            .first()
+        )
+        if musico is None:
+            raise CommandError(
+                "Nenhum líder encontrado. Rode seed_benchmark ou use --usuario."
+            )
+        return musico.user
+
+    def _montar_url(self, rota, padrao, user):
+        rota = rota.replace("^", "", 1).removesuffix("$")
+        if not ROTA_PK.search(rota):
+            return rota
+
+        if padrao.name == "musico-agenda-ics":
+            musico_id = user.musico.id
+            token = AgendaService.gerar_token(musico_id)
+            return ROTA_PK.sub(str(musico_id), rota) + f"?token={token}"
+
+        modelo = _modelo(padrao)
+        pk = modelo and modelo.objects.order_by("-id").values_list("id", flat=True)[:1]
+        if not pk:
+            return None
+        return ROTA_PK.sub(str(pk[0]), rota)
+
+    def _medir(self, client, url, repeticoes):
+        client.get(url)  # aquecimento
+
+        tempos, consultas = [], []
+        for _ in range(repeticoes):
+            with CaptureQueriesContext(connection) as contexto:
+                inicio = time.perf_counter()
+                response = client.get(url)
+                tempos.append(time.perf_counter() - inicio)
+            consultas.append(len(contexto.captured_queries))
+
+        return {
+            "url": url,
+            "status": response.status_code,
+            "p50_ms": round(statistics.median(tempos) * 1000, 2),
+            "p95_ms": round(_percentil(tempos, 0.95) * 1000, 2),
+            "consultas": max(consultas),
+            "bytes": len(response.content),
+        }
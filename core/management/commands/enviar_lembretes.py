@@ -0,0 +1,51 @@
+"""
+Envia os lembretes push de eventos e ensaios que vencem na próxima janela.
+
+    python manage.py enviar_lembretes           # uma rodada (cron a cada 5 min)
+    python manage.py enviar_lembretes --loop    # processo contínuo
+
+A janela (``SGGM_LEMBRETES["JANELA_MINUTOS"]``) deve ser igual ao intervalo
+do cron. Rodadas repetidas ou concorrentes não reenviam lembretes.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.services import LembreteService
+
+
+class Command(BaseCommand):
+    help = "Envia os lembretes de eventos e ensaios da próxima janela"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Repete a rodada a cada JANELA_MINUTOS até ser interrompido",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self._rodada()
+            return
+
+        intervalo = LembreteService.configuracao()["JANELA_MINUTOS"] * 60
+        try:
+            while True:
+                inicio = time.monotonic()
+                close_old_connections()
+                self._rodada()
+                time.sleep(max(0, intervalo - (time.monotonic() - inicio)))
+        except KeyboardInterrupt:
+            self.stdout.write("Agendador de lembretes encerrado")
+
+    def _rodada(self):
+        enviados = LembreteService.processar()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {enviados['EVENTO']} lembretes de evento e "
+                f"{enviados['ENSAIO']} de ensaio enviados"
+            )
+        )
@@ -0,0 +1,32 @@
+"""
+Remove do log de sincronização (``RegistroAlteracao``) os registros mais
+antigos que a retenção. Apps com cursor anterior a eles refazem a carga
+completa.
+
+    python manage.py expurgar_registros_alteracao             # RETENCAO_DIAS
+    python manage.py expurgar_registros_alteracao --dias 30
+
+Pensado para rodar diariamente (cron).
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.services import SincronizacaoService
+
+
+class Command(BaseCommand):
+    help = "Expurga os registros de alteração mais antigos que a retenção"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dias",
+            type=int,
+            default=None,
+            help="Retenção em dias (padrão: SGGM_SINCRONIZACAO['RETENCAO_DIAS'])",
+        )
+
+    def handle(self, *args, **options):
+        removidos = SincronizacaoService.expurgar(options["dias"])
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {removidos} registros de alteração expurgados")
+        )
@@ -0,0 +1,35 @@
+"""
+Gera as próximas ocorrências das séries de eventos recorrentes.
+
+    python manage.py gerar_eventos_recorrentes             # hoje + 60 dias
+    python manage.py gerar_eventos_recorrentes --dias 120
+
+Pensado para rodar diariamente (cron). O app também estende o horizonte
+sozinho, no máximo uma vez por dia, ao listar os próximos eventos.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from core.services import RecorrenciaService
+
+
+class Command(BaseCommand):
+    help = "Gera os eventos das séries recorrentes até o horizonte informado"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dias",
+            type=int,
+            default=RecorrenciaService.HORIZONTE_DIAS,
+            help="Horizonte em dias a partir de hoje (padrão: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        ate = now().date() + timedelta(days=options["dias"])
+        criados = RecorrenciaService.estender(ate)
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {criados} eventos gerados até {ate:%d/%m/%Y}")
+        )
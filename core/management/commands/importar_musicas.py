@@ -0,0 +1,45 @@
+"""
+Importa músicas em lote a partir de um arquivo .csv, .json ou .txt.
+
+    python manage.py importar_musicas biblioteca.csv
+    python manage.py importar_musicas setlist.txt   # "Título - Artista" por linha
+
+Colunas: titulo, artista (obrigatórios), tom, link_cifra, link_youtube e
+conteudo_cifra. Artistas inexistentes são criados; músicas já cadastradas
+para o mesmo artista são mantidas.
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import ImportacaoService
+
+
+class Command(BaseCommand):
+    help = "Importa músicas em lote (CSV/JSON/TXT) criando os artistas que faltarem"
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo", help="Arquivo .csv, .json ou .txt")
+
+    def handle(self, *args, **options):
+        caminho = Path(options["arquivo"])
+        try:
+            linhas = ImportacaoService.ler_arquivo(caminho.read_bytes(), caminho.name)
+            relatorio = ImportacaoService.importar_musicas(linhas)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for item in relatorio["linhas"]:
+            if item["status"] == "erro":
+                erros = "; ".join(f"{k}: {v}" for k, v in item["erros"].items())
+                self.stderr.write(f"⚠️ Linha {item['linha']}: {erros}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {relatorio['criadas']} músicas criadas, "
+                f"{relatorio['existentes']} já existentes, "
+                f"{relatorio['artistas_criados']} artistas novos, "
+                f"{relatorio['erros']} linhas com erro"
+            )
+        )
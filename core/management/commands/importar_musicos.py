@@ -0,0 +1,48 @@
+"""
+Importa músicos em lote a partir de um arquivo .csv ou .json.
+
+    python manage.py importar_musicos musicos.csv --senha "Troque@2025"
+
+Colunas: nome, email (obrigatórios), telefone, endereco, instrumento,
+tipo_usuario e status. As linhas com erro são listadas e não impedem as
+demais.
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import ImportacaoService
+
+
+class Command(BaseCommand):
+    help = "Importa músicos em lote (CSV/JSON) criando os usuários de acesso"
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo", help="Arquivo .csv ou .json")
+        parser.add_argument(
+            "--senha",
+            help=f"Senha inicial (padrão: {ImportacaoService.SENHA_PADRAO})",
+        )
+
+    def handle(self, *args, **options):
+        caminho = Path(options["arquivo"])
+        try:
+            linhas = ImportacaoService.ler_arquivo(caminho.read_bytes(), caminho.name)
+            relatorio = ImportacaoService.importar_musicos(
+                linhas, senha=options["senha"]
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for item in relatorio["linhas"]:
+            if item["status"] == "erro":
+                erros = "; ".join(f"{k}: {v}" for k, v in item["erros"].items())
+                self.stderr.write(f"⚠️ Linha {item['linha']}: {erros}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {relatorio['criados']} músicos criados, "
+                f"{relatorio['erros']} linhas com erro"
+            )
+        )
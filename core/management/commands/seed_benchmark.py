@@ -0,0 +1,282 @@
+"""
+Gera dados sintéticos em volume realista para benchmarks da API.
+
+    python manage.py seed_benchmark --musicos 60 --eventos 3000 --musicas 800
+
+Tudo é inserido com ``bulk_create`` (sem signals, sem ``full_clean``) e os
+usuários criados usam o prefixo ``--prefixo`` (padrão "bench"), o que
+permite removê-los depois com ``--limpar``.
+"""
+
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils.timezone import now
+
+from core.models import (
+    Artista,
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    Instrumento,
+    ItemRepertorio,
+    Musica,
+    Musico,
+    ReacaoComentario,
+)
+
+INSTRUMENTOS = ["Violão", "Guitarra", "Baixo", "Bateria", "Teclado", "Vocal"]
+ACORDES = ["C", "D", "Em", "F", "G", "Am", "Bm", "A7", "D/F#", "C9"]
+PALAVRAS = "santo digno senhor graça luz amor rei glória fiel eterno".split()
+TIPOS_EVENTO = ["CULTO", "CULTO", "CULTO", "CELULA", "CONFERENCIA", "ESPECIAL"]
+
+SENHA_PADRAO = "benchmark"
+
+
+def _criar(modelo, objetos):
+    """
+    ``bulk_create`` que devolve as linhas com ``pk``. No MySQL o
+    ``bulk_create`` não preenche os ids, então as linhas são relidas.
+    """
+    ultimo = modelo.objects.aggregate(ultimo=Max("id"))["ultimo"] or 0
+    modelo.objects.bulk_create(objetos, batch_size=1000)
+    return list(modelo.objects.filter(id__gt=ultimo).order_by("id"))
+
+
+def _cifra(rng, linhas=16):
+    """Cifra com trechos em ChordPro e trechos com acordes acima da letra."""
+    partes = ["{title: Música de benchmark}"]
+    for i in range(linhas):
+        palavras = rng.sample(PALAVRAS, 5)
+        if i % 2:
+            partes.append(" ".join(f"[{rng.choice(ACORDES)}]{p}" for p in palavras))
+        else:
+            partes.append("      ".join(rng.sample(ACORDES, 4)))
+            partes.append(" ".join(palavras))
+    return "\n".join(partes)
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera dados sintéticos (músicos, eventos, escalas, músicas...) para benchmarks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--musicos", type=int, default=60)
+        parser.add_argument("--eventos", type=int, default=2000)
+        parser.add_argument("--musicas", type=int, default=500)
+        parser.add_argument("--artistas", type=int, default=80)
+        parser.add_argument("--escalas-por-evento", type=int, default=6)
+        parser.add_argument("--musicas-por-evento", type=int, default=6)
+        parser.add_argument("--comentarios-por-evento", type=int, default=3)
+        parser.add_argument("--reacoes-por-comentario", type=int, default=4)
+        parser.add_argument("--prefixo", default="bench")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--limpar",
+            action="store_true",
+            help="Remove os dados gerados anteriormente com o mesmo prefixo",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Permite executar com DEBUG=False",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError(
+                "DEBUG=False: use --force para gerar dados de benchmark neste banco."
+            )
+
+        prefixo = options["prefixo"]
+        if options["limpar"]:
+            self._limpar(prefixo)
+            return
+
+        rng = random.Random(options["seed"])
+        with transaction.atomic():
+            totais = self._gerar(rng, prefixo, options)
+
+        resumo = ", ".join(f"{total} {nome}" for nome, total in totais.items())
+        self.stdout.write(self.style.SUCCESS(f"✅ Dados gerados: {resumo}"))
+
+    # -------------------------
+    # GERAÇÃO
+    # -------------------------
+    def _gerar(self, rng, prefixo, options):
+        if User.objects.filter(username__startswith=f"{prefixo}_").exists():
+            raise CommandError(
+                f"Já existem dados com o prefixo '{prefixo}'. "
+                "Use --limpar ou outro --prefixo."
+            )
+
+        instrumentos = [
+            Instrumento.objects.get_or_create(nome=nome)[0] for nome in INSTRUMENTOS
+        ]
+
+        senha = make_password(SENHA_PADRAO)
+        usuarios = _criar(
+            User,
+            [
+                User(username=f"{prefixo}_{i}", password=senha)
+                for i in range(options["musicos"])
+            ],
+        )
+        musicos = _criar(
+            Musico,
+            [
+                Musico(
+                    user=user,
+                    nome=f"Músico {prefixo} {i}",
+                    tipo_usuario="LIDER" if i == 0 else "MUSICO",
+                    instrumento_principal=rng.choice(instrumentos),
+                    precisa_mudar_senha=False,
+                )
+                for i, user in enumerate(usuarios)
+            ],
+        )
+
+        artistas = _criar(
+            Artista,
+            [
+                Artista(nome=f"Artista {prefixo} {i}")
+                for i in range(options["artistas"])
+            ],
+        )
+        musicas = _criar(
+            Musica,
+            [
+                Musica(
+                    titulo=f"Música {i}",
+                    artista=rng.choice(artistas),
+                    tom=rng.choice(ACORDES[:7]),
+                    conteudo_cifra=_cifra(rng),
+                )
+                for i in range(options["musicas"])
+            ],
+        )
+
+        # Metade dos eventos no passado (com comentários), metade no futuro
+        agora = now()
+        total_eventos = options["eventos"]
+        eventos = _criar(
+            Evento,
+            [
+                Evento(
+                    nome=f"Evento {prefixo} {i}",
+                    tipo=rng.choice(TIPOS_EVENTO),
+                    data_evento=agora
+                    + timedelta(days=i - total_eventos // 2, hours=19),
+                    data_hora_ensaio=agora
+                    + timedelta(days=i - total_eventos // 2 - 1, hours=19),
+                    local="Igreja",
+                    descricao="Gerado por seed_benchmark",
+                )
+                for i in range(total_eventos)
+            ],
+        )
+
+        repertorio = {
+            evento.id: rng.sample(
+                musicas, min(options["musicas_por_evento"], len(musicas))
+            )
+            for evento in eventos
+        }
+        ItemRepertorio.objects.bulk_create(
+            [
+                ItemRepertorio(
+                    evento_id=evento_id,
+                    musica_id=musica.id,
+                    posicao=numero * ItemRepertorio.INTERVALO,
+                )
+                for evento_id, lista in repertorio.items()
+                for numero, musica in enumerate(lista, start=1)
+            ],
+            batch_size=1000,
+        )
+
+        por_evento = min(options["escalas_por_evento"], len(musicos))
+        escalas = _criar(
+            Escala,
+            [
+                Escala(evento=evento, musico=musico, confirmado=rng.random() < 0.7)
+                for evento in eventos
+                for musico in rng.sample(musicos, por_evento)
+            ],
+        )
+        Instrumentos = Escala.instrumentos.through
+        Instrumentos.objects.bulk_create(
+            [
+                Instrumentos(
+                    escala_id=escala.id, instrumento_id=rng.choice(instrumentos).id
+                )
+                for escala in escalas
+            ],
+            batch_size=1000,
+        )
+
+        comentarios = _criar(
+            ComentarioPerformance,
+            [
+                ComentarioPerformance(
+                    evento=evento,
+                    musica=rng.choice(repertorio[evento.id]),
+                    autor=rng.choice(musicos),
+                    texto=" ".join(rng.sample(PALAVRAS, 6)).capitalize(),
+                )
+                for evento in eventos
+                if evento.data_evento < agora and repertorio[evento.id]
+                for _ in range(options["comentarios_por_evento"])
+            ],
+        )
+
+        por_comentario = min(options["reacoes_por_comentario"], len(musicos))
+        reacoes = ReacaoComentario.objects.bulk_create(
+            [
+                ReacaoComentario(comentario=comentario, musico=musico)
+                for comentario in comentarios
+                for musico in rng.sample(musicos, rng.randint(0, por_comentario))
+            ],
+            batch_size=1000,
+        )
+
+        return {
+            "músicos": len(musicos),
+            "artistas": len(artistas),
+            "músicas": len(musicas),
+            "eventos": len(eventos),
+            "escalas": len(escalas),
+            "comentários": len(comentarios),
+            "reações": len(reacoes),
+        }
+
+    # -------------------------
+    # LIMPEZA
+    # -------------------------
+    @transaction.atomic
+    def _limpar(self, prefixo):
+        eventos = Evento.objects.filter(nome__startswith=f"Evento {prefixo} ")
+        musicos = Musico.objects.filter(user__username__startswith=f"{prefixo}_")
+        artistas = Artista.objects.filter(nome__startswith=f"Artista {prefixo} ")
+
+        # Escalas/comentários saem em cascata com os eventos; músicas protegem
+        # o artista (PROTECT), então são removidas antes
+        total_eventos = eventos.count()
+        eventos.delete()
+        Escala.objects.filter(musico__in=musicos).delete()
+        Musica.objects.filter(artista__in=artistas).delete()
+        artistas.delete()
+        User.objects.filter(username__startswith=f"{prefixo}_").delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🗑️ Removidos {total_eventos} eventos e os dados do prefixo '{prefixo}'"
+            )
+        )
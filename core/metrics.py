@@ -0,0 +1,463 @@
+"""
+Métricas no formato de exposição de texto do Prometheus, servidas em ``/metrics``.
+
+Configuradas via ``settings.SGGM_METRICAS``:
+
+    SGGM_METRICAS = {
+        "HABILITADO": True,         # desligado: middleware e /metrics inativos
+        "DIRETORIO": "",            # vazio: apenas as métricas deste processo
+        "INTERVALO_GRAVACAO": 5,    # segundos entre gravações do snapshot
+        "TOKEN": "",                # exigido como Bearer em /metrics
+    }
+
+Sem ``TOKEN``, ``/metrics`` só responde com ``DEBUG`` (em produção exporia o
+tráfego por endpoint, os logins e as falhas do FCM).
+
+Cada processo acumula as métricas em memória. Com ``DIRETORIO`` definido, o
+processo grava periodicamente um snapshot em ``DIRETORIO/sggm-<pid>.json``
+(escrita atômica com ``os.replace``) e ``/metrics`` soma os snapshots de
+todos os processos. Assim os contadores ficam consistentes entre os workers
+do gunicorn, qualquer que seja o worker que atenda o scrape. Snapshots de
+processos que já terminaram (reinício ou reciclagem de workers) são
+removidos na leitura.
+"""
+
+import atexit
+import hmac
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PADRAO = {
+    "HABILITADO": True,
+    "DIRETORIO": "",
+    "INTERVALO_GRAVACAO": 5,
+    "TOKEN": "",
+}
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# [quantidade, segundos] das consultas SQL da requisição atual
+_consultas = ContextVar("sggm_metricas_consultas", default=None)
+
+
+def configuracao():
+    return {**PADRAO, **getattr(settings, "SGGM_METRICAS", {})}
+
+
+# -------------------------
+# REGISTRO
+# -------------------------
+class Registro:
+    """Métricas declaradas no processo e gravação/leitura dos snapshots."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metricas = {}
+        self._ultima_gravacao = 0.0
+
+    def registrar(self, metrica):
+        self.metricas[metrica.nome] = metrica
+        return metrica
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                nome: [[list(chave), valor] for chave, valor in metrica.itens()]
+                for nome, metrica in self.metricas.items()
+            }
+
+    def gravar(self, diretorio=None):
+        """Grava o snapshot deste processo em ``DIRETORIO/sggm-<pid>.json``."""
+        diretorio = diretorio or configuracao()["DIRETORIO"]
+        if not diretorio:
+            return
+        pasta = Path(diretorio)
+        pasta.mkdir(parents=True, exist_ok=True)
+        destino = pasta / f"sggm-{os.getpid()}.json"
+        temporario = pasta / f".sggm-{os.getpid()}.tmp"
+        temporario.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        os.replace(temporario, destino)
+        self._ultima_gravacao = time.monotonic()
+
+    def talvez_gravar(self):
+        config = configuracao()
+        if not config["DIRETORIO"]:
+            return
+        if time.monotonic() - self._ultima_gravacao >= config["INTERVALO_GRAVACAO"]:
+            self.gravar(config["DIRETORIO"])
+
+    def combinar(self):
+        """Soma os snapshots de todos os processos: nome -> {chave: valor}."""
+        diretorio = configuracao()["DIRETORIO"]
+        if not diretorio:
+            snapshots = [self.snapshot()]
+        else:
+            self.gravar(diretorio)
+            snapshots = []
+            for arquivo in sorted(Path(diretorio).glob("sggm-*.json")):
+                if not _processo_vivo(arquivo.stem.removeprefix("sggm-")):
+                    arquivo.unlink(missing_ok=True)
+                    continue
+                try:
+                    snapshots.append(json.loads(arquivo.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    # Processo encerrado durante a leitura ou arquivo corrompido
+                    continue
+
+        combinado = {nome: {} for nome in self.metricas}
+        for snapshot in snapshots:
+            for nome, itens in snapshot.items():
+                metrica = self.metricas.get(nome)
+                if metrica is None:
+                    continue
+                valores = combinado[nome]
+                for chave, valor in itens:
+                    chave = tuple(chave)
+                    atual = valores.get(chave)
+                    valores[chave] = (
+                        valor if atual is None else metrica.somar(atual, valor)
+                    )
+        return combinado
+
+    def exportar(self):
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)."""
+        combinado = self.combinar()
+        linhas = []
+        for nome, metrica in self.metricas.items():
+            linhas.append(f"# HELP {nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {nome} {metrica.tipo}")
+            for chave, valor in sorted(combinado[nome].items()):
+                linhas.extend(metrica.linhas(chave, valor))
+        return "\n".join(linhas) + "\n"
+
+
+def _processo_vivo(pid):
+    try:
+        os.kill(int(pid), 0)
+    except ValueError:
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Existe, mas é de outro usuário
+        return True
+    return True
+
+
+registro = Registro()
+
+
+@atexit.register
+def _gravar_ao_sair():
+    try:
+        registro.gravar()
+    except OSError:
+        pass
+
+
+def _escapar(valor):
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(pares):
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in pares) + "}"
+
+
+class _Metrica:
+    tipo = None
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        registro.registrar(self)
+
+    def _chave(self, rotulos):
+        return tuple(str(rotulos[nome]) for nome in self.rotulos)
+
+    def itens(self):
+        return list(self._valores.items())
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, valor=1, **rotulos):
+        chave = self._chave(rotulos)
+        with registro.lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos):
+        """Valor acumulado neste processo."""
+        return self._valores.get(self._chave(rotulos), 0)
+
+    def somar(self, atual, novo):
+        return atual + novo
+
+    def linhas(self, chave, valor):
+        yield f"{self.nome}{_rotulos(list(zip(self.rotulos, chave)))} {valor}"
+
+
+class Histograma(_Metrica):
+    """Valores: [contagem por bucket (não cumulativa), soma, total]."""
+
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), buckets=BUCKETS_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+
+    def observar(self, valor, **rotulos):
+        chave = self._chave(rotulos)
+        indice = bisect_left(self.buckets, valor)
+        with registro.lock:
+            dados = self._valores.get(chave)
+            if dados is None:
+                dados = self._valores[chave] = [[0] * len(self.buckets), 0.0, 0]
+            if indice < len(self.buckets):
+                dados[0][indice] += 1
+            dados[1] += valor
+            dados[2] += 1
+
+    def itens(self):
+        return [
+            (chave, [list(contagens), soma, total])
+            for chave, (contagens, soma, total) in self._valores.items()
+        ]
+
+    def somar(self, atual, novo):
+        if len(atual[0]) != len(novo[0]):
+            # Snapshot de um deploy com outros buckets
+            return atual
+        return [
+            [a + b for a, b in zip(atual[0], novo[0])],
+            atual[1] + novo[1],
+            atual[2] + novo[2],
+        ]
+
+    def linhas(self, chave, valor):
+        contagens, soma, total = valor
+        pares = list(zip(self.rotulos, chave))
+        acumulado = 0
+        for limite, contagem in zip(self.buckets, contagens):
+            acumulado += contagem
+            le = _rotulos([*pares, ("le", repr(float(limite)))])
+            yield f"{self.nome}_bucket{le} {acumulado}"
+        yield f"{self.nome}_bucket{_rotulos([*pares, ('le', '+Inf')])} {total}"
+        yield f"{self.nome}_sum{_rotulos(pares)} {soma}"
+        yield f"{self.nome}_count{_rotulos(pares)} {total}"
+
+
+# -------------------------
+# MÉTRICAS
+# -------------------------
+REQUISICOES = Contador(
+    "sggm_http_requisicoes_total",
+    "Requisições HTTP atendidas, por view/ação e status.",
+    ("view", "status"),
+)
+DURACAO = Histograma(
+    "sggm_http_duracao_segundos",
+    "Latência das requisições HTTP, por view/ação.",
+    ("view",),
+)
+CONSULTAS = Contador(
+    "sggm_db_consultas_total",
+    "Consultas SQL executadas, por view/ação.",
+    ("view",),
+)
+CONSULTAS_DURACAO = Contador(
+    "sggm_db_duracao_segundos_total",
+    "Tempo gasto em consultas SQL, por view/ação.",
+    ("view",),
+)
+CONSULTAS_POR_REQUISICAO = Histograma(
+    "sggm_db_consultas_por_requisicao",
+    "Consultas SQL por requisição, por view/ação.",
+    ("view",),
+    buckets=BUCKETS_CONSULTAS,
+)
+FCM_ENVIOS = Contador(
+    "sggm_fcm_envios_total",
+    "Tentativas de envio de push pelo FCM, por tipo e resultado.",
+    ("tipo", "resultado"),
+)
+FCM_DURACAO = Histograma(
+    "sggm_fcm_duracao_segundos",
+    "Latência dos envios de push pelo FCM, por tipo.",
+    ("tipo",),
+)
+LOGINS = Contador(
+    "sggm_logins_total",
+    "Tentativas de login com JWT, por resultado.",
+    ("resultado",),
+)
+PAPEIS = Contador(
+    "sggm_papeis_resolvidos_total",
+    "Papéis de usuário resolvidos (um por requisição), por origem "
+    "(token, banco ou anonimo).",
+    ("origem",),
+)
+LIMITES = Contador(
+    "sggm_limites_total",
+    "Requisições avaliadas pelos limites (token bucket), por escopo e "
+    "resultado (permitido/bloqueado).",
+    ("escopo", "resultado"),
+)
+CACHE = Contador(
+    "sggm_cache_consultas_total",
+    "Leituras de cache da aplicação, por cache e resultado (hit/miss).",
+    ("cache", "resultado"),
+)
+
+
+@contextmanager
+def medir_envio_fcm(tipo):
+    """Conta o envio (sucesso se o bloco não levantar) e mede a latência."""
+    inicio = time.perf_counter()
+    resultado = "falha"
+    try:
+        yield
+        resultado = "sucesso"
+    finally:
+        FCM_ENVIOS.inc(tipo=tipo, resultado=resultado)
+        FCM_DURACAO.observar(time.perf_counter() - inicio, tipo=tipo)
+
+
+def registrar_cache(nome, hit):
+    CACHE.inc(cache=nome, resultado="hit" if hit else "miss")
+
+
+# -------------------------
+# BANCO DE DADOS
+# -------------------------
+def _contar_consulta(execute, sql, params, many, context):
+    consultas = _consultas.get()
+    if consultas is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        consultas[0] += 1
+        consultas[1] += time.perf_counter() - inicio
+
+
+def _instalar_na_conexao(sender, connection, **kwargs):
+    if _contar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_contar_consulta)
+
+
+# -------------------------
+# MIDDLEWARE
+# -------------------------
+def rotulo_view(request):
+    """
+    ``Classe.acao`` da view que atendeu a requisição: a ação do viewset DRF
+    (list, retrieve, confirmar...) ou o método HTTP nas demais views.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "nao_resolvida"
+    func = match.func
+    classe = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    nome = classe.__name__ if classe is not None else func.__name__
+    metodo = request.method.lower()
+    acoes = getattr(func, "actions", None)
+    return f"{nome}.{acoes.get(metodo, metodo) if acoes else metodo}"
+
+
+class MetricasMiddleware:
+    """Registra contagem, latência e consultas SQL de cada requisição."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not configuracao()["HABILITADO"]:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+        connection_created.connect(
+            _instalar_na_conexao, dispatch_uid="sggm_metricas_db"
+        )
+        from django.db import connections
+
+        for conexao in connections.all(initialized_only=True):
+            _instalar_na_conexao(None, conexao)
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        consultas = [0, 0.0]
+        token = _consultas.set(consultas)
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _consultas.reset(token)
+        self._registrar(request, response, time.perf_counter() - inicio, consultas)
+        return response
+
+    async def __acall__(self, request):
+        consultas = [0, 0.0]
+        token = _consultas.set(consultas)
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _consultas.reset(token)
+        self._registrar(request, response, time.perf_counter() - inicio, consultas)
+        return response
+
+    def _registrar(self, request, response, duracao, consultas):
+        view = rotulo_view(request)
+        REQUISICOES.inc(view=view, status=response.status_code)
+        DURACAO.observar(duracao, view=view)
+        CONSULTAS.inc(consultas[0], view=view)
+        CONSULTAS_DURACAO.inc(consultas[1], view=view)
+        CONSULTAS_POR_REQUISICAO.observar(consultas[0], view=view)
+        try:
+            registro.talvez_gravar()
+        except OSError:
+            # Métricas nunca derrubam a requisição; o próximo ciclo tenta de novo
+            pass
+
+
+# -------------------------
+# VIEW
+# -------------------------
+def metricas_view(request):
+    """``GET /metrics``: métricas combinadas de todos os processos."""
+    config = configuracao()
+    if not config["HABILITADO"]:
+        raise Http404
+    if config["TOKEN"]:
+        enviado = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(enviado.encode(), config["TOKEN"].encode()):
+            return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    elif not settings.DEBUG:
+        raise Http404
+    return HttpResponse(registro.exportar(), content_type=CONTENT_TYPE)
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-19 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_escala_instrumento_fk_to_m2m'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroAlteracao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recurso', models.CharField(max_length=30)),
+                ('objeto_id', models.PositiveBigIntegerField()),
+                ('operacao', models.CharField(choices=[('SALVO', 'Criado/Atualizado'), ('REMOVIDO', 'Removido')], max_length=10)),
+                ('registrado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Registro de Alteração',
+                'verbose_name_plural': 'Registros de Alteração',
+                'db_table': 'registros_alteracao',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+INTERVALO = 1024
+LOTE = 1000
+
+
+def numerar_repertorios(apps, schema_editor):
+    """
+    Numera as músicas de cada evento na ordem de inclusão (id da linha),
+    com posições espaçadas, em lotes de bulk_update.
+    """
+    ItemRepertorio = apps.get_model("core", "ItemRepertorio")
+
+    lote, evento_atual, posicao = [], None, 0
+    itens = ItemRepertorio.objects.order_by("evento_id", "id").only("id", "evento_id")
+    for item in itens.iterator(chunk_size=LOTE):
+        if item.evento_id != evento_atual:
+            evento_atual, posicao = item.evento_id, 0
+        posicao += INTERVALO
+        item.posicao = posicao
+        lote.append(item)
+        if len(lote) >= LOTE:
+            ItemRepertorio.objects.bulk_update(lote, ["posicao"])
+            lote = []
+    if lote:
+        ItemRepertorio.objects.bulk_update(lote, ["posicao"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0017_registroalteracao"),
+    ]
+
+    operations = [
+        # A tabela "eventos_repertorio" do M2M automático passa a ser o modelo
+        # ItemRepertorio sem ser recriada: só o estado muda aqui.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="ItemRepertorio",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "evento",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="itens_repertorio",
+                                to="core.evento",
+                            ),
+                        ),
+                        (
+                            "musica",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="itens_repertorio",
+                                to="core.musica",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "verbose_name": "Música do Repertório",
+                        "verbose_name_plural": "Repertório",
+                        "db_table": "eventos_repertorio",
+                        "ordering": ["posicao", "id"],
+                        "unique_together": {("evento", "musica")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="evento",
+                    name="repertorio",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name="eventos",
+                        through="core.ItemRepertorio",
+                        to="core.musica",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="itemrepertorio",
+            name="posicao",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(numerar_repertorios, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="itemrepertorio",
+            index=models.Index(
+                fields=["evento", "posicao"], name="eventos_rep_evento__fcfb67_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_itemrepertorio"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SerieEvento",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("nome", models.CharField(max_length=100)),
+                (
+                    "tipo",
+                    models.CharField(
+                        choices=[
+                            ("CULTO", "Culto"),
+                            ("CONFERENCIA", "Conferência"),
+                            ("CELULA", "Célula"),
+                            ("ESPECIAL", "Especial"),
+                        ],
+                        default="CULTO",
+                        max_length=20,
+                    ),
+                ),
+                ("local", models.CharField(max_length=100)),
+                ("descricao", models.TextField(blank=True)),
+                (
+                    "frequencia",
+                    models.CharField(
+                        choices=[("SEMANAL", "Semanal"), ("MENSAL", "Mensal")],
+                        default="SEMANAL",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "intervalo",
+                    models.PositiveSmallIntegerField(
+                        default=1, help_text="A cada quantas semanas/meses"
+                    ),
+                ),
+                (
+                    "dia_semana",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, "Segunda-feira"),
+                            (1, "Terça-feira"),
+                            (2, "Quarta-feira"),
+                            (3, "Quinta-feira"),
+                            (4, "Sexta-feira"),
+                            (5, "Sábado"),
+                            (6, "Domingo"),
+                        ]
+                    ),
+                ),
+                (
+                    "semana_do_mes",
+                    models.SmallIntegerField(
+                        blank=True,
+                        help_text="Só para séries mensais: 1 a 4, ou -1 para a última semana",
+                        null=True,
+                    ),
+                ),
+                ("horario", models.TimeField()),
+                (
+                    "antecedencia_ensaio",
+                    models.DurationField(
+                        blank=True,
+                        help_text="Ensaio quanto tempo antes do evento (ex.: 2 dias)",
+                        null=True,
+                    ),
+                ),
+                ("data_inicio", models.DateField()),
+                ("data_fim", models.DateField(blank=True, null=True)),
+                ("copiar_escala", models.BooleanField(default=True)),
+                ("copiar_repertorio", models.BooleanField(default=False)),
+                ("gerado_ate", models.DateField(blank=True, editable=False, null=True)),
+                ("ativa", models.BooleanField(default=True)),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+                (
+                    "evento_modelo",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Evento cuja escala/repertório é copiado para as ocorrências",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="core.evento",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Série de Eventos",
+                "verbose_name_plural": "Séries de Eventos",
+                "db_table": "series_evento",
+                "ordering": ["nome"],
+            },
+        ),
+        migrations.AddField(
+            model_name="evento",
+            name="serie",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Série recorrente que gerou este evento (se houver)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="eventos",
+                to="core.serieevento",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="evento",
+            constraint=models.UniqueConstraint(
+                fields=("serie", "data_evento"), name="evento_unico_por_serie_data"
+            ),
+        ),
+    ]
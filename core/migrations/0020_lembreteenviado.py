@@ -0,0 +1,73 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0019_serieevento"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LembreteEnviado",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tipo",
+                    models.CharField(
+                        choices=[("EVENTO", "Evento"), ("ENSAIO", "Ensaio")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "momento",
+                    models.DateTimeField(help_text="Horário do evento/ensaio lembrado"),
+                ),
+                ("lote", models.UUIDField(db_index=True)),
+                ("enviado_em", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Lembrete Enviado",
+                "verbose_name_plural": "Lembretes Enviados",
+                "db_table": "lembretes_enviados",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(
+                fields=["data_evento"], name="eventos_data_ev_9d3d56_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(
+                fields=["data_hora_ensaio"], name="eventos_data_ho_c3b338_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="lembreteenviado",
+            name="escala",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lembretes",
+                to="core.escala",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="lembreteenviado",
+            constraint=models.UniqueConstraint(
+                fields=("escala", "tipo", "momento"), name="lembrete_unico"
+            ),
+        ),
+    ]
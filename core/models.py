@@ -1,6 +1,6 @@
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django.utils.timezone import now
 
@@ -87,37 +87,71 @@ class Musico(models.Model):
         return self.tipo_usuario == "ADMIN" or self.user.is_superuser
 
     def clean(self):
-        if self.user:
+        if self.user_id:
             # Verificar se já existe outro músico com o mesmo usuário
-            if Musico.objects.exclude(pk=self.pk).filter(user=self.user).exists():
+            if Musico.objects.exclude(pk=self.pk).filter(user_id=self.user_id).exists():
                 raise ValidationError(
                     {"user": "Já existe um músico vinculado a este usuário."}
                 )
 
+    # Grupo Django correspondente a cada tipo de usuário
+    GRUPOS = {
+        "MUSICO": "Músicos",
+        "LIDER": "Lideres",
+        "ADMIN": "Administradores",
+    }
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._tipo_usuario_salvo = instance.__dict__.get("tipo_usuario")
+        return instance
+
     def save(self, *args, **kwargs):
-        self.full_clean()
+        """
+        Com ``update_fields`` (ex.: ``atualizar_fcm_token``) não há validação
+        nem sincronização de grupos, salvo se ``tipo_usuario`` estiver entre
+        os campos. Os grupos só são sincronizados quando o tipo muda.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            # A unicidade do usuário já é verificada em clean()
+            self.full_clean(validate_unique=False)
         super().save(*args, **kwargs)
-        self._sincronizar_grupo()
+
+        tipo_salvo = getattr(self, "_tipo_usuario_salvo", None)
+        if tipo_salvo != self.tipo_usuario and (
+            update_fields is None or "tipo_usuario" in update_fields
+        ):
+            self._sincronizar_grupo()
+            self._tipo_usuario_salvo = self.tipo_usuario
 
     def _sincronizar_grupo(self):
         """Sincroniza o grupo Django com o tipo de usuário"""
         from django.contrib.auth.models import Group
 
-        # Remover de todos os grupos relacionados
-        grupos_sistema = ["Músicos", "Lideres", "Administradores"]
-        self.user.groups.filter(name__in=grupos_sistema).delete()
-
-        # Adicionar ao grupo correto
-        if self.tipo_usuario == "MUSICO":
-            grupo, _ = Group.objects.get_or_create(name="Músicos")
-        elif self.tipo_usuario == "LIDER":
-            grupo, _ = Group.objects.get_or_create(name="Lideres")
-        elif self.tipo_usuario == "ADMIN":
-            grupo, _ = Group.objects.get_or_create(name="Administradores")
-            self.user.is_staff = True
-            self.user.save()
+        if self.user_id is None:
+            return
 
-        self.user.groups.add(grupo)
+        ids = dict(
+            Group.objects.filter(name__in=self.GRUPOS.values()).values_list(
+                "name", "id"
+            )
+        )
+        alvo = self.GRUPOS.get(self.tipo_usuario)
+        if alvo and alvo not in ids:
+            ids[alvo] = Group.objects.get_or_create(name=alvo)[0].id
+
+        # Remove só o vínculo com os outros grupos do sistema
+        outros = [id_ for nome, id_ in ids.items() if nome != alvo]
+        if outros:
+            self.user.groups.remove(*outros)
+        if alvo:
+            self.user.groups.add(ids[alvo])
+
+        if self.tipo_usuario == "ADMIN" and not self.user.is_staff:
+            self.user.is_staff = True
+            self.user.save(update_fields=["is_staff"])
 
     class Meta:
         db_table = "musicos"
@@ -141,8 +175,10 @@ class Musico(models.Model):
         """
         Verifica se o músico está disponível hoje.
         """
-        hoje = now().date()
+        return self.esta_disponivel_em(now().date())
 
+    def esta_disponivel_em(self, data):
+        """Verifica se o músico está disponível na data informada."""
         if self.status == "ATIVO":
             return True
 
@@ -154,7 +190,7 @@ class Musico(models.Model):
                 return False
             if self.data_inicio_inatividade and self.data_fim_inatividade:
                 return not (
-                    self.data_inicio_inatividade <= hoje <= self.data_fim_inatividade
+                    self.data_inicio_inatividade <= data <= self.data_fim_inatividade
                 )
 
         return False
@@ -205,7 +241,17 @@ class Evento(models.Model):
         help_text="Data e hora do ensaio para este evento (opcional)",
     )
 
-    repertorio = models.ManyToManyField(Musica, related_name="eventos", blank=True)
+    repertorio = models.ManyToManyField(
+        Musica, related_name="eventos", blank=True, through="ItemRepertorio"
+    )
+    serie = models.ForeignKey(
+        "SerieEvento",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="eventos",
+        help_text="Série recorrente que gerou este evento (se houver)",
+    )
     criado_em = models.DateTimeField(auto_now_add=True)
 
     def clean(self):
@@ -224,10 +270,154 @@ class Evento(models.Model):
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
         ordering = ["-data_evento"]
+        constraints = [
+            # Torna a geração da série idempotente
+            models.UniqueConstraint(
+                fields=["serie", "data_evento"], name="evento_unico_por_serie_data"
+            )
+        ]
+        # Busca por faixa de horário dos lembretes (core.services.LembreteService)
+        indexes = [
+            models.Index(fields=["data_evento"]),
+            models.Index(fields=["data_hora_ensaio"]),
+        ]
 
     def __str__(self):
         return f"{self.nome} - {self.data_evento.strftime('%d/%m/%Y')}"
 
+    def musicas_em_ordem(self):
+        """
+        Músicas do repertório na ordem do evento. Usa o prefetch de
+        ``repertorio`` quando houver (as views o fazem já ordenado).
+        """
+        if "repertorio" in getattr(self, "_prefetched_objects_cache", {}):
+            return self.repertorio.all()
+        return self.repertorio.order_by(*ItemRepertorio.ORDEM_MUSICAS)
+
+
+class ItemRepertorio(models.Model):
+    """
+    Música no repertório de um evento (tabela intermediária de
+    ``Evento.repertorio``), com a posição na ordem do culto.
+
+    As posições são espaçadas (``INTERVALO``): inserir ou mover uma música
+    grava apenas essa linha, com a posição no meio das vizinhas; só quando
+    não há mais espaço entre elas o repertório do evento é renumerado.
+    Empates (ex.: ``evento.repertorio.add()``, que usa a posição 0) são
+    resolvidos pela ordem de inclusão.
+    """
+
+    INTERVALO = 1024
+    # Ordem das músicas ao consultar a partir de Musica (evento.repertorio)
+    ORDEM_MUSICAS = ("itens_repertorio__posicao", "itens_repertorio__id")
+
+    evento = models.ForeignKey(
+        Evento, on_delete=models.CASCADE, related_name="itens_repertorio"
+    )
+    musica = models.ForeignKey(
+        Musica, on_delete=models.CASCADE, related_name="itens_repertorio"
+    )
+    posicao = models.IntegerField(default=0)
+
+    class Meta:
+        # Mesma tabela do antigo M2M automático, preservando os dados
+        db_table = "eventos_repertorio"
+        verbose_name = "Música do Repertório"
+        verbose_name_plural = "Repertório"
+        unique_together = [["evento", "musica"]]
+        ordering = ["posicao", "id"]
+        indexes = [models.Index(fields=["evento", "posicao"])]
+
+    def __str__(self):
+        return f"{self.posicao}: {self.musica_id} em {self.evento_id}"
+
+
+class SerieEvento(models.Model):
+    """
+    Modelo de evento recorrente (cultos semanais, células, a Santa Ceia do
+    primeiro domingo...). As ocorrências viram linhas de ``Evento`` só até
+    um horizonte próximo (``gerado_ate``), estendido aos poucos por
+    ``RecorrenciaService``, em vez de criar anos de eventos de uma vez.
+    """
+
+    FREQUENCIA_CHOICES = [
+        ("SEMANAL", "Semanal"),
+        ("MENSAL", "Mensal"),
+    ]
+
+    DIA_SEMANA_CHOICES = [
+        (0, "Segunda-feira"),
+        (1, "Terça-feira"),
+        (2, "Quarta-feira"),
+        (3, "Quinta-feira"),
+        (4, "Sexta-feira"),
+        (5, "Sábado"),
+        (6, "Domingo"),
+    ]
+
+    nome = models.CharField(max_length=100)
+    tipo = models.CharField(max_length=20, choices=Evento.TIPO_EVENTO, default="CULTO")
+    local = models.CharField(max_length=100)
+    descricao = models.TextField(blank=True)
+
+    frequencia = models.CharField(
+        max_length=10, choices=FREQUENCIA_CHOICES, default="SEMANAL"
+    )
+    intervalo = models.PositiveSmallIntegerField(
+        default=1, help_text="A cada quantas semanas/meses"
+    )
+    dia_semana = models.PositiveSmallIntegerField(choices=DIA_SEMANA_CHOICES)
+    semana_do_mes = models.SmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="Só para séries mensais: 1 a 4, ou -1 para a última semana",
+    )
+    horario = models.TimeField()
+    antecedencia_ensaio = models.DurationField(
+        null=True,
+        blank=True,
+        help_text="Ensaio quanto tempo antes do evento (ex.: 2 dias)",
+    )
+
+    data_inicio = models.DateField()
+    data_fim = models.DateField(null=True, blank=True)
+
+    evento_modelo = models.ForeignKey(
+        Evento,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Evento cuja escala/repertório é copiado para as ocorrências",
+    )
+    copiar_escala = models.BooleanField(default=True)
+    copiar_repertorio = models.BooleanField(default=False)
+
+    gerado_ate = models.DateField(null=True, blank=True, editable=False)
+    ativa = models.BooleanField(default=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+
+        if self.frequencia == "MENSAL" and self.semana_do_mes not in (1, 2, 3, 4, -1):
+            raise ValidationError(
+                {"semana_do_mes": "Informe de 1 a 4, ou -1 (última semana)."}
+            )
+        if self.data_fim and self.data_fim < self.data_inicio:
+            raise ValidationError(
+                {"data_fim": "A data final não pode ser anterior à inicial."}
+            )
+
+    class Meta:
+        db_table = "series_evento"
+        verbose_name = "Série de Eventos"
+        verbose_name_plural = "Séries de Eventos"
+        ordering = ["nome"]
+
+    def __str__(self):
+        return f"{self.nome} ({self.get_frequencia_display()})"
+
 
 class Escala(models.Model):
 
@@ -266,10 +456,56 @@ class Escala(models.Model):
             if afastamentos.exists():
                 raise ValidationError("Músico está afastado neste período")
 
-    def save(self, *args, **kwargs):
-        # ✅ Chamar clean() antes de salvar
-        self.full_clean()
-        super().save(*args, **kwargs)
+    # Campos que definem a escala; mudar só os demais dispensa revalidação
+    CAMPOS_CHAVE = {"musico", "musico_id", "evento", "evento_id"}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # __dict__: não dispara consulta se algum campo veio adiado (only/defer)
+        instance._chaves_salvas = (
+            instance.__dict__.get("musico_id"),
+            instance.__dict__.get("evento_id"),
+        )
+        return instance
+
+    def _chaves_alteradas(self, update_fields):
+        """True para inserções e quando músico/evento mudam."""
+        if update_fields is not None:
+            return bool(self.CAMPOS_CHAVE.intersection(update_fields))
+        chaves = getattr(self, "_chaves_salvas", None)
+        return chaves != (self.musico_id, self.evento_id)
+
+    def save(self, *args, validar=True, **kwargs):
+        """
+        Valida com ``full_clean()`` apenas quando músico/evento mudam e o
+        chamador não validou antes (serializer/serviço passam
+        ``validar=False``). A unicidade músico-evento fica a cargo do banco:
+        a violação vira ``ValidationError``. Só nesse caso o save vai num
+        savepoint; alterar os demais campos é um UPDATE simples.
+        """
+        if not self._chaves_alteradas(kwargs.get("update_fields")):
+            super().save(*args, **kwargs)
+            return
+
+        if validar:
+            self.full_clean(validate_unique=False)
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            if (
+                Escala.objects.filter(
+                    musico_id=self.musico_id, evento_id=self.evento_id
+                )
+                .exclude(pk=self.pk)
+                .exists()
+            ):
+                raise ValidationError(
+                    "Este músico já está escalado para este evento."
+                ) from exc
+            raise
+        self._chaves_salvas = (self.musico_id, self.evento_id)
 
     class Meta:
         db_table = "escalas"
@@ -392,3 +628,69 @@ class ReacaoComentario(models.Model):
 
     def __str__(self):
         return f"{self.musico.nome} 👍 em comentário {self.comentario.id}"
+
+
+class RegistroAlteracao(models.Model):
+    """
+    Log de alterações usado pela sincronização incremental do app mobile
+    (GET /api/sync/?since=<cursor>). O ``id`` é o cursor: cada escrita nos
+    modelos sincronizados gera uma linha, inclusive remoções (tombstones).
+    Preenchido pelos signals em ``core.signals``, com um INSERT por
+    transação depois do commit dela.
+    """
+
+    OPERACAO_CHOICES = [
+        ("SALVO", "Criado/Atualizado"),
+        ("REMOVIDO", "Removido"),
+    ]
+
+    recurso = models.CharField(max_length=30)
+    objeto_id = models.PositiveBigIntegerField()
+    operacao = models.CharField(max_length=10, choices=OPERACAO_CHOICES)
+    registrado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "registros_alteracao"
+        verbose_name = "Registro de Alteração"
+        verbose_name_plural = "Registros de Alteração"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"#{self.id} {self.operacao} {self.recurso}:{self.objeto_id}"
+
+
+class LembreteEnviado(models.Model):
+    """
+    Lembrete de evento ou ensaio já enviado a um escalado. Gravado antes do
+    envio pelo ``LembreteService``: a restrição única garante no máximo um
+    lembrete por escala, tipo e horário, mesmo com vários processos
+    agendadores. Se o evento mudar de horário, o novo horário gera um novo
+    lembrete.
+    """
+
+    TIPO_CHOICES = [
+        ("EVENTO", "Evento"),
+        ("ENSAIO", "Ensaio"),
+    ]
+
+    escala = models.ForeignKey(
+        Escala, on_delete=models.CASCADE, related_name="lembretes"
+    )
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES)
+    momento = models.DateTimeField(help_text="Horário do evento/ensaio lembrado")
+    # Rodada do agendador que reservou o lembrete
+    lote = models.UUIDField(db_index=True)
+    enviado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "lembretes_enviados"
+        verbose_name = "Lembrete Enviado"
+        verbose_name_plural = "Lembretes Enviados"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["escala", "tipo", "momento"], name="lembrete_unico"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} da escala {self.escala_id} ({self.momento:%d/%m %H:%M})"
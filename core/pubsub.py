@@ -0,0 +1,193 @@
+"""
+Pub/sub de eventos ao vivo (confirmações de escala, comentários e reações).
+
+O backend é configurável via ``settings.SGGM_PUBSUB``:
+
+    SGGM_PUBSUB = {
+        "BACKEND": "core.pubsub.MemoriaBackend",  # padrão, um único processo
+        "OPTIONS": {},
+    }
+
+``MemoriaBackend`` entrega apenas para assinantes do mesmo processo. Com
+vários workers, use ``core.pubsub.RedisBackend`` (OPTIONS: {"url": ...}),
+que depende do pacote ``redis``.
+"""
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class BaseBackend:
+    """Interface dos backends de pub/sub."""
+
+    def publicar(self, canal: str, mensagem: str) -> None:
+        raise NotImplementedError
+
+    def assinar(self, canal: str):
+        """Retorna um async context manager com ``await receber(timeout)``."""
+        raise NotImplementedError
+
+
+# -------------------------
+# MEMÓRIA (um processo)
+# -------------------------
+class _AssinaturaMemoria:
+    def __init__(self, backend, canal, tamanho_fila):
+        self._backend = backend
+        self._canal = canal
+        self._tamanho_fila = tamanho_fila
+        self._fila = None
+        self._loop = None
+
+    async def __aenter__(self):
+        self._loop = asyncio.get_running_loop()
+        self._fila = asyncio.Queue(maxsize=self._tamanho_fila)
+        self._backend._registrar(self._canal, self)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._backend._remover(self._canal, self)
+
+    def _entregar(self, mensagem):
+        # Executado no event loop do assinante; descarta a mais antiga se cheia
+        if self._fila.full():
+            self._fila.get_nowait()
+        self._fila.put_nowait(mensagem)
+
+    def entregar(self, mensagem):
+        """Thread-safe: pode ser chamado a partir de views síncronas."""
+        self._loop.call_soon_threadsafe(self._entregar, mensagem)
+
+    async def receber(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self._fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MemoriaBackend(BaseBackend):
+    def __init__(self, tamanho_fila=100):
+        self._tamanho_fila = tamanho_fila
+        self._assinantes = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _registrar(self, canal, assinatura):
+        with self._lock:
+            self._assinantes[canal].add(assinatura)
+
+    def _remover(self, canal, assinatura):
+        with self._lock:
+            self._assinantes[canal].discard(assinatura)
+            if not self._assinantes[canal]:
+                del self._assinantes[canal]
+
+    def total_assinantes(self, canal):
+        with self._lock:
+            return len(self._assinantes.get(canal, ()))
+
+    def publicar(self, canal, mensagem):
+        with self._lock:
+            assinantes = list(self._assinantes.get(canal, ()))
+        for assinatura in assinantes:
+            try:
+                assinatura.entregar(mensagem)
+            except RuntimeError:
+                # Event loop do assinante já foi encerrado
+                self._remover(canal, assinatura)
+
+    def assinar(self, canal):
+        return _AssinaturaMemoria(self, canal, self._tamanho_fila)
+
+
+# -------------------------
+# REDIS (vários workers)
+# -------------------------
+class _AssinaturaRedis:
+    def __init__(self, url, canal):
+        self._url = url
+        self._canal = canal
+        self._cliente = None
+        self._pubsub = None
+
+    async def __aenter__(self):
+        import redis.asyncio as redis_async
+
+        self._cliente = redis_async.Redis.from_url(self._url)
+        self._pubsub = self._cliente.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self._canal)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._pubsub.unsubscribe(self._canal)
+        await self._pubsub.aclose()
+        await self._cliente.aclose()
+
+    async def receber(self, timeout=None):
+        mensagem = await self._pubsub.get_message(timeout=timeout)
+        if mensagem is None:
+            return None
+        dados = mensagem["data"]
+        return dados.decode() if isinstance(dados, bytes) else dados
+
+
+class RedisBackend(BaseBackend):
+    def __init__(self, url="redis://localhost:6379/0"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured(
+                "RedisBackend requer o pacote 'redis' (pip install redis)."
+            ) from exc
+
+        self._url = url
+        self._cliente = redis.Redis.from_url(url)
+
+    def publicar(self, canal, mensagem):
+        self._cliente.publish(canal, mensagem)
+
+    def assinar(self, canal):
+        return _AssinaturaRedis(self._url, canal)
+
+
+# -------------------------
+# API DO MÓDULO
+# -------------------------
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> BaseBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = getattr(settings, "SGGM_PUBSUB", {})
+                classe = import_string(
+                    config.get("BACKEND", "core.pubsub.MemoriaBackend")
+                )
+                _backend = classe(**config.get("OPTIONS", {}))
+    return _backend
+
+
+def canal_evento(evento_id: int) -> str:
+    return f"sggm:evento:{evento_id}"
+
+
+def publicar_evento(evento_id: int, tipo: str, dados: dict) -> None:
+    """
+    Publica uma atualização no canal do evento após o commit da transação,
+    para que assinantes nunca vejam dados que acabaram revertidos.
+    """
+    mensagem = json.dumps({"tipo": tipo, "dados": dados}, cls=DjangoJSONEncoder)
+    transaction.on_commit(
+        lambda: get_backend().publicar(canal_evento(evento_id), mensagem),
+        robust=True,
+    )
@@ -1,5 +1,28 @@
+from .agenda_service import AgendaService
+from .cifra_service import CifraService
 from .compartilhamento_service import CompartilhamentoService
+from .duplicacao_service import DuplicacaoService
 from .gerenciador_escala import GerenciadorEscala
+from .importacao_service import ImportacaoService
+from .lembrete_service import LembreteService
+from .login_service import LoginService
 from .notification_service import NotificationService
+from .recorrencia_service import RecorrenciaService
+from .repertorio_service import RepertorioService
+from .setlist_service import SetlistService
+from .sincronizacao_service import SincronizacaoService
 
-__all__ = ["NotificationService", "GerenciadorEscala"]
+__all__ = [
+    "NotificationService",
+    "GerenciadorEscala",
+    "AgendaService",
+    "SincronizacaoService",
+    "ImportacaoService",
+    "CifraService",
+    "SetlistService",
+    "RepertorioService",
+    "RecorrenciaService",
+    "DuplicacaoService",
+    "LoginService",
+    "LembreteService",
+]
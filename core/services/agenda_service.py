@@ -0,0 +1,188 @@
+import hashlib
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.timezone import now
+
+from core.metrics import registrar_cache
+from core.models import Escala, Musico
+
+
+class AgendaService:
+    """
+    Serviço responsável pelo feed iCalendar (.ics) de escalas de cada músico.
+
+    O feed é renderizado uma única vez e guardado no cache por músico, junto
+    com o ETag calculado sobre o conteúdo. Apps de calendário que consultam o
+    feed a cada 15 minutos recebem 304 sem nenhuma consulta ao banco enquanto
+    as escalas do músico (ou os eventos relacionados) não mudarem.
+    """
+
+    CACHE_PREFIXO = "agenda_ics"
+    CACHE_TIMEOUT = 60 * 60 * 6  # 6h: renova a janela de eventos passados
+    DIAS_PASSADOS = 60
+    DURACAO_EVENTO = "PT2H"
+    DURACAO_ENSAIO = "PT1H30M"
+    _SALT = "core.agenda"
+
+    # -------------------------
+    # TOKEN DE ASSINATURA
+    # -------------------------
+    @staticmethod
+    def gerar_token(musico_id: int) -> str:
+        """Token estável que autoriza a leitura do feed sem cabeçalho JWT."""
+        return signing.Signer(salt=AgendaService._SALT).signature(str(musico_id))
+
+    @staticmethod
+    def token_valido(musico_id: int, token: str | None) -> bool:
+        if not token:
+            return False
+        return constant_time_compare(AgendaService.gerar_token(musico_id), token)
+
+    # -------------------------
+    # CACHE
+    # -------------------------
+    @staticmethod
+    def _chave(musico_id: int) -> str:
+        return f"{AgendaService.CACHE_PREFIXO}:{musico_id}"
+
+    @staticmethod
+    def invalidar(*musico_ids: int) -> None:
+        """Descarta o feed em cache dos músicos informados."""
+        if musico_ids:
+            cache.delete_many([AgendaService._chave(mid) for mid in set(musico_ids)])
+
+    @staticmethod
+    def obter_feed(musico_id: int) -> dict | None:
+        """
+        Retorna {"etag": str, "conteudo": bytes} do feed do músico,
+        renderizando e guardando no cache em caso de miss.
+        Retorna None se o músico não existir.
+        """
+        chave = AgendaService._chave(musico_id)
+        feed = cache.get(chave)
+        registrar_cache("agenda", hit=feed is not None)
+        if feed is not None:
+            return feed
+
+        musico = Musico.objects.filter(id=musico_id).only("id", "nome").first()
+        if musico is None:
+            return None
+
+        conteudo = AgendaService.renderizar(musico).encode("utf-8")
+        feed = {
+            "etag": f'"{hashlib.sha1(conteudo).hexdigest()}"',
+            "conteudo": conteudo,
+        }
+        cache.set(chave, feed, AgendaService.CACHE_TIMEOUT)
+        return feed
+
+    # -------------------------
+    # RENDERIZAÇÃO
+    # -------------------------
+    @staticmethod
+    def renderizar(musico: Musico) -> str:
+        """Gera o documento iCalendar com as escalas recentes e futuras do músico."""
+        inicio = now() - timedelta(days=AgendaService.DIAS_PASSADOS)
+        escalas = (
+            Escala.objects.filter(musico=musico, evento__data_evento__gte=inicio)
+            .select_related("evento")
+            .prefetch_related("instrumentos")
+            .order_by("evento__data_evento", "id")
+        )
+
+        linhas = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//SGGM//Agenda de Escalas//PT-BR",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escapar(f'Escalas - {musico.nome}')}",
+            f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+            "REFRESH-INTERVAL;VALUE=DURATION:PT15M",
+        ]
+
+        for escala in escalas:
+            evento = escala.evento
+            instrumentos = " • ".join(i.nome for i in escala.instrumentos.all())
+            situacao = "Confirmado" if escala.confirmado else "Aguardando confirmação"
+            descricao = [f"Instrumentos: {instrumentos or 'Sem instrumento'}", situacao]
+            if escala.observacao:
+                descricao.append(escala.observacao)
+            carimbo = _formatar_data(escala.criado_em)
+
+            linhas += [
+                "BEGIN:VEVENT",
+                f"UID:escala-{escala.id}@sggm",
+                f"DTSTAMP:{carimbo}",
+                f"DTSTART:{_formatar_data(evento.data_evento)}",
+                f"DURATION:{AgendaService.DURACAO_EVENTO}",
+                f"SUMMARY:{_escapar(evento.nome)}",
+                f"LOCATION:{_escapar(evento.local)}",
+                f"DESCRIPTION:{_escapar(chr(10).join(descricao))}",
+                f"STATUS:{'CONFIRMED' if escala.confirmado else 'TENTATIVE'}",
+                "END:VEVENT",
+            ]
+
+            if evento.data_hora_ensaio:
+                linhas += [
+                    "BEGIN:VEVENT",
+                    f"UID:ensaio-{escala.id}@sggm",
+                    f"DTSTAMP:{carimbo}",
+                    f"DTSTART:{_formatar_data(evento.data_hora_ensaio)}",
+                    f"DURATION:{AgendaService.DURACAO_ENSAIO}",
+                    f"SUMMARY:{_escapar(f'Ensaio - {evento.nome}')}",
+                    f"LOCATION:{_escapar(evento.local)}",
+                    "END:VEVENT",
+                ]
+
+        linhas.append("END:VCALENDAR")
+        return "".join(f"{_dobrar(linha)}\r\n" for linha in linhas)
+
+
+def _formatar_data(valor) -> str:
+    """
+    Data em UTC (forma "Z" da RFC 5545): dispensa o VTIMEZONE que um
+    ``TZID`` exigiria e vale para DTSTART e DTSTAMP. Com USE_TZ=False, os
+    horários do banco estão em ``settings.TIME_ZONE``.
+    """
+    if valor.tzinfo is None:
+        valor = valor.replace(tzinfo=ZoneInfo(settings.TIME_ZONE))
+    return valor.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _escapar(texto: str) -> str:
+    """Escapa texto conforme RFC 5545 (seção 3.3.11)."""
+    return (
+        (texto or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _dobrar(linha: str, limite: int = 75) -> str:
+    """Quebra linhas maiores que 75 octetos (RFC 5545, seção 3.1)."""
+    if len(linha.encode("utf-8")) <= limite:
+        return linha
+
+    partes = []
+    atual = ""
+    tamanho = 0
+    for caractere in linha:
+        octetos = len(caractere.encode("utf-8"))
+        if tamanho + octetos > limite:
+            partes.append(atual)
+            atual = " "
+            tamanho = 1
+        atual += caractere
+        tamanho += octetos
+    partes.append(atual)
+    return "\r\n".join(partes)
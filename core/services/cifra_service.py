@@ -0,0 +1,221 @@
+import re
+from functools import lru_cache
+
+# Semitom de cada nota natural; acidentes somam/subtraem 1
+NATURAIS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+SUSTENIDOS = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+BEMOIS = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
+
+# Tons escritos com bemóis: maiores F, Bb, Eb, Ab, Db / menores Dm, Gm, Cm...
+# (F# maior, mais comum nas cifras que Gb, fica com sustenidos)
+TONS_BEMOIS_MAIORES = {5, 10, 3, 8, 1}
+TONS_BEMOIS_MENORES = {2, 7, 0, 5, 10, 3}
+
+ACORDE = re.compile(
+    r"^(?P<raiz>[A-G][#b]?)"
+    r"(?P<sufixo>(?:maj|min|dim|aug|sus|add|m|M|º|°|\+|-|\d|\(|\)|#|b)*)"
+    r"(?:/(?P<baixo>[A-G][#b]?))?$"
+)
+TOM = re.compile(r"^(?P<raiz>[A-G][#b]?)(?P<menor>m?)$")
+ACORDE_INLINE = re.compile(r"\[([^\]]+)\]")
+PALAVRA = re.compile(r"\S+")
+# Marcações aceitas em linhas de acordes: "|", "(2x)", "x2", "-"...
+MARCACAO = re.compile(r"^[|/()\-x\d.:]+$")
+
+
+def _semitom(nota):
+    valor = NATURAIS[nota[0]]
+    if nota[1:] == "#":
+        valor += 1
+    elif nota[1:] == "b":
+        valor -= 1
+    return valor % 12
+
+
+def _acorde(texto):
+    """(raiz, sufixo, baixo) em semitons, ou None se não for um acorde."""
+    encontrado = ACORDE.match(texto)
+    if encontrado is None:
+        return None
+    baixo = encontrado["baixo"]
+    return (
+        _semitom(encontrado["raiz"]),
+        encontrado["sufixo"],
+        _semitom(baixo) if baixo else None,
+    )
+
+
+@lru_cache(maxsize=512)
+def _tokenizar(conteudo):
+    """
+    Representação compacta da cifra, calculada uma vez por conteúdo:
+    tupla de linhas, cada uma ``(True, ((coluna, item), ...))`` para linhas
+    só de acordes (acordes acima da letra) ou ``(False, (item, ...))`` para
+    as demais, onde ``item`` é texto literal ou um acorde ``(raiz, sufixo,
+    baixo)``; na linha de texto, o acorde é ChordPro (``[C]``).
+    """
+    linhas = []
+    for linha in conteudo.splitlines():
+        linhas.append(_tokenizar_linha(linha))
+    return tuple(linhas)
+
+
+def _tokenizar_linha(linha):
+    # Diretivas ChordPro ({title: ...}, {comment: ...}) ficam como estão
+    if linha.lstrip().startswith("{"):
+        return (False, (linha,))
+
+    if "[" in linha:
+        itens, inicio = [], 0
+        for encontrado in ACORDE_INLINE.finditer(linha):
+            acorde = _acorde(encontrado[1])
+            if acorde is None:
+                # [Refrão], [N.C.]... não são acordes
+                continue
+            if encontrado.start() > inicio:
+                itens.append(linha[inicio : encontrado.start()])
+            itens.append(acorde)
+            inicio = encontrado.end()
+        if inicio < len(linha):
+            itens.append(linha[inicio:])
+        return (False, tuple(itens))
+
+    palavras = list(PALAVRA.finditer(linha))
+    acordes = [_acorde(palavra[0]) for palavra in palavras]
+    if any(acordes) and all(
+        acorde or MARCACAO.match(palavra[0])
+        for acorde, palavra in zip(acordes, palavras)
+    ):
+        return (
+            True,
+            tuple(
+                (palavra.start(), acorde or palavra[0])
+                for acorde, palavra in zip(acordes, palavras)
+            ),
+        )
+    return (False, (linha,))
+
+
+def _nome(acorde, semitons, nomes):
+    raiz, sufixo, baixo = acorde
+    texto = nomes[(raiz + semitons) % 12] + sufixo
+    if baixo is not None:
+        texto += "/" + nomes[(baixo + semitons) % 12]
+    return texto
+
+
+@lru_cache(maxsize=1024)
+def _renderizar(conteudo, semitons, bemois):
+    """Cifra transposta: uma passada linear sobre os tokens já calculados."""
+    nomes = BEMOIS if bemois else SUSTENIDOS
+    saida = []
+    for so_acordes, itens in _tokenizar(conteudo):
+        if so_acordes:
+            # Mantém cada acorde na coluna original (sobre a mesma sílaba),
+            # empurrando para a direita só se o anterior cresceu
+            linha = ""
+            for coluna, item in itens:
+                texto = item if isinstance(item, str) else _nome(item, semitons, nomes)
+                posicao = max(coluna, len(linha) + 1) if linha else coluna
+                linha = linha.ljust(posicao) + texto
+            saida.append(linha)
+        else:
+            saida.append(
+                "".join(
+                    (
+                        item
+                        if isinstance(item, str)
+                        else f"[{_nome(item, semitons, nomes)}]"
+                    )
+                    for item in itens
+                )
+            )
+    return "\n".join(saida)
+
+
+class CifraService:
+    """
+    Transposição de cifras (``Musica.conteudo_cifra``).
+
+    Aceita cifras em ChordPro (``[C]palavra``) e no formato de acordes acima
+    da letra. O conteúdo é tokenizado uma única vez (acordes vs. texto) e
+    cada transposição é uma passada linear sobre os tokens; os dois passos
+    ficam em caches LRU do processo, indexados pelo próprio conteúdo, de
+    modo que editar a cifra invalida o cache naturalmente.
+    """
+
+    @staticmethod
+    def interpretar_tom(tom: str | None) -> tuple[int, bool] | None:
+        """Ex.: "G" -> (7, False), "F#m" -> (6, True); None se inválido."""
+        if not tom:
+            return None
+        tom = tom.strip()
+        encontrado = TOM.match(tom[:1].upper() + tom[1:])
+        if encontrado is None:
+            return None
+        return _semitom(encontrado["raiz"]), bool(encontrado["menor"])
+
+    @staticmethod
+    def tom_da_cifra(conteudo: str) -> tuple[int, bool] | None:
+        """Tom inferido pelo primeiro acorde da cifra."""
+        for so_acordes, itens in _tokenizar(conteudo):
+            candidatos = [item for _, item in itens] if so_acordes else itens
+            for item in candidatos:
+                if isinstance(item, tuple):
+                    raiz, sufixo, _ = item
+                    menor = sufixo.startswith("m") and not sufixo.startswith("maj")
+                    return raiz, menor
+        return None
+
+    @staticmethod
+    def nome_tom(tom: tuple[int, bool]) -> str:
+        raiz, menor = tom
+        return CifraService._nomes(tom)[raiz] + ("m" if menor else "")
+
+    @staticmethod
+    def _nomes(tom):
+        raiz, menor = tom
+        bemois = TONS_BEMOIS_MENORES if menor else TONS_BEMOIS_MAIORES
+        return BEMOIS if raiz in bemois else SUSTENIDOS
+
+    @staticmethod
+    def transpor(conteudo: str, origem: tuple[int, bool], destino_raiz: int) -> str:
+        """
+        Transpõe a cifra do tom ``origem`` para a raiz ``destino_raiz``,
+        mantendo o modo (maior/menor) do tom original na escolha entre
+        sustenidos e bemóis.
+        """
+        semitons = (destino_raiz - origem[0]) % 12
+        if semitons == 0:
+            return conteudo
+        bemois = CifraService._nomes((destino_raiz, origem[1])) is BEMOIS
+        return _renderizar(conteudo, semitons, bemois)
+
+    @staticmethod
+    def cifra_no_tom(musica, tom: str | None = None) -> dict:
+        """
+        ``{"tom_original", "tom", "conteudo_cifra"}`` da música, transposta
+        para ``tom`` se informado. O tom de origem é ``musica.tom`` ou, se
+        vazio, o do primeiro acorde. Levanta ValueError se ``tom`` for
+        inválido ou se não houver tom de origem para transpor.
+        """
+        conteudo = musica.conteudo_cifra or ""
+        origem = CifraService.interpretar_tom(musica.tom) or CifraService.tom_da_cifra(
+            conteudo
+        )
+
+        destino = origem
+        if tom:
+            destino = CifraService.interpretar_tom(tom)
+            if destino is None:
+                raise ValueError(f"Tom inválido: {tom}")
+            if origem is None:
+                raise ValueError("A música não tem tom original nem acordes na cifra")
+            destino = (destino[0], origem[1])
+            conteudo = CifraService.transpor(conteudo, origem, destino[0])
+
+        return {
+            "tom_original": CifraService.nome_tom(origem) if origem else None,
+            "tom": CifraService.nome_tom(destino) if destino else None,
+            "conteudo_cifra": conteudo,
+        }
@@ -1,4 +1,6 @@
-from core.models import Evento
+from django.db.models import Prefetch
+
+from core.models import Evento, ItemRepertorio, Musica
 
 
 class CompartilhamentoService:
@@ -31,7 +33,12 @@ class CompartilhamentoService:
             evento = Evento.objects.prefetch_related(
                 "escalas__musico",
                 "escalas__instrumentos",  # ← era instrumento_no_evento
-                "repertorio__artista",
+                Prefetch(
+                    "repertorio",
+                    queryset=Musica.objects.select_related("artista").order_by(
+                        *ItemRepertorio.ORDEM_MUSICAS
+                    ),
+                ),
             ).get(id=evento_id)
         except Evento.DoesNotExist:
             raise ValueError(f"Evento com id={evento_id} não encontrado.")
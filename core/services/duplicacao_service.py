@@ -0,0 +1,138 @@
+from datetime import datetime
+
+from django.db import transaction
+
+from core.models import Escala, Evento, ItemRepertorio
+from core.services.agenda_service import AgendaService
+from core.services.sincronizacao_service import SincronizacaoService
+
+
+class DuplicacaoService:
+    """
+    Cópia de eventos ("igual ao domingo passado") e das suas escalas e
+    repertório, também usada pelas séries recorrentes.
+
+    Tudo é copiado com ``bulk_create`` nas tabelas intermediárias e a
+    disponibilidade dos músicos é avaliada em memória, a partir da mesma
+    consulta que carrega as escalas de origem: o número de consultas é
+    constante, qualquer que seja o tamanho da equipe ou do repertório.
+    """
+
+    @staticmethod
+    def escalas_modelo(evento_id: int) -> list[Escala]:
+        """Escalas do evento de origem, com músico e instrumentos carregados."""
+        return list(
+            Escala.objects.filter(evento_id=evento_id)
+            .select_related("musico")
+            .prefetch_related("instrumentos")
+        )
+
+    @staticmethod
+    def copiar_repertorio(origem_id: int, eventos: list[Evento]) -> int:
+        """
+        Copia o repertório (com as posições) para cada evento. Itens que já
+        existem (cópia de um gerador de recorrências concorrente) são
+        mantidos.
+        """
+        itens = list(
+            ItemRepertorio.objects.filter(evento_id=origem_id).values_list(
+                "musica_id", "posicao"
+            )
+        )
+        ItemRepertorio.objects.bulk_create(
+            [
+                ItemRepertorio(evento=evento, musica_id=musica_id, posicao=posicao)
+                for evento in eventos
+                for musica_id, posicao in itens
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        return len(itens)
+
+    @staticmethod
+    def copiar_escalas(modelos: list[Escala], eventos: list[Evento]) -> list[Escala]:
+        """
+        Replica as escalas ``modelos`` (com ``musico`` e ``instrumentos``
+        já carregados) em cada evento, pulando quem não estiver disponível
+        na data. Retorna as escalas que ficaram de fora (sem salvar).
+        """
+        criar, puladas = [], []
+        for evento in eventos:
+            dia = evento.data_evento.date()
+            for modelo in modelos:
+                escala = Escala(
+                    evento=evento, musico=modelo.musico, observacao=modelo.observacao
+                )
+                if modelo.musico.esta_disponivel_em(dia):
+                    criar.append(escala)
+                else:
+                    puladas.append(escala)
+        if not criar:
+            return puladas
+
+        Escala.objects.bulk_create(criar, batch_size=1000, ignore_conflicts=True)
+        # bulk_create não devolve os IDs no MySQL
+        criadas = Escala.objects.filter(
+            evento_id__in=[evento.id for evento in eventos]
+        ).values_list("id", "musico_id")
+        instrumentos = {
+            modelo.musico_id: [
+                instrumento.id for instrumento in modelo.instrumentos.all()
+            ]
+            for modelo in modelos
+        }
+        Instrumentos = Escala.instrumentos.through
+        escala_ids, linhas = [], []
+        for escala_id, musico_id in criadas:
+            escala_ids.append(escala_id)
+            linhas.extend(
+                Instrumentos(escala_id=escala_id, instrumento_id=instrumento_id)
+                for instrumento_id in instrumentos.get(musico_id, [])
+            )
+        Instrumentos.objects.bulk_create(linhas, batch_size=1000, ignore_conflicts=True)
+
+        SincronizacaoService.registrar_ids(Escala, escala_ids)
+        AgendaService.invalidar(*{escala.musico_id for escala in criar})
+        return puladas
+
+    @staticmethod
+    @transaction.atomic
+    def duplicar(
+        evento: Evento,
+        data_evento: datetime,
+        data_hora_ensaio: datetime | None = None,
+        nome: str | None = None,
+    ) -> dict:
+        """
+        Cria uma cópia de ``evento`` em ``data_evento`` com o mesmo
+        repertório e equipe. Sem ``data_hora_ensaio``, o ensaio mantém a
+        mesma antecedência do original. Retorna o novo evento, quantas
+        escalas e músicas foram copiadas e as escalas puladas.
+        """
+        if data_hora_ensaio is None and evento.data_hora_ensaio:
+            data_hora_ensaio = data_evento - (
+                evento.data_evento - evento.data_hora_ensaio
+            )
+
+        novo = Evento(
+            nome=nome or evento.nome,
+            tipo=evento.tipo,
+            local=evento.local,
+            descricao=evento.descricao,
+            data_evento=data_evento,
+            data_hora_ensaio=data_hora_ensaio,
+        )
+        novo.full_clean()
+        novo.save()
+
+        musicas = DuplicacaoService.copiar_repertorio(evento.id, [novo])
+        modelos = DuplicacaoService.escalas_modelo(evento.id)
+        puladas = DuplicacaoService.copiar_escalas(modelos, [novo])
+
+        return {
+            "evento": novo,
+            "escalas_copiadas": len(modelos) - len(puladas),
+            "musicas_copiadas": musicas,
+            "puladas": puladas,
+        }
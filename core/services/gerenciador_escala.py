@@ -1,7 +1,9 @@
-from django.core.exceptions import ValidationError
+from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import transaction
 
 from core.models import Escala, Evento, Instrumento, Musico
+from core.services.agenda_service import AgendaService
+from core.services.sincronizacao_service import SincronizacaoService
 
 
 class GerenciadorEscala:
@@ -10,6 +12,9 @@ class GerenciadorEscala:
     relacionadas à escala de músicos.
     """
 
+    # Máximo de escalas por chamada de confirmar_lote
+    MAX_LOTE = 50
+
     @staticmethod
     @transaction.atomic
     def adicionar_musico_ao_evento(
@@ -49,12 +54,73 @@ class GerenciadorEscala:
                 nome=instrumento_nome
             )
 
-        escala = Escala.objects.create(
-            evento=evento,
-            musico=musico,
-        )
+        # Regras já verificadas acima: o modelo não revalida
+        escala = Escala(evento=evento, musico=musico)
+        escala.save(validar=False)
 
         if instrumento_obj:  # ← era `instrumento` (NameError)
             escala.instrumentos.set([instrumento_obj])
 
         return escala
+
+    @staticmethod
+    @transaction.atomic
+    def confirmar_lote(
+        escala_ids: list[int], confirmado: bool, musico_id: int | None = None
+    ) -> list[dict]:
+        """
+        Confirma (ou desconfirma) várias escalas com uma consulta de
+        verificação e um único UPDATE, sem carregar instâncias (``confirmado``
+        não exige revalidar a escala). Como o UPDATE não dispara signals, o
+        log de sincronização e os feeds .ics são atualizados aqui.
+
+        Com ``musico_id``, todas as escalas precisam ser desse músico; sem ele
+        (líder/admin), qualquer escala vale. Ou todas são alteradas, ou
+        nenhuma. Retorna as escalas cujo valor mudou, como dicts com
+        ``id``, ``musico_id``, ``musico__nome``, ``evento_id``,
+        ``evento__nome`` e ``evento__data_evento``.
+        """
+        if not isinstance(escala_ids, list) or not escala_ids:
+            raise ValidationError("Informe uma lista de IDs de escala.")
+        if len(escala_ids) > GerenciadorEscala.MAX_LOTE:
+            raise ValidationError(
+                f"Máximo de {GerenciadorEscala.MAX_LOTE} escalas por vez."
+            )
+        if not all(isinstance(i, int) and not isinstance(i, bool) for i in escala_ids):
+            raise ValidationError("Os IDs de escala devem ser números inteiros.")
+
+        escalas = list(
+            Escala.objects.filter(id__in=escala_ids)
+            .order_by("evento__data_evento", "id")
+            .values(
+                "id",
+                "confirmado",
+                "musico_id",
+                "musico__nome",
+                "evento_id",
+                "evento__nome",
+                "evento__data_evento",
+            )
+        )
+
+        nao_encontradas = set(escala_ids) - {escala["id"] for escala in escalas}
+        if nao_encontradas:
+            raise ValidationError(f"Escalas não encontradas: {sorted(nao_encontradas)}")
+        if musico_id is not None and any(
+            escala["musico_id"] != musico_id for escala in escalas
+        ):
+            raise PermissionDenied("Você não pode confirmar a escala de outro músico")
+
+        alteradas = [escala for escala in escalas if escala["confirmado"] != confirmado]
+        if alteradas:
+            ids = [escala["id"] for escala in alteradas]
+            Escala.objects.filter(id__in=ids).update(confirmado=confirmado)
+
+            SincronizacaoService.registrar_ids(Escala, ids)
+            SincronizacaoService.registrar_ids(
+                Evento, {escala["evento_id"] for escala in alteradas}
+            )
+            AgendaService.invalidar(*{escala["musico_id"] for escala in alteradas})
+        for escala in alteradas:
+            del escala["confirmado"]
+        return alteradas
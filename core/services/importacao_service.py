@@ -0,0 +1,523 @@
+import csv
+import io
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator, validate_email
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import Artista, Instrumento, Musica, Musico
+from core.services.sincronizacao_service import SincronizacaoService
+
+
+class ImportacaoService:
+    """
+    Importação em lote a partir de CSV/JSON, com relatório por linha.
+
+    Em vez de repetir o fluxo de criação unitário (uma consulta por username
+    candidato, ``Musico.save()`` com validação e sincronização de grupos),
+    o lote é validado em memória e gravado com poucos ``bulk_create``. As
+    linhas inválidas entram no relatório e não impedem as demais.
+    """
+
+    SENHA_PADRAO = "Musico@2024"
+    LIMITE_LINHAS = 2000
+    LIMITE_MUSICAS = 10000
+
+    # "Título - Artista" (hífen ou travessão com espaços ao redor)
+    SEPARADOR_TEXTO = re.compile(r"\s+[-–—]\s+")
+
+    # -------------------------
+    # LEITURA
+    # -------------------------
+    @staticmethod
+    def ler_arquivo(conteudo: bytes | str, nome: str) -> list[dict]:
+        """
+        Converte um arquivo .csv (cabeçalho na primeira linha), .json
+        (lista de objetos) ou .txt (ver ``ler_texto``) em lista de dicts.
+        Levanta ValueError se o formato não for suportado ou o conteúdo for
+        inválido.
+        """
+        if isinstance(conteudo, bytes):
+            try:
+                conteudo = conteudo.decode("utf-8-sig")
+            except UnicodeDecodeError as exc:
+                raise ValueError("O arquivo deve estar em UTF-8.") from exc
+
+        formato = Path(nome).suffix.lower()
+        if formato == ".txt":
+            return ImportacaoService.ler_texto(conteudo)
+        if formato == ".json":
+            try:
+                dados = json.loads(conteudo)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"JSON inválido: {exc}") from exc
+            if not isinstance(dados, list):
+                raise ValueError("O JSON deve ser uma lista de objetos.")
+            return dados
+
+        if formato == ".csv":
+            amostra = conteudo[:2048]
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+            except csv.Error:
+                dialeto = csv.excel
+            leitor = csv.DictReader(io.StringIO(conteudo), dialect=dialeto)
+            return [
+                {
+                    (chave or "").strip().lower(): (valor or "").strip()
+                    for chave, valor in linha.items()
+                }
+                for linha in leitor
+            ]
+
+        raise ValueError("Formato não suportado: use .csv, .json ou .txt.")
+
+    @staticmethod
+    def ler_texto(texto: str) -> list[dict]:
+        """
+        Uma música por linha no formato "Título - Artista" (setlist colada).
+        Linhas em branco são ignoradas; linhas sem separador seguem só com
+        o título e são apontadas como erro na importação.
+        """
+        linhas = []
+        for linha in texto.splitlines():
+            linha = linha.strip()
+            if not linha:
+                continue
+            partes = ImportacaoService.SEPARADOR_TEXTO.split(linha)
+            if len(partes) < 2:
+                linhas.append({"titulo": linha, "artista": ""})
+                continue
+            # Títulos podem conter " - "; o artista é o último trecho
+            linhas.append({"titulo": " - ".join(partes[:-1]), "artista": partes[-1]})
+        return linhas
+
+    @staticmethod
+    def chave_nome(nome: str) -> str:
+        """Chave de comparação sem acentos, maiúsculas ou espaços repetidos."""
+        sem_acentos = "".join(
+            c
+            for c in unicodedata.normalize("NFKD", nome)
+            if not unicodedata.combining(c)
+        )
+        return " ".join(sem_acentos.casefold().split())
+
+    # -------------------------
+    # MÚSICOS
+    # -------------------------
+    @staticmethod
+    def importar_musicos(linhas: list[dict], senha: str | None = None) -> dict:
+        """
+        Cria Users e Músicos em lote. Campos por linha: nome, email
+        (obrigatórios), telefone, endereco, instrumento (nome), tipo_usuario
+        e status. Usernames seguem a regra do cadastro unitário (parte local
+        do email, com sufixo numérico se ocupada).
+
+            {
+                "criados": 2,
+                "erros": 1,
+                "linhas": [
+                    {"linha": 1, "status": "criado", "id": 10, "username": "ana"},
+                    {"linha": 2, "status": "erro", "erros": {"email": "..."}},
+                    ...
+                ],
+            }
+        """
+        if len(linhas) > ImportacaoService.LIMITE_LINHAS:
+            raise ValueError(
+                f"Máximo de {ImportacaoService.LIMITE_LINHAS} linhas por importação."
+            )
+
+        relatorio = []
+        validas = []
+        emails_lote = set()
+
+        emails = [
+            User.objects.normalize_email(str(dados.get("email") or "").strip())
+            for dados in linhas
+            if isinstance(dados, dict)
+        ]
+        emails_usados = set(
+            User.objects.filter(email__in=emails).values_list("email", flat=True)
+        )
+
+        for numero, dados in enumerate(linhas, start=1):
+            campos, erros = ImportacaoService._validar_musico(dados)
+            email = campos.get("email")
+            if email and (email in emails_usados or email in emails_lote):
+                erros["email"] = "Este email já está em uso."
+            if erros:
+                relatorio.append({"linha": numero, "status": "erro", "erros": erros})
+                continue
+            emails_lote.add(email)
+            validas.append((numero, campos))
+
+        if validas:
+            criados = ImportacaoService._criar_musicos(
+                [campos for _, campos in validas],
+                senha or ImportacaoService.SENHA_PADRAO,
+            )
+            for (numero, _), (musico_id, username) in zip(validas, criados):
+                relatorio.append(
+                    {
+                        "linha": numero,
+                        "status": "criado",
+                        "id": musico_id,
+                        "username": username,
+                    }
+                )
+
+        relatorio.sort(key=lambda item: item["linha"])
+        return {
+            "criados": len(validas),
+            "erros": len(relatorio) - len(validas),
+            "linhas": relatorio,
+        }
+
+    @staticmethod
+    def _validar_musico(dados) -> tuple[dict, dict]:
+        if not isinstance(dados, dict):
+            return {}, {"linha": "Cada linha deve ser um objeto."}
+
+        def texto(campo):
+            valor = dados.get(campo)
+            return str(valor).strip() if valor is not None else ""
+
+        campos, erros = {}, {}
+
+        campos["nome"] = texto("nome")
+        if not campos["nome"]:
+            erros["nome"] = "Este campo é obrigatório."
+        elif len(campos["nome"]) > Musico._meta.get_field("nome").max_length:
+            erros["nome"] = "Nome muito longo."
+
+        email = User.objects.normalize_email(texto("email"))
+        try:
+            validate_email(email)
+            campos["email"] = email
+        except ValidationError:
+            erros["email"] = "Informe um email válido."
+
+        campos["tipo_usuario"] = texto("tipo_usuario").upper() or "MUSICO"
+        if campos["tipo_usuario"] not in dict(Musico.TIPO_USUARIO_CHOICES):
+            erros["tipo_usuario"] = f"Tipo inválido: {campos['tipo_usuario']}."
+
+        campos["status"] = texto("status").upper() or "ATIVO"
+        if campos["status"] not in dict(Musico.STATUS_CHOICES):
+            erros["status"] = f"Status inválido: {campos['status']}."
+
+        for campo in ("telefone", "endereco"):
+            campos[campo] = texto(campo) or None
+            if campos[campo] and len(campos[campo]) > (
+                Musico._meta.get_field(campo).max_length
+            ):
+                erros[campo] = "Valor muito longo."
+        campos["instrumento"] = texto("instrumento")
+        if len(campos["instrumento"]) > Instrumento._meta.get_field("nome").max_length:
+            erros["instrumento"] = "Nome de instrumento muito longo."
+        return campos, erros
+
+    @staticmethod
+    def _usernames_livres(emails: list[str]) -> list[str]:
+        """Resolve usernames únicos para o lote inteiro com uma só consulta."""
+        bases = [
+            re.sub(r"[^\w.@+-]", "", email.split("@")[0].lower())[:140] or "musico"
+            for email in emails
+        ]
+        filtro = Q()
+        for base in set(bases):
+            filtro |= Q(username__startswith=base)
+        ocupados = set(User.objects.filter(filtro).values_list("username", flat=True))
+
+        usernames = []
+        for base in bases:
+            username, contador = base, 1
+            while username in ocupados:
+                username = f"{base}{contador}"
+                contador += 1
+            ocupados.add(username)
+            usernames.append(username)
+        return usernames
+
+    @staticmethod
+    def _instrumentos(nomes: set[str]) -> dict[str, int]:
+        """nome (minúsculo) -> id, criando em lote os que não existem."""
+        if not nomes:
+            return {}
+        existentes = {
+            nome.lower(): id_
+            for id_, nome in Instrumento.objects.values_list("id", "nome")
+        }
+        faltando = {}
+        for nome in nomes:
+            if nome.lower() not in existentes:
+                faltando.setdefault(nome.lower(), nome.title())
+        if faltando:
+            Instrumento.objects.bulk_create(
+                [Instrumento(nome=nome) for nome in faltando.values()]
+            )
+            novos = Instrumento.objects.filter(nome__in=faltando.values())
+            for instrumento in novos:
+                existentes[instrumento.nome.lower()] = instrumento.id
+            SincronizacaoService.registrar_ids(
+                Instrumento, [instrumento.id for instrumento in novos]
+            )
+        return existentes
+
+    @staticmethod
+    @transaction.atomic
+    def _criar_musicos(lote: list[dict], senha: str) -> list[tuple[int, str]]:
+        """Grava o lote validado; retorna (musico_id, username) na mesma ordem."""
+        usernames = ImportacaoService._usernames_livres([c["email"] for c in lote])
+        # Um único hash para o lote: todos recebem a mesma senha inicial, que
+        # precisa ser trocada no primeiro login (um PBKDF2 por linha levaria
+        # minutos de CPU dentro da requisição)
+        hash_ = make_password(senha)
+
+        User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    email=campos["email"],
+                    password=hash_,
+                    first_name=campos["nome"].split()[0],
+                    last_name=" ".join(campos["nome"].split()[1:]),
+                    is_staff=campos["tipo_usuario"] == "ADMIN",
+                )
+                for campos, username in zip(lote, usernames)
+            ],
+            batch_size=500,
+        )
+        # No MySQL o bulk_create não preenche os ids: relê pelos usernames
+        user_ids = dict(
+            User.objects.filter(username__in=usernames).values_list("username", "id")
+        )
+
+        instrumentos = ImportacaoService._instrumentos(
+            {c["instrumento"] for c in lote if c["instrumento"]}
+        )
+        Musico.objects.bulk_create(
+            [
+                Musico(
+                    user_id=user_ids[username],
+                    nome=campos["nome"],
+                    telefone=campos["telefone"],
+                    endereco=campos["endereco"],
+                    tipo_usuario=campos["tipo_usuario"],
+                    status=campos["status"],
+                    instrumento_principal_id=instrumentos.get(
+                        campos["instrumento"].lower()
+                    ),
+                )
+                for campos, username in zip(lote, usernames)
+            ],
+            batch_size=500,
+        )
+        musico_ids = dict(
+            Musico.objects.filter(user_id__in=user_ids.values()).values_list(
+                "user_id", "id"
+            )
+        )
+
+        # Grupos: um único INSERT na tabela de ligação
+        grupos = {
+            tipo: Group.objects.get_or_create(name=nome)[0].id
+            for tipo, nome in Musico.GRUPOS.items()
+            if any(c["tipo_usuario"] == tipo for c in lote)
+        }
+        UsuarioGrupo = User.groups.through
+        UsuarioGrupo.objects.bulk_create(
+            [
+                UsuarioGrupo(
+                    user_id=user_ids[username], group_id=grupos[c["tipo_usuario"]]
+                )
+                for c, username in zip(lote, usernames)
+            ],
+            batch_size=500,
+        )
+
+        return [(musico_ids[user_ids[username]], username) for username in usernames]
+
+    # -------------------------
+    # MÚSICAS
+    # -------------------------
+    @staticmethod
+    def importar_musicas(linhas: list[dict]) -> dict:
+        """
+        Cria músicas e os artistas que faltarem. Campos por linha: titulo,
+        artista (obrigatórios), tom, link_cifra, link_youtube e
+        conteudo_cifra. Artistas são casados sem diferenciar acentos e
+        maiúsculas ("aline barros" = "Aline Barros"); músicas já cadastradas
+        para o mesmo artista são reportadas como "existente".
+
+            {
+                "criadas": 1,
+                "existentes": 1,
+                "erros": 0,
+                "artistas_criados": 1,
+                "linhas": [
+                    {"linha": 1, "status": "criada", "id": 7},
+                    {"linha": 2, "status": "existente", "id": 3},
+                ],
+            }
+        """
+        if len(linhas) > ImportacaoService.LIMITE_MUSICAS:
+            raise ValueError(
+                f"Máximo de {ImportacaoService.LIMITE_MUSICAS} linhas por importação."
+            )
+
+        relatorio = {}
+        validas = []
+        for numero, dados in enumerate(linhas, start=1):
+            campos, erros = ImportacaoService._validar_musica(dados)
+            if erros:
+                relatorio[numero] = {"linha": numero, "status": "erro", "erros": erros}
+            else:
+                validas.append((numero, campos))
+
+        with transaction.atomic():
+            artistas, artistas_criados = ImportacaoService._resolver_artistas(
+                [campos["artista"] for _, campos in validas]
+            )
+
+            # (artista_id, chave do título) -> id da música já cadastrada, só
+            # dos artistas do lote (``artistas`` traz todos os cadastrados)
+            artistas_lote = {
+                artistas[ImportacaoService.chave_nome(campos["artista"])]
+                for _, campos in validas
+            }
+            existentes = {
+                (artista_id, ImportacaoService.chave_nome(titulo)): id_
+                for id_, artista_id, titulo in Musica.objects.filter(
+                    artista_id__in=artistas_lote
+                ).values_list("id", "artista_id", "titulo")
+            }
+
+            novas = {}
+            for numero, campos in validas:
+                artista_id = artistas[ImportacaoService.chave_nome(campos["artista"])]
+                chave = (artista_id, ImportacaoService.chave_nome(campos["titulo"]))
+                if chave in existentes:
+                    relatorio[numero] = {
+                        "linha": numero,
+                        "status": "existente",
+                        "id": existentes[chave],
+                    }
+                elif chave in novas:
+                    # Repetida no próprio lote: vale a primeira ocorrência
+                    novas[chave][1].append(numero)
+                else:
+                    campos = {**campos, "artista_id": artista_id}
+                    del campos["artista"]
+                    novas[chave] = (Musica(**campos), [numero])
+
+            # ignore_conflicts: uma importação concorrente pode ter criado a
+            # mesma música; o unique_together decide e as linhas são relidas
+            Musica.objects.bulk_create(
+                [musica for musica, _ in novas.values()],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            criadas = {
+                (artista_id, ImportacaoService.chave_nome(titulo)): id_
+                for id_, artista_id, titulo in Musica.objects.filter(
+                    artista_id__in={m.artista_id for m, _ in novas.values()},
+                    titulo__in={m.titulo for m, _ in novas.values()},
+                ).values_list("id", "artista_id", "titulo")
+            }
+            SincronizacaoService.registrar_ids(
+                Musica, [criadas[c] for c in novas if c in criadas]
+            )
+
+        for chave, (_, numeros) in novas.items():
+            for indice, numero in enumerate(numeros):
+                relatorio[numero] = {
+                    "linha": numero,
+                    "status": "existente" if indice else "criada",
+                    "id": criadas.get(chave),
+                }
+
+        itens = [relatorio[numero] for numero in sorted(relatorio)]
+        return {
+            "criadas": sum(1 for item in itens if item["status"] == "criada"),
+            "existentes": sum(1 for item in itens if item["status"] == "existente"),
+            "erros": sum(1 for item in itens if item["status"] == "erro"),
+            "artistas_criados": artistas_criados,
+            "linhas": itens,
+        }
+
+    @staticmethod
+    def _validar_musica(dados) -> tuple[dict, dict]:
+        if not isinstance(dados, dict):
+            return {}, {"linha": "Cada linha deve ser um objeto."}
+
+        campos, erros = {}, {}
+        for campo in ("titulo", "artista", "tom", "link_cifra", "link_youtube"):
+            valor = dados.get(campo)
+            campos[campo] = " ".join(str(valor).split()) if valor is not None else ""
+
+        for campo in ("titulo", "artista"):
+            if not campos[campo]:
+                erros[campo] = "Este campo é obrigatório."
+
+        limites = {
+            "titulo": Musica._meta.get_field("titulo").max_length,
+            "artista": Artista._meta.get_field("nome").max_length,
+            "tom": Musica._meta.get_field("tom").max_length,
+            "link_cifra": Musica._meta.get_field("link_cifra").max_length,
+            "link_youtube": Musica._meta.get_field("link_youtube").max_length,
+        }
+        for campo, limite in limites.items():
+            if len(campos[campo]) > limite:
+                erros[campo] = f"Máximo de {limite} caracteres."
+
+        validar_url = URLValidator()
+        for campo in ("link_cifra", "link_youtube"):
+            if campos[campo] and campo not in erros:
+                try:
+                    validar_url(campos[campo])
+                except ValidationError:
+                    erros[campo] = "Informe uma URL válida."
+
+        for campo in ("tom", "link_cifra", "link_youtube"):
+            campos[campo] = campos[campo] or None
+        campos["conteudo_cifra"] = dados.get("conteudo_cifra") or None
+        return campos, erros
+
+    @staticmethod
+    def _resolver_artistas(nomes: list[str]) -> tuple[dict[str, int], int]:
+        """
+        Mapa chave do nome -> id, com todos os artistas cadastrados lidos de
+        uma vez e os que faltam criados em lote (grafia da primeira linha).
+        """
+        chave = ImportacaoService.chave_nome
+        artistas = {}
+        for id_, nome in Artista.objects.order_by("id").values_list("id", "nome"):
+            artistas.setdefault(chave(nome), id_)
+
+        faltando = {}
+        for nome in nomes:
+            if chave(nome) not in artistas:
+                faltando.setdefault(chave(nome), nome)
+        if not faltando:
+            return artistas, 0
+
+        Artista.objects.bulk_create(
+            [Artista(nome=nome) for nome in faltando.values()],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        novos = list(
+            Artista.objects.filter(nome__in=faltando.values()).values_list("id", "nome")
+        )
+        for id_, nome in novos:
+            artistas.setdefault(chave(nome), id_)
+        SincronizacaoService.registrar_ids(Artista, [id_ for id_, _ in novos])
+        return artistas, len(novos)
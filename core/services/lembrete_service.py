@@ -0,0 +1,174 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils.timezone import now
+
+from core.models import Escala, LembreteEnviado
+from core.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+class LembreteService:
+    """
+    Lembretes push antes dos eventos e ensaios, enviados pelo comando
+    ``enviar_lembretes`` a cada ``JANELA_MINUTOS``.
+
+    Cada rodada busca, com uma consulta por faixa no índice de
+    ``data_evento``/``data_hora_ensaio``, as escalas cujo lembrete
+    (horário menos a antecedência) cai até o fim da janela e ainda não foi
+    enviado. As escalas são percorridas em lotes de ``LOTE`` por id, para
+    que a memória não cresça com o número de escalados. Em cada lote, os
+    lembretes são primeiro reservados em ``LembreteEnviado`` e só os que
+    esta rodada conseguiu reservar são enviados, um multicast por evento:
+    no máximo um envio por lembrete, mesmo com agendadores concorrentes ou
+    falha no FCM. Rodadas atrasadas até ``ATRASO_MAXIMO_MINUTOS`` ainda
+    enviam os lembretes perdidos. Configuração em ``settings.SGGM_LEMBRETES``.
+    """
+
+    PADRAO = {
+        "ANTECEDENCIA_EVENTO_HORAS": 24,
+        "ANTECEDENCIA_ENSAIO_HORAS": 3,
+        "JANELA_MINUTOS": 5,
+        "ATRASO_MAXIMO_MINUTOS": 60,
+        "LOTE": 500,
+    }
+
+    # Tipo do lembrete -> campo do evento com o horário lembrado
+    CAMPOS = {"EVENTO": "data_evento", "ENSAIO": "data_hora_ensaio"}
+
+    @staticmethod
+    def configuracao() -> dict:
+        return {**LembreteService.PADRAO, **getattr(settings, "SGGM_LEMBRETES", {})}
+
+    # -------------------------
+    # CONSULTA
+    # -------------------------
+    @staticmethod
+    def pendentes(tipo: str, agora, config: dict | None = None):
+        """
+        Escalas com lembrete ``tipo`` a enviar na rodada de ``agora``: o
+        horário lembrado ainda não passou e o lembrete vence até o fim da
+        janela (ou venceu há no máximo ``ATRASO_MAXIMO_MINUTOS``).
+        """
+        config = config or LembreteService.configuracao()
+        campo = f"evento__{LembreteService.CAMPOS[tipo]}"
+        antecedencia = timedelta(hours=config[f"ANTECEDENCIA_{tipo}_HORAS"])
+        desde = max(
+            agora,
+            agora + antecedencia - timedelta(minutes=config["ATRASO_MAXIMO_MINUTOS"]),
+        )
+        ate = agora + antecedencia + timedelta(minutes=config["JANELA_MINUTOS"])
+
+        enviado = LembreteEnviado.objects.filter(
+            escala=OuterRef("pk"), tipo=tipo, momento=OuterRef(campo)
+        )
+        return (
+            Escala.objects.filter(
+                **{f"{campo}__gt": desde, f"{campo}__lte": ate},
+                musico__status="ATIVO",
+            )
+            .exclude(musico__fcm_token__isnull=True)
+            .exclude(musico__fcm_token="")
+            .filter(~Exists(enviado))
+            .order_by("id")
+        )
+
+    # -------------------------
+    # ENVIO
+    # -------------------------
+    @staticmethod
+    def processar(agora=None) -> dict[str, int]:
+        """
+        Uma rodada do agendador. Retorna quantos lembretes de cada tipo
+        foram reservados e enviados ao FCM.
+        """
+        agora = agora or now()
+        config = LembreteService.configuracao()
+        return {
+            tipo: LembreteService._processar_tipo(tipo, agora, config)
+            for tipo in LembreteService.CAMPOS
+        }
+
+    @staticmethod
+    def _processar_tipo(tipo, agora, config):
+        campo = f"evento__{LembreteService.CAMPOS[tipo]}"
+        consulta = LembreteService.pendentes(tipo, agora, config)
+        total, ultimo_id = 0, 0
+        while True:
+            # Paginação por id: cada lote é uma consulta curta no índice
+            lote = list(
+                consulta.filter(id__gt=ultimo_id).values(
+                    "id",
+                    "musico__fcm_token",
+                    "evento_id",
+                    "evento__nome",
+                    "evento__local",
+                    campo,
+                )[: config["LOTE"]]
+            )
+            if not lote:
+                return total
+            ultimo_id = lote[-1]["id"]
+            total += LembreteService._enviar_lote(tipo, campo, lote)
+
+    @staticmethod
+    def _enviar_lote(tipo, campo, lote):
+        reservados = LembreteService._reservar(tipo, campo, lote)
+
+        por_evento = defaultdict(list)
+        for escala in lote:
+            if escala["id"] in reservados:
+                chave = (
+                    escala["evento_id"],
+                    escala["evento__nome"],
+                    escala["evento__local"],
+                    escala[campo],
+                )
+                por_evento[chave].append(escala["musico__fcm_token"])
+
+        for (evento_id, nome, local, momento), tokens in por_evento.items():
+            evento = {"id": evento_id, "nome": nome, "local": local}
+            enviados = NotificationService.enviar_lembrete(
+                tipo, evento, momento, tokens
+            )
+            logger.info(
+                "Lembrete %s do evento %s: %s de %s enviados",
+                tipo,
+                evento_id,
+                enviados,
+                len(tokens),
+            )
+        return len(reservados)
+
+    @staticmethod
+    def _reservar(tipo, campo, lote) -> set[int]:
+        """
+        Grava os lembretes do lote antes do envio e retorna os ids das
+        escalas que esta rodada reservou (as já reservadas por outra rodada
+        são ignoradas pela restrição única).
+        """
+        rodada = uuid.uuid4()
+        with transaction.atomic():
+            LembreteEnviado.objects.bulk_create(
+                [
+                    LembreteEnviado(
+                        escala_id=escala["id"],
+                        tipo=tipo,
+                        momento=escala[campo],
+                        lote=rodada,
+                    )
+                    for escala in lote
+                ],
+                ignore_conflicts=True,
+            )
+        return set(
+            LembreteEnviado.objects.filter(lote=rodada).values_list(
+                "escala_id", flat=True
+            )
+        )
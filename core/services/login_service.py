@@ -0,0 +1,87 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connection
+from django.utils.timezone import now
+
+logger = logging.getLogger(__name__)
+
+
+class LoginService:
+    """
+    Atualização de ``User.last_login`` fora do caminho do login.
+
+    Em vez de um ``UPDATE`` síncrono por login (``UPDATE_LAST_LOGIN`` do
+    Simple JWT), os horários ficam em memória e são gravados em lote, com
+    um único ``bulk_update``, ``ULTIMO_LOGIN_INTERVALO`` segundos depois
+    do primeiro login pendente (em uma thread) ou ao encerrar o processo.
+    Com intervalo 0 a gravação é imediata. Configuração em
+    ``settings.SGGM_LOGIN``.
+    """
+
+    PADRAO = {"ULTIMO_LOGIN_INTERVALO": 10}
+
+    _pendentes: dict[int, object] = {}
+    _lock = threading.Lock()
+    _timer: threading.Timer | None = None
+
+    @staticmethod
+    def configuracao() -> dict:
+        return {**LoginService.PADRAO, **getattr(settings, "SGGM_LOGIN", {})}
+
+    @classmethod
+    def registrar_ultimo_login(cls, user: User) -> None:
+        """Anota o login de ``user``; a gravação acontece em lote."""
+        user.last_login = now()
+        intervalo = cls.configuracao()["ULTIMO_LOGIN_INTERVALO"]
+        if intervalo <= 0:
+            User.objects.filter(pk=user.pk).update(last_login=user.last_login)
+            return
+
+        with cls._lock:
+            cls._pendentes[user.pk] = user.last_login
+            if cls._timer is None:
+                cls._timer = threading.Timer(intervalo, cls._descarregar_em_thread)
+                cls._timer.daemon = True
+                cls._timer.start()
+
+    @classmethod
+    def descarregar(cls) -> int:
+        """Grava os logins pendentes; retorna quantos usuários atualizou."""
+        with cls._lock:
+            pendentes, cls._pendentes = cls._pendentes, {}
+            if cls._timer is not None:
+                cls._timer.cancel()
+                cls._timer = None
+        if not pendentes:
+            return 0
+
+        # update/bulk_update não disparam post_save: a versão das
+        # credenciais em cache (core.api.authentication) continua válida
+        User.objects.bulk_update(
+            [User(pk=pk, last_login=quando) for pk, quando in pendentes.items()],
+            ["last_login"],
+            batch_size=500,
+        )
+        return len(pendentes)
+
+    @classmethod
+    def _descarregar_em_thread(cls):
+        try:
+            cls.descarregar()
+        except DatabaseError:
+            logger.exception("Falha ao gravar os últimos logins")
+        finally:
+            # Conexão aberta por esta thread
+            connection.close()
+
+
+@atexit.register
+def _descarregar_ao_sair():
+    try:
+        LoginService.descarregar()
+    except Exception:
+        logger.warning("Últimos logins pendentes descartados ao encerrar")
@@ -1,10 +1,16 @@
 # core/services/notification_service.py
 
+import logging
 from pathlib import Path
 
 import firebase_admin
 from firebase_admin import credentials, messaging
 
+from core.instrumentation import span
+from core.metrics import medir_envio_fcm
+
+logger = logging.getLogger(__name__)
+
 
 class NotificationService:
     _initialized = False
@@ -17,51 +23,39 @@ class NotificationService:
 
         if firebase_admin._apps:
             NotificationService._initialized = True
-            print("ℹ️ Firebase já inicializado")
             return True
 
         try:
             BASE_DIR = Path(__file__).resolve().parent.parent.parent
             cred_path = BASE_DIR / "SGGM" / "serviceAccountKey.json"
 
-            print("\n🔥 Inicializando Firebase...")
-            print(f"📂 {cred_path}")
-
             if not cred_path.exists():
-                print(f"❌ Arquivo não encontrado: {cred_path}")
+                logger.error("Credenciais do Firebase não encontradas: %s", cred_path)
                 return False
 
             cred = credentials.Certificate(str(cred_path))
             firebase_admin.initialize_app(cred)
 
             NotificationService._initialized = True
-            print("✅ Firebase inicializado!\n")
+            logger.info("Firebase inicializado com %s", cred_path)
             return True
 
-        except Exception as e:
-            print(f"❌ Erro Firebase: {e}")
-            import traceback
-
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Erro ao inicializar o Firebase")
             return False
 
     @staticmethod
     def enviar_notificacao_escala(musico, evento):
         """Envia notificação push para músico escalado."""
         if not NotificationService._ensure_firebase_initialized():
-            print("❌ Firebase não inicializado")
+            logger.warning("Firebase não inicializado; notificação não enviada")
             return False
 
         if not musico.fcm_token:
-            print(f"⚠️ {musico.nome} sem token FCM")
+            logger.debug("Músico %s sem token FCM", musico.id)
             return False
 
         try:
-            print("\n📤 ENVIANDO NOTIFICAÇÃO")
-            print(f"   Para: {musico.nome}")
-            print(f"   Token: {musico.fcm_token[:30]}...")
-            print(f"   Evento: {evento.nome}")
-
             from datetime import datetime
 
             data_evento = datetime.fromisoformat(str(evento.data_evento))
@@ -82,47 +76,153 @@ class NotificationService:
                 token=musico.fcm_token,
             )
 
-            response = messaging.send(message)
-            print(f"✅ Notificação enviada! ID: {response}\n")
+            with medir_envio_fcm("escala"), span("externo"):
+                response = messaging.send(message)
+            logger.info(
+                "Notificação de escala enviada ao músico %s (evento %s): %s",
+                musico.id,
+                evento.id,
+                response,
+            )
             return True
 
-        except Exception as e:
-            print(f"❌ Erro ao enviar: {e}")
-            import traceback
-
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Erro ao enviar notificação ao músico %s", musico.id)
             return False
 
+    # -------------------------
+    # MULTICAST
+    # -------------------------
+    # Limite do FCM por chamada de send_each_for_multicast
+    TOKENS_POR_LOTE = 500
 
-@staticmethod
-def enviar_notificacao_feedback(musico, comentario):
-    """Envia notificação push para escalados quando feedback é postado."""
-    if not NotificationService._ensure_firebase_initialized():
-        return False
+    @staticmethod
+    def _enviar_multicast(tokens, notification, data, tipo):
+        """
+        Envia a mesma mensagem para vários tokens, em lotes de
+        ``TOKENS_POR_LOTE``. Retorna quantos envios o FCM aceitou.
+        """
+        tokens = list(dict.fromkeys(token for token in tokens if token))
+        if not tokens or not NotificationService._ensure_firebase_initialized():
+            return 0
+
+        enviados = 0
+        for inicio in range(0, len(tokens), NotificationService.TOKENS_POR_LOTE):
+            lote = tokens[inicio : inicio + NotificationService.TOKENS_POR_LOTE]
+            message = messaging.MulticastMessage(
+                notification=notification, data=data, tokens=lote
+            )
+            try:
+                with medir_envio_fcm(tipo), span("externo"):
+                    response = messaging.send_each_for_multicast(message)
+            except Exception:
+                logger.exception(
+                    "Erro ao enviar notificação %s para %s tokens", tipo, len(lote)
+                )
+                continue
+            enviados += response.success_count
+            if response.failure_count:
+                logger.warning(
+                    "Notificação %s: %s de %s envios falharam",
+                    tipo,
+                    response.failure_count,
+                    len(lote),
+                )
+        return enviados
 
-    if not musico.fcm_token:
-        return False
+    @staticmethod
+    def enviar_notificacao_confirmacoes(autor, escalas, confirmado):
+        """
+        Avisa os líderes, numa única mensagem multicast, das escalas que
+        ``autor`` confirmou (ou desconfirmou) de uma vez. ``escalas`` são
+        dicts com ``id``, ``evento__nome`` e ``evento__data_evento``.
+        """
+        from core.models import Musico
+
+        if not escalas:
+            return 0
+
+        tokens = (
+            Musico.objects.filter(tipo_usuario__in=("LIDER", "ADMIN"), status="ATIVO")
+            .exclude(pk=autor.pk)
+            .exclude(fcm_token__isnull=True)
+            .exclude(fcm_token="")
+            .values_list("fcm_token", flat=True)
+        )
+        eventos = ", ".join(
+            f"{escala['evento__nome']} ({escala['evento__data_evento']:%d/%m})"
+            for escala in escalas
+        )
+        acao = "confirmou" if confirmado else "desconfirmou"
+        notification = messaging.Notification(
+            title=f"✅ {autor.nome} {acao} presença",
+            body=f"{len(escalas)} escala(s): {eventos}",
+        )
+        data = {
+            "tipo": "confirmacao_lote",
+            "musico_id": str(autor.pk),
+            "escala_ids": ",".join(str(escala["id"]) for escala in escalas),
+            "confirmado": "1" if confirmado else "0",
+        }
+        return NotificationService._enviar_multicast(
+            tokens, notification, data, "confirmacao"
+        )
 
-    try:
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title=f"💬 Novo feedback — {comentario.evento.nome}",
-                body=(
-                    f"{comentario.autor.nome} comentou sobre "
-                    f"'{comentario.musica.titulo}'"
-                ),
+    @staticmethod
+    def enviar_lembrete(tipo, evento, momento, tokens):
+        """
+        Lembrete de evento (``tipo="EVENTO"``) ou ensaio (``"ENSAIO"``) para
+        os escalados, numa mensagem multicast. ``evento`` é um dict com
+        ``id``, ``nome`` e ``local``.
+        """
+        quando = momento.strftime("%d/%m às %H:%M")
+        if tipo == "ENSAIO":
+            titulo = f"🎸 Ensaio: {evento['nome']}"
+            corpo = f"O ensaio é {quando}. Não se atrase!"
+        else:
+            titulo = f"⏰ Lembrete: {evento['nome']}"
+            corpo = f"Você está escalado para {quando}"
+        if evento["local"]:
+            corpo += f" — {evento['local']}"
+
+        notification = messaging.Notification(title=titulo, body=corpo)
+        data = {
+            "tipo": f"lembrete_{tipo.lower()}",
+            "evento_id": str(evento["id"]),
+            "momento": momento.isoformat(),
+        }
+        return NotificationService._enviar_multicast(
+            tokens, notification, data, "lembrete"
+        )
+
+    @staticmethod
+    def enviar_notificacao_feedback_escalados(comentario):
+        """
+        Avisa os escalados do evento (exceto o autor) de um novo feedback,
+        numa única mensagem multicast.
+        """
+        from core.models import Musico
+
+        tokens = (
+            Musico.objects.filter(escalas__evento_id=comentario.evento_id)
+            .exclude(pk=comentario.autor_id)
+            .exclude(fcm_token__isnull=True)
+            .exclude(fcm_token="")
+            .values_list("fcm_token", flat=True)
+        )
+        notification = messaging.Notification(
+            title=f"💬 Novo feedback — {comentario.evento.nome}",
+            body=(
+                f"{comentario.autor.nome if comentario.autor else 'Alguém'} "
+                f"comentou sobre '{comentario.musica.titulo}'"
             ),
-            data={
-                "tipo": "novo_feedback",
-                "comentario_id": str(comentario.id),
-                "evento_id": str(comentario.evento.id),
-                "musica_id": str(comentario.musica.id),
-            },
-            token=musico.fcm_token,
         )
-        response = messaging.send(message)
-        print(f"✅ Notificação feedback enviada para {musico.nome}: {response}")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao enviar feedback notification: {e}")
-        return False
+        data = {
+            "tipo": "novo_feedback",
+            "comentario_id": str(comentario.id),
+            "evento_id": str(comentario.evento_id),
+            "musica_id": str(comentario.musica_id),
+        }
+        return NotificationService._enviar_multicast(
+            tokens, notification, data, "feedback"
+        )
@@ -0,0 +1,182 @@
+import calendar
+from datetime import date, datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from core.models import Evento, SerieEvento
+from core.services.duplicacao_service import DuplicacaoService
+from core.services.sincronizacao_service import SincronizacaoService
+
+
+class RecorrenciaService:
+    """
+    Materialização das séries de eventos recorrentes (``SerieEvento``).
+
+    Cada chamada cria, com ``bulk_create``, só as ocorrências entre o
+    último dia já gerado e o horizonte pedido, copiando em lote a escala
+    (com os instrumentos) e o repertório do evento modelo. O número de
+    consultas não depende de quantas ocorrências ou escalados houver.
+    """
+
+    HORIZONTE_DIAS = 60
+    CACHE_EXTENSAO = "recorrencia:estendido"
+
+    # -------------------------
+    # OCORRÊNCIAS
+    # -------------------------
+    @staticmethod
+    def ocorrencias(serie: SerieEvento, desde: date, ate: date) -> list[date]:
+        """Datas da série entre ``desde`` e ``ate`` (inclusive)."""
+        desde = max(desde, serie.data_inicio)
+        if serie.data_fim:
+            ate = min(ate, serie.data_fim)
+        if desde > ate:
+            return []
+        if serie.frequencia == "MENSAL":
+            return RecorrenciaService._mensais(serie, desde, ate)
+        return RecorrenciaService._semanais(serie, desde, ate)
+
+    @staticmethod
+    def _semanais(serie, desde, ate):
+        # Âncora: primeira ocorrência a partir do início da série, para que
+        # "a cada 2 semanas" não dependa de até onde já foi gerado
+        ancora = serie.data_inicio + timedelta(
+            days=(serie.dia_semana - serie.data_inicio.weekday()) % 7
+        )
+        passo = 7 * serie.intervalo
+        pulos = max(0, -(-(desde - ancora).days // passo))
+        datas, atual = [], ancora + timedelta(days=pulos * passo)
+        while atual <= ate:
+            datas.append(atual)
+            atual += timedelta(days=passo)
+        return datas
+
+    @staticmethod
+    def _mensais(serie, desde, ate):
+        datas = []
+        ano, mes = serie.data_inicio.year, serie.data_inicio.month
+        while date(ano, mes, 1) <= ate:
+            dia = RecorrenciaService._dia_do_mes(
+                ano, mes, serie.dia_semana, serie.semana_do_mes
+            )
+            if desde <= dia <= ate:
+                datas.append(dia)
+            mes += serie.intervalo
+            ano, mes = ano + (mes - 1) // 12, (mes - 1) % 12 + 1
+        return datas
+
+    @staticmethod
+    def _dia_do_mes(ano, mes, dia_semana, semana):
+        """Ex.: 1º domingo (semana=1) ou último sábado (semana=-1) do mês."""
+        if semana == -1:
+            ultimo = calendar.monthrange(ano, mes)[1]
+            fim = date(ano, mes, ultimo)
+            return fim - timedelta(days=(fim.weekday() - dia_semana) % 7)
+        primeiro = date(ano, mes, 1)
+        dia = primeiro + timedelta(days=(dia_semana - primeiro.weekday()) % 7)
+        return dia + timedelta(weeks=semana - 1)
+
+    # -------------------------
+    # GERAÇÃO
+    # -------------------------
+    @staticmethod
+    def gerar(serie: SerieEvento, ate: date | None = None) -> list[int]:
+        """
+        Cria os eventos da série até ``ate`` (padrão: hoje + HORIZONTE_DIAS)
+        e retorna os IDs criados. Ocorrências já existentes são ignoradas.
+        """
+        ate = ate or now().date() + timedelta(days=RecorrenciaService.HORIZONTE_DIAS)
+        desde = (
+            serie.gerado_ate + timedelta(days=1)
+            if serie.gerado_ate
+            else serie.data_inicio
+        )
+        datas = [
+            datetime.combine(dia, serie.horario)
+            for dia in RecorrenciaService.ocorrencias(serie, desde, ate)
+        ]
+
+        with transaction.atomic():
+            existentes = set(
+                Evento.objects.filter(serie=serie, data_evento__in=datas).values_list(
+                    "data_evento", flat=True
+                )
+            )
+            novas = [data for data in datas if data not in existentes]
+            ids = []
+            if novas:
+                Evento.objects.bulk_create(
+                    [RecorrenciaService._evento(serie, data) for data in novas],
+                    ignore_conflicts=True,
+                )
+                # bulk_create não devolve os IDs no MySQL
+                eventos = list(
+                    Evento.objects.filter(serie=serie, data_evento__in=novas).only(
+                        "id", "data_evento"
+                    )
+                )
+                ids = [evento.id for evento in eventos]
+                SincronizacaoService.registrar_ids(Evento, ids)
+                if serie.evento_modelo_id:
+                    RecorrenciaService._copiar_modelo(serie, eventos)
+
+            if ate > (serie.gerado_ate or date.min):
+                serie.gerado_ate = ate
+                serie.save(update_fields=["gerado_ate"])
+        return ids
+
+    @staticmethod
+    def _evento(serie, data_evento):
+        return Evento(
+            serie=serie,
+            nome=serie.nome,
+            tipo=serie.tipo,
+            local=serie.local,
+            descricao=serie.descricao,
+            data_evento=data_evento,
+            data_hora_ensaio=(
+                data_evento - serie.antecedencia_ensaio
+                if serie.antecedencia_ensaio
+                else None
+            ),
+        )
+
+    @staticmethod
+    def _copiar_modelo(serie, eventos):
+        """
+        Copia escala e repertório do evento modelo para ``eventos``. A
+        releitura após o bulk_create pode trazer eventos que um gerador
+        concorrente acabou de criar e copiar: as cópias ignoram conflitos.
+        """
+        if serie.copiar_repertorio:
+            DuplicacaoService.copiar_repertorio(serie.evento_modelo_id, eventos)
+        if serie.copiar_escala:
+            DuplicacaoService.copiar_escalas(
+                DuplicacaoService.escalas_modelo(serie.evento_modelo_id), eventos
+            )
+
+    @staticmethod
+    def estender(ate: date | None = None) -> int:
+        """Estende todas as séries ativas até ``ate``; retorna quantos eventos criou."""
+        ate = ate or now().date() + timedelta(days=RecorrenciaService.HORIZONTE_DIAS)
+        series = (
+            SerieEvento.objects.filter(ativa=True).filter(
+                Q(gerado_ate__isnull=True) | Q(gerado_ate__lt=ate)
+            )
+            # Séries encerradas e já geradas até o fim
+            .exclude(data_fim__lte=F("gerado_ate"))
+        )
+        return sum(len(RecorrenciaService.gerar(serie, ate)) for serie in series)
+
+    @staticmethod
+    def estender_se_necessario():
+        """
+        Extensão preguiçosa do horizonte: no máximo uma vez por dia (por
+        cache), chamada ao listar os próximos eventos.
+        """
+        chave = f"{RecorrenciaService.CACHE_EXTENSAO}:{now().date()}"
+        if cache.add(chave, True, 60 * 60 * 24):
+            RecorrenciaService.estender()
@@ -0,0 +1,243 @@
+from bisect import bisect_left
+
+from django.db import transaction
+
+from core.models import Evento, ItemRepertorio, Musica
+from core.services.sincronizacao_service import SincronizacaoService
+
+
+class _Lista:
+    """
+    Repertório de um evento em memória durante uma edição: cada inserção
+    calcula a posição entre as vizinhas e, ao final, ``salvar`` grava só
+    as linhas novas, removidas ou com posição alterada.
+    """
+
+    def __init__(self, evento: Evento):
+        self.evento = evento
+        self.itens = list(
+            ItemRepertorio.objects.select_for_update()
+            .filter(evento=evento)
+            .only("id", "evento_id", "musica_id", "posicao")
+        )
+        self.originais = {item.pk: item.posicao for item in self.itens}
+        self.removidos = []
+
+    def musica_ids(self) -> list[int]:
+        return [item.musica_id for item in self.itens]
+
+    def indice(self, musica_id: int) -> int:
+        for indice, item in enumerate(self.itens):
+            if item.musica_id == musica_id:
+                return indice
+        raise ValueError(f"A música {musica_id} não está no repertório")
+
+    def retirar(self, musica_id: int) -> ItemRepertorio:
+        return self.itens.pop(self.indice(musica_id))
+
+    def remover(self, musica_id: int):
+        item = self.retirar(musica_id)
+        if item.pk is not None:
+            self.removidos.append(item.pk)
+
+    def inserir(self, item: ItemRepertorio, indice: int | None = None):
+        if indice is None or indice > len(self.itens):
+            indice = len(self.itens)
+        indice = max(indice, 0)
+        self.itens.insert(indice, item)
+
+        anterior = self.itens[indice - 1].posicao if indice > 0 else None
+        seguinte = (
+            self.itens[indice + 1].posicao if indice + 1 < len(self.itens) else None
+        )
+        if anterior is None and seguinte is None:
+            item.posicao = ItemRepertorio.INTERVALO
+        elif anterior is None:
+            item.posicao = seguinte - ItemRepertorio.INTERVALO
+        elif seguinte is None:
+            item.posicao = anterior + ItemRepertorio.INTERVALO
+        elif seguinte - anterior > 1:
+            item.posicao = (anterior + seguinte) // 2
+        else:
+            # Sem espaço entre as vizinhas: renumera o repertório do evento
+            for numero, atual in enumerate(self.itens, start=1):
+                atual.posicao = numero * ItemRepertorio.INTERVALO
+
+    def salvar(self) -> bool:
+        """Grava as diferenças; retorna False se nada mudou."""
+        novos = [item for item in self.itens if item.pk is None]
+        alterados = [
+            item
+            for item in self.itens
+            if item.pk is not None and item.posicao != self.originais[item.pk]
+        ]
+        if not (novos or alterados or self.removidos):
+            return False
+
+        if self.removidos:
+            ItemRepertorio.objects.filter(pk__in=self.removidos).delete()
+        if alterados:
+            ItemRepertorio.objects.bulk_update(alterados, ["posicao"])
+        if novos:
+            ItemRepertorio.objects.bulk_create(novos)
+        # Operações diretas na tabela não disparam o m2m_changed
+        SincronizacaoService.registrar(self.evento, "SALVO")
+        return True
+
+
+class RepertorioService:
+    """
+    Edição ordenada do repertório de um evento (``ItemRepertorio``).
+
+    Inserir, mover ou remover uma música grava apenas a linha afetada; a
+    substituição completa (PUT) mantém no lugar a maior sequência de
+    músicas que já está na ordem pedida e reposiciona só as demais.
+    """
+
+    ACOES = ("inserir", "mover", "remover")
+
+    @staticmethod
+    def musica_ids(evento: Evento) -> list[int]:
+        """IDs das músicas do repertório, na ordem do evento."""
+        return list(
+            ItemRepertorio.objects.filter(evento=evento).values_list(
+                "musica_id", flat=True
+            )
+        )
+
+    @staticmethod
+    def adicionar(
+        evento: Evento, musica_ids: list[int], posicao: int | None = None
+    ) -> list[int]:
+        """
+        Inclui as músicas a partir do índice ``posicao`` (padrão: no fim),
+        ignorando as que já estão no repertório. Retorna a ordem final.
+        """
+        with transaction.atomic():
+            lista = _Lista(evento)
+            presentes = set(lista.musica_ids())
+            indice = posicao
+            for musica_id in dict.fromkeys(musica_ids):
+                if musica_id in presentes:
+                    continue
+                lista.inserir(
+                    ItemRepertorio(evento=evento, musica_id=musica_id), indice
+                )
+                if indice is not None:
+                    indice += 1
+            lista.salvar()
+        return lista.musica_ids()
+
+    @staticmethod
+    def substituir(evento: Evento, musica_ids: list[int]) -> list[int]:
+        """Define o repertório exatamente como ``musica_ids``, nessa ordem."""
+        desejados = list(dict.fromkeys(musica_ids))
+        ordem = {musica_id: indice for indice, musica_id in enumerate(desejados)}
+
+        with transaction.atomic():
+            lista = _Lista(evento)
+            for musica_id in lista.musica_ids():
+                if musica_id not in ordem:
+                    lista.remover(musica_id)
+
+            fixos = RepertorioService._maior_sequencia_crescente(
+                lista.musica_ids(), ordem
+            )
+            existentes = {}
+            for musica_id in lista.musica_ids():
+                if musica_id not in fixos:
+                    existentes[musica_id] = lista.retirar(musica_id)
+
+            # Com os fixos já em ordem relativa, cada música vai para o seu
+            # índice final, da primeira à última
+            for indice, musica_id in enumerate(desejados):
+                if musica_id in fixos:
+                    continue
+                item = existentes.get(musica_id) or ItemRepertorio(
+                    evento=evento, musica_id=musica_id
+                )
+                lista.inserir(item, indice)
+            lista.salvar()
+        return lista.musica_ids()
+
+    @staticmethod
+    def aplicar(evento: Evento, operacoes: list[dict]) -> list[int]:
+        """
+        Aplica, em ordem e atomicamente, operações como
+        ``{"acao": "mover", "musica": 12, "posicao": 0}``,
+        ``{"acao": "inserir", "musica": 15}`` (no fim se sem ``posicao``) e
+        ``{"acao": "remover", "musica": 9}``. ``posicao`` é o índice
+        (a partir de 0) na lista resultante. Levanta ValueError se alguma
+        operação for inválida; nesse caso nada é gravado.
+        """
+        if not isinstance(operacoes, list) or not operacoes:
+            raise ValueError("Informe a lista 'operacoes'")
+
+        validas = [RepertorioService._validar_operacao(op) for op in operacoes]
+        inseridas = {op["musica"] for op in validas if op["acao"] == "inserir"}
+        encontradas = set(
+            Musica.objects.filter(id__in=inseridas).values_list("id", flat=True)
+        )
+        if inseridas - encontradas:
+            raise ValueError(
+                f"Músicas não encontradas: {sorted(inseridas - encontradas)}"
+            )
+
+        with transaction.atomic():
+            lista = _Lista(evento)
+            for op in validas:
+                if op["acao"] == "remover":
+                    lista.remover(op["musica"])
+                elif op["acao"] == "mover":
+                    lista.inserir(lista.retirar(op["musica"]), op["posicao"])
+                else:
+                    if op["musica"] in lista.musica_ids():
+                        raise ValueError(
+                            f"A música {op['musica']} já está no repertório"
+                        )
+                    lista.inserir(
+                        ItemRepertorio(evento=evento, musica_id=op["musica"]),
+                        op["posicao"],
+                    )
+            lista.salvar()
+        return lista.musica_ids()
+
+    @staticmethod
+    def _validar_operacao(op) -> dict:
+        if not isinstance(op, dict) or op.get("acao") not in RepertorioService.ACOES:
+            raise ValueError(
+                f"Operação inválida: {op} (ações: {', '.join(RepertorioService.ACOES)})"
+            )
+        musica, posicao = op.get("musica"), op.get("posicao")
+        if not isinstance(musica, int) or isinstance(musica, bool):
+            raise ValueError(f"Operação sem o ID da música: {op}")
+        if posicao is not None and (not isinstance(posicao, int) or posicao < 0):
+            raise ValueError(f"Posição inválida: {op}")
+        if op["acao"] == "mover" and posicao is None:
+            raise ValueError(f"Informe a posição de destino: {op}")
+        return {"acao": op["acao"], "musica": musica, "posicao": posicao}
+
+    @staticmethod
+    def _maior_sequencia_crescente(atuais: list[int], ordem: dict) -> set[int]:
+        """
+        Músicas que podem ficar onde estão: a maior subsequência de
+        ``atuais`` já na ordem desejada (O(n log n)).
+        """
+        finais, indices_finais, anteriores = [], [], []
+        for indice, musica_id in enumerate(atuais):
+            valor = ordem[musica_id]
+            tamanho = bisect_left(finais, valor)
+            anteriores.append(indices_finais[tamanho - 1] if tamanho else None)
+            if tamanho == len(finais):
+                finais.append(valor)
+                indices_finais.append(indice)
+            else:
+                finais[tamanho] = valor
+                indices_finais[tamanho] = indice
+
+        fixos = set()
+        indice = indices_finais[-1] if indices_finais else None
+        while indice is not None:
+            fixos.add(atuais[indice])
+            indice = anteriores[indice]
+        return fixos
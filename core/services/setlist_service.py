@@ -0,0 +1,177 @@
+import gzip
+import hashlib
+import json
+import re
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.models import Evento, Musica
+from core.services.cifra_service import CifraService
+from core.services.repertorio_service import RepertorioService
+
+try:
+    import brotli
+except ImportError:  # pacote opcional: sem ele, apenas gzip
+    brotli = None
+
+
+class SetlistService:
+    """
+    Pacote com todas as cifras do repertório de um evento, para o app
+    baixar o culto inteiro em uma única requisição antes de ficar offline.
+
+    O corpo (JSON) já comprimido fica no cache indexado pelo ETag, que é
+    derivado do repertório (ordem incluída), do conteúdo das músicas e dos
+    tons pedidos: retomadas com ``Range`` e revalidações com
+    ``If-None-Match`` não reprocessam nada. A compressão é determinística
+    (gzip com ``mtime=0``), de modo que os bytes de um mesmo ETag nunca
+    mudam entre workers ou após expirar do cache.
+    """
+
+    CACHE_PREFIXO = "setlist"
+    CACHE_TIMEOUT = 60 * 60
+
+    RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+    # -------------------------
+    # CONTEÚDO
+    # -------------------------
+    @staticmethod
+    def repertorio(evento: Evento) -> list[Musica]:
+        """Músicas do repertório na ordem do evento."""
+        ordem = RepertorioService.musica_ids(evento)
+        musicas = Musica.objects.select_related("artista").in_bulk(ordem)
+        return [musicas[musica_id] for musica_id in ordem]
+
+    @staticmethod
+    def interpretar_tons(valor: str | None) -> dict[int, str]:
+        """``"12:A,15:Bb"`` -> ``{12: "A", 15: "Bb"}``; ValueError se inválido."""
+        tons = {}
+        for parte in filter(None, (valor or "").split(",")):
+            musica_id, _, tom = parte.partition(":")
+            if not musica_id.strip().isdigit() or not tom.strip():
+                raise ValueError(f"Parâmetro 'tons' inválido: {parte}")
+            tons[int(musica_id)] = tom.strip()
+        return tons
+
+    @staticmethod
+    def etag(evento: Evento, musicas: list[Musica], tons: dict[int, str]) -> str:
+        assinatura = hashlib.sha1()
+        assinatura.update(f"{evento.id}|{evento.nome}|{evento.data_evento}".encode())
+        for musica in musicas:
+            for valor in (
+                musica.id,
+                musica.titulo,
+                musica.artista.nome,
+                musica.tom,
+                musica.link_youtube,
+                musica.conteudo_cifra,
+                tons.get(musica.id),
+            ):
+                assinatura.update(f"\x1f{valor}".encode())
+        return assinatura.hexdigest()
+
+    @staticmethod
+    def corpo(evento: Evento, musicas: list[Musica], tons: dict[int, str]) -> bytes:
+        """JSON do pacote. Levanta ValueError se algum tom for inválido."""
+        itens = []
+        for musica in musicas:
+            itens.append(
+                {
+                    "id": musica.id,
+                    "titulo": musica.titulo,
+                    "artista": musica.artista.nome,
+                    "link_youtube": musica.link_youtube,
+                    **CifraService.cifra_no_tom(musica, tons.get(musica.id)),
+                }
+            )
+        dados = {
+            "evento": {
+                "id": evento.id,
+                "nome": evento.nome,
+                "data_evento": evento.data_evento,
+            },
+            "musicas": itens,
+        }
+        return json.dumps(dados, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+
+    @staticmethod
+    def obter(evento: Evento, tons: dict[int, str], codificacao: str) -> dict:
+        """
+        ``{"etag": str, "conteudo": bytes}`` do pacote já codificado
+        (``gzip``, ``br`` ou ``identity``), usando o cache quando possível.
+        """
+        musicas = SetlistService.repertorio(evento)
+        desconhecidas = set(tons) - {musica.id for musica in musicas}
+        if desconhecidas:
+            raise ValueError(f"Músicas fora do repertório: {sorted(desconhecidas)}")
+
+        versao = f"{SetlistService.etag(evento, musicas, tons)}-{codificacao}"
+        chave = f"{SetlistService.CACHE_PREFIXO}:{versao}"
+        conteudo = cache.get(chave)
+        if conteudo is None:
+            conteudo = SetlistService.codificar(
+                SetlistService.corpo(evento, musicas, tons), codificacao
+            )
+            cache.set(chave, conteudo, SetlistService.CACHE_TIMEOUT)
+        return {"etag": f'"{versao}"', "conteudo": conteudo}
+
+    # -------------------------
+    # HTTP
+    # -------------------------
+    @staticmethod
+    def negociar_codificacao(accept_encoding: str) -> str:
+        """Prefere brotli (se instalado), depois gzip; senão ``identity``."""
+        aceitas = {}
+        for parte in accept_encoding.split(","):
+            nome, _, parametros = parte.strip().partition(";")
+            qualidade = 1.0
+            if parametros.strip().startswith("q="):
+                try:
+                    qualidade = float(parametros.strip()[2:])
+                except ValueError:
+                    qualidade = 0.0
+            aceitas[nome.strip().lower()] = qualidade
+
+        if brotli is not None and aceitas.get("br", 0) > 0:
+            return "br"
+        if aceitas.get("gzip", aceitas.get("*", 0)) > 0:
+            return "gzip"
+        return "identity"
+
+    @staticmethod
+    def codificar(corpo: bytes, codificacao: str) -> bytes:
+        if codificacao == "br":
+            return brotli.compress(corpo)
+        if codificacao == "gzip":
+            return gzip.compress(corpo, mtime=0)
+        return corpo
+
+    @staticmethod
+    def intervalo(cabecalho: str | None, tamanho: int):
+        """
+        Interpreta ``Range: bytes=a-b`` (um único intervalo).
+        Retorna None (responder inteiro), ``(inicio, fim)`` inclusivo ou
+        False se o intervalo não puder ser atendido (416).
+        """
+        if not cabecalho:
+            return None
+        encontrado = SetlistService.RANGE.match(cabecalho.strip())
+        if encontrado is None:
+            # Múltiplos intervalos ou unidade desconhecida: ignora o Range
+            return None
+        inicio, fim = encontrado.groups()
+        if not inicio and not fim:
+            return None
+        if not inicio:
+            # bytes=-N: últimos N bytes
+            sufixo = int(fim)
+            if sufixo == 0:
+                return False
+            return max(0, tamanho - sufixo), tamanho - 1
+        inicio = int(inicio)
+        fim = min(int(fim), tamanho - 1) if fim else tamanho - 1
+        if inicio >= tamanho or fim < inicio:
+            return False
+        return inicio, fim
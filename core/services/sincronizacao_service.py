@@ -0,0 +1,230 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils.timezone import now
+
+from core.models import (
+    Artista,
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    Instrumento,
+    Musica,
+    RegistroAlteracao,
+)
+
+
+class SincronizacaoService:
+    """
+    Sincronização incremental (delta) para clientes offline-first.
+
+    Cada escrita em um modelo sincronizado gera um ``RegistroAlteracao``;
+    o cliente guarda o último ``id`` recebido (cursor) e pede apenas o que
+    mudou depois dele. Escritas em massa (``update()``/``bulk_create()``)
+    não disparam signals e precisam chamar ``registrar`` manualmente.
+
+    Os registros de uma transação são acumulados e gravados com um único
+    INSERT depois do commit dela, então a ordem dos ids acompanha a ordem
+    de commit, por mais longa que a transação seja. Resta a janela de um
+    INSERT concorrente (ids N e N+1 com commit invertido): só são entregues
+    registros com mais de ``ATRASO_COMMIT_SEGUNDOS`` e o cursor nunca passa
+    de um registro ainda recente. Registros com mais de
+    ``RETENCAO_DIAS`` são expurgados pelo comando
+    ``expurgar_registros_alteracao``; cursores anteriores a eles recebem
+    ``reset``. Configuração em ``settings.SGGM_SINCRONIZACAO``.
+    """
+
+    PADRAO = {"ATRASO_COMMIT_SEGUNDOS": 2, "RETENCAO_DIAS": 90}
+
+    # Modelo sincronizado -> chave do recurso na resposta de /api/sync/
+    RECURSOS = {
+        Evento: "eventos",
+        Escala: "escalas",
+        Musica: "musicas",
+        Artista: "artistas",
+        Instrumento: "instrumentos",
+        ComentarioPerformance: "comentarios",
+    }
+
+    # Registros processados por chamada; o cliente repete enquanto "mais"
+    LIMITE = 500
+
+    @staticmethod
+    def configuracao() -> dict:
+        return {
+            **SincronizacaoService.PADRAO,
+            **getattr(settings, "SGGM_SINCRONIZACAO", {}),
+        }
+
+    @staticmethod
+    def _limite_seguro():
+        """Registros gravados depois disso ainda não são entregues."""
+        atraso = SincronizacaoService.configuracao()["ATRASO_COMMIT_SEGUNDOS"]
+        return now() - timedelta(seconds=atraso)
+
+    @staticmethod
+    def registrar(instance, operacao="SALVO", relacionados=None):
+        """
+        Registra a alteração de uma instância de modelo sincronizado e, como
+        salvos, os objetos em ``relacionados`` ({modelo: ids}) cuja
+        representação a inclui.
+        """
+        recursos = SincronizacaoService.RECURSOS
+        registros = [(recursos[type(instance)], instance.pk, operacao)]
+        for modelo, ids in (relacionados or {}).items():
+            registros.extend((recursos[modelo], pk, "SALVO") for pk in ids)
+        SincronizacaoService._enfileirar(registros)
+
+    @staticmethod
+    def registrar_ids(modelo, ids, operacao="SALVO"):
+        """Versão em lote de ``registrar``."""
+        recurso = SincronizacaoService.RECURSOS[modelo]
+        SincronizacaoService._enfileirar([(recurso, pk, operacao) for pk in ids])
+
+    @staticmethod
+    def _enfileirar(registros):
+        """
+        Junta os registros ao lote da transação atual, gravado no commit.
+        Fora de transação, grava na hora.
+        """
+        conexao = transaction.get_connection()
+        if not conexao.in_atomic_block:
+            SincronizacaoService._gravar(registros)
+            return
+
+        # Se um savepoint for revertido, o Django descarta os callbacks dele
+        # e os registros vão junto. Serve o lote de um savepoint atual ou de
+        # um interno já liberado (o prefixo da chave é o savepoint atual)
+        chave = tuple(sid for sid in conexao.savepoint_ids if sid is not None)
+        for _, callback, _ in reversed(conexao.run_on_commit):
+            if (
+                isinstance(callback, _LoteRegistros)
+                and callback.chave[: len(chave)] == chave
+                and not callback.gravado
+            ):
+                callback.registros.extend(registros)
+                return
+        lote = _LoteRegistros(chave)
+        lote.registros.extend(registros)
+        transaction.on_commit(lote)
+
+    @staticmethod
+    def _gravar(registros):
+        # Só a última operação de cada objeto importa para o cliente
+        ultimas = {}
+        for recurso, objeto_id, operacao in registros:
+            ultimas.pop((recurso, objeto_id), None)
+            ultimas[(recurso, objeto_id)] = operacao
+        RegistroAlteracao.objects.bulk_create(
+            [
+                RegistroAlteracao(recurso=recurso, objeto_id=pk, operacao=operacao)
+                for (recurso, pk), operacao in ultimas.items()
+            ]
+        )
+
+    @staticmethod
+    def cursor_atual():
+        """Cursor para quem acabou de fazer a carga completa."""
+        seguros = RegistroAlteracao.objects.filter(
+            registrado_em__lte=SincronizacaoService._limite_seguro()
+        )
+        cursor = seguros.aggregate(cursor=Max("id"))["cursor"]
+        if cursor is None:
+            # Log vazio ou só com registros recentes: começa antes deles
+            primeiro = RegistroAlteracao.objects.aggregate(primeiro=Min("id"))
+            cursor = (primeiro["primeiro"] or 1) - 1
+        return cursor
+
+    @staticmethod
+    def expurgar(dias=None) -> int:
+        """
+        Remove os registros com mais de ``dias`` (padrão ``RETENCAO_DIAS``).
+        Remove sempre um prefixo do log (``id`` até o último registro antigo),
+        para que os cursores anteriores a ele sejam reconhecidos e resetados.
+        """
+        if dias is None:
+            dias = SincronizacaoService.configuracao()["RETENCAO_DIAS"]
+        corte = now() - timedelta(days=dias)
+        ultimo = RegistroAlteracao.objects.filter(registrado_em__lt=corte).aggregate(
+            ultimo=Max("id")
+        )["ultimo"]
+        if ultimo is None:
+            return 0
+        removidos, _ = RegistroAlteracao.objects.filter(id__lte=ultimo).delete()
+        return removidos
+
+    @staticmethod
+    def alteracoes_desde(cursor, limite=None):
+        """
+        Retorna as alterações posteriores ao cursor, já consolidadas: se o
+        mesmo objeto mudou várias vezes, vale a última operação.
+
+        Retorna None quando o cursor não pode ser atendido (anterior aos
+        registros já expurgados ou à frente do log) e o cliente precisa
+        refazer a carga completa.
+
+            {
+                "cursor": 1234,
+                "mais": False,
+                "alteracoes": {"eventos": {"salvos": [...], "removidos": [...]}, ...},
+            }
+        """
+        limite = limite or SincronizacaoService.LIMITE
+
+        limites = RegistroAlteracao.objects.aggregate(
+            primeiro=Min("id"), ultimo=Max("id")
+        )
+        primeiro, ultimo = limites["primeiro"], limites["ultimo"] or 0
+        if cursor > ultimo or (primeiro is not None and cursor < primeiro - 1):
+            return None
+
+        registros = list(
+            RegistroAlteracao.objects.filter(id__gt=cursor)
+            .order_by("id")
+            .values_list("id", "recurso", "objeto_id", "operacao", "registrado_em")[
+                : limite + 1
+            ]
+        )
+        mais = len(registros) > limite
+        registros = registros[:limite]
+
+        # Para no primeiro registro recente: um id menor ainda pode estar
+        # numa transação sem commit
+        seguro = SincronizacaoService._limite_seguro()
+        for posicao, registro in enumerate(registros):
+            if registro[4] > seguro:
+                registros, mais = registros[:posicao], False
+                break
+
+        ultima_operacao = {}
+        for _, recurso, objeto_id, operacao, _ in registros:
+            ultima_operacao[(recurso, objeto_id)] = operacao
+
+        alteracoes = {
+            recurso: {"salvos": [], "removidos": []}
+            for recurso in SincronizacaoService.RECURSOS.values()
+        }
+        for (recurso, objeto_id), operacao in ultima_operacao.items():
+            chave = "salvos" if operacao == "SALVO" else "removidos"
+            alteracoes[recurso][chave].append(objeto_id)
+
+        return {
+            "cursor": registros[-1][0] if registros else cursor,
+            "mais": mais,
+            "alteracoes": alteracoes,
+        }
+
+
+class _LoteRegistros:
+    """Registros de alteração acumulados numa transação, gravados no commit."""
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.registros = []
+        self.gravado = False
+
+    def __call__(self):
+        self.gravado = True
+        SincronizacaoService._gravar(self.registros)
@@ -1,8 +1,18 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from core.models import ComentarioPerformance, Musico
+from core.models import (
+    Artista,
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    Instrumento,
+    Musica,
+    Musico,
+    ReacaoComentario,
+)
 
 
 @receiver(post_save, sender=User)
@@ -20,19 +30,172 @@ def criar_perfil_musico(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=ComentarioPerformance)
 def notificar_escalados_feedback(sender, instance, created, **kwargs):
-    """Notifica escalados do evento quando um novo feedback é publicado."""
+    """
+    Notifica os escalados do evento quando um novo feedback é publicado:
+    uma única mensagem multicast, depois do commit (um comentário revertido
+    não gera notificação).
+    """
     if not created:
         return
 
     from core.services import NotificationService
 
-    escalados = instance.evento.escalas.select_related("musico").all()
-    tokens_musicos = [
-        e.musico for e in escalados if e.musico.fcm_token and e.musico != instance.autor
-    ]
+    transaction.on_commit(
+        lambda: NotificationService.enviar_notificacao_feedback_escalados(instance),
+        robust=True,
+    )
 
-    for musico in tokens_musicos:
-        NotificationService.enviar_notificacao_feedback(
-            musico=musico,
-            comentario=instance,
-        )
+
+@receiver(post_save, sender=ComentarioPerformance)
+def publicar_comentario_ao_vivo(sender, instance, created, **kwargs):
+    """Envia o novo comentário para quem acompanha o evento ao vivo (SSE)."""
+    if not created:
+        return
+
+    from core.pubsub import publicar_evento
+
+    publicar_evento(
+        instance.evento_id,
+        "comentario",
+        {
+            "id": instance.id,
+            "musica_id": instance.musica_id,
+            "autor_id": instance.autor_id,
+            "autor_nome": instance.autor.nome if instance.autor else None,
+            "texto": instance.texto,
+            "criado_em": instance.criado_em,
+        },
+    )
+
+
+# -------------------------
+# AGENDA (.ics) — invalidação do cache
+# -------------------------
+@receiver(post_save, sender=Escala)
+@receiver(post_delete, sender=Escala)
+def invalidar_agenda_escala(sender, instance, **kwargs):
+    """Descarta o feed .ics do músico quando uma escala dele muda."""
+    from core.services import AgendaService
+
+    AgendaService.invalidar(instance.musico_id)
+
+
+@receiver(m2m_changed, sender=Escala.instrumentos.through)
+def invalidar_agenda_instrumentos(sender, instance, action, **kwargs):
+    """Instrumentos aparecem na descrição do evento no calendário."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, Escala):
+        from core.services import AgendaService
+
+        AgendaService.invalidar(instance.musico_id)
+
+
+@receiver(post_save, sender=Evento)
+def invalidar_agenda_evento(sender, instance, created, **kwargs):
+    """Descarta o feed .ics de todos os escalados quando o evento muda."""
+    if created:
+        return
+
+    from core.services import AgendaService
+
+    musico_ids = Escala.objects.filter(evento=instance).values_list(
+        "musico_id", flat=True
+    )
+    AgendaService.invalidar(*musico_ids)
+
+
+# -------------------------
+# AUTENTICAÇÃO — versão das credenciais do token
+# -------------------------
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidar_versao_usuario(sender, instance, **kwargs):
+    """Senha, status ou superusuário podem ter mudado."""
+    from core.api.authentication import invalidar_versao
+
+    invalidar_versao(instance.pk)
+
+
+@receiver(post_save, sender=Musico)
+@receiver(post_delete, sender=Musico)
+def invalidar_versao_musico(sender, instance, **kwargs):
+    """O papel (tipo_usuario) do músico vai nas claims do token."""
+    if instance.user_id:
+        from core.api.authentication import invalidar_versao
+
+        invalidar_versao(instance.user_id)
+
+
+# -------------------------
+# SINCRONIZAÇÃO — log de alterações (/api/sync/)
+# -------------------------
+MODELOS_SINCRONIZADOS = (
+    Evento,
+    Escala,
+    Musica,
+    Artista,
+    Instrumento,
+    ComentarioPerformance,
+)
+
+
+def registrar_alteracao_salva(sender, instance, **kwargs):
+    from core.services import SincronizacaoService
+
+    # A escala aparece aninhada no evento
+    relacionados = {Evento: [instance.evento_id]} if sender is Escala else None
+    SincronizacaoService.registrar(instance, "SALVO", relacionados)
+
+
+def registrar_alteracao_removida(sender, instance, **kwargs):
+    from core.services import SincronizacaoService
+
+    # Em cascata o evento é removido depois e o tombstone dele prevalece
+    relacionados = {Evento: [instance.evento_id]} if sender is Escala else None
+    SincronizacaoService.registrar(instance, "REMOVIDO", relacionados)
+
+
+for _modelo in MODELOS_SINCRONIZADOS:
+    post_save.connect(
+        registrar_alteracao_salva,
+        sender=_modelo,
+        dispatch_uid=f"sync_salvo_{_modelo._meta.model_name}",
+    )
+    post_delete.connect(
+        registrar_alteracao_removida,
+        sender=_modelo,
+        dispatch_uid=f"sync_removido_{_modelo._meta.model_name}",
+    )
+
+
+@receiver(m2m_changed, sender=Evento.repertorio.through)
+def registrar_alteracao_repertorio(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mudanças no repertório alteram a representação do evento."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    from core.services import SincronizacaoService
+
+    if not reverse:
+        SincronizacaoService.registrar(instance, "SALVO")
+    elif pk_set:
+        # musica.eventos.add(...): pk_set contém ids de eventos
+        SincronizacaoService.registrar_ids(Evento, pk_set, "SALVO")
+
+
+@receiver(m2m_changed, sender=Escala.instrumentos.through)
+def registrar_alteracao_instrumentos(sender, instance, action, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, Escala):
+        registrar_alteracao_salva(Escala, instance)
+
+
+@receiver(post_save, sender=ReacaoComentario)
+@receiver(post_delete, sender=ReacaoComentario)
+def registrar_alteracao_reacao(sender, instance, **kwargs):
+    """O total de reações faz parte da representação do comentário."""
+    from core.services import SincronizacaoService
+
+    SincronizacaoService.registrar_ids(ComentarioPerformance, [instance.comentario_id])
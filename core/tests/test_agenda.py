@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Escala, Evento, Instrumento, Musico
+from core.services import AgendaService
+
+
+class AgendaIcsAPITest(APITestCase):
+    """Testes do feed iCalendar de escalas por músico."""
+
+    def setUp(self):
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username="erickson", email="e@e.com", password="testpass123"
+        )
+        self.instrumento = Instrumento.objects.create(nome="Baixo")
+        self.musico = Musico.objects.create(
+            user=self.user, nome="Erickson", status="ATIVO"
+        )
+        self.evento = Evento.objects.create(
+            nome="Culto de Domingo",
+            data_evento=timezone.now() + timedelta(days=3),
+            data_hora_ensaio=timezone.now() + timedelta(days=2),
+            local="Igreja Central, Sala 2",
+        )
+        self.escala = Escala.objects.create(musico=self.musico, evento=self.evento)
+        self.escala.instrumentos.set([self.instrumento])
+
+        self.token = AgendaService.gerar_token(self.musico.id)
+        self.url = reverse("musico-agenda-ics", kwargs={"pk": self.musico.id})
+
+    def _get(self, **extra):
+        return self.client.get(self.url, {"token": self.token}, **extra)
+
+    def test_feed_retorna_calendario_com_evento_e_ensaio(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/calendar"))
+        self.assertIn("ETag", response)
+
+        conteudo = response.content.decode()
+        self.assertIn("BEGIN:VCALENDAR", conteudo)
+        self.assertIn(f"UID:escala-{self.escala.id}@sggm", conteudo)
+        self.assertIn(f"UID:ensaio-{self.escala.id}@sggm", conteudo)
+        self.assertIn("LOCATION:Igreja Central\\, Sala 2", conteudo)
+
+    def test_token_invalido_retorna_404(self):
+        response = self.client.get(self.url, {"token": "invalido"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_if_none_match_retorna_304_sem_consultas(self):
+        etag = self._get()["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_datas_em_utc_sem_tzid(self):
+        # 19h em São Paulo (UTC-3, TIME_ZONE dos testes) = 22h UTC
+        Evento.objects.filter(pk=self.evento.pk).update(
+            data_evento=datetime(2099, 6, 7, 19, 0)
+        )
+
+        conteudo = self._get().content.decode()
+
+        self.assertIn("DTSTART:20990607T220000Z", conteudo)
+        self.assertNotIn("TZID", conteudo)
+        self.assertRegex(conteudo, r"DTSTAMP:\d{8}T\d{6}Z\r\n")
+
+    def test_confirmar_escala_invalida_cache(self):
+        etag = self._get()["ETag"]
+
+        self.escala.confirmado = True
+        self.escala.save()
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("STATUS:CONFIRMED", response.content.decode())
+
+    def test_alterar_evento_invalida_cache(self):
+        self._get()
+
+        self.evento.nome = "Culto de Santa Ceia"
+        self.evento.save()
+
+        self.assertIn("SUMMARY:Culto de Santa Ceia", self._get().content.decode())
+
+    def test_endpoint_agenda_retorna_url_assinada(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(
+            reverse("musico-agenda", kwargs={"pk": self.musico.id})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["token"], self.token)
+        self.assertIn(f"agenda.ics?token={self.token}", response.data["url"])
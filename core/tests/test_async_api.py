@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.api.serializers import MyTokenObtainPairSerializer
+from core.models import (
+    Artista,
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    Instrumento,
+    Musica,
+    Musico,
+    ReacaoComentario,
+)
+
+
+class AsyncReadAPITest(TestCase):
+    """Testes das views assíncronas de leitura (ORM async)."""
+
+    def setUp(self):
+        self.instrumento = Instrumento.objects.create(nome="Violão")
+
+        self.user = User.objects.create_user(username="musico", password="123")
+        self.musico = Musico.objects.create(
+            user=self.user,
+            nome="Músico",
+            status="ATIVO",
+            instrumento_principal=self.instrumento,
+        )
+        self.user_lider = User.objects.create_user(username="lider", password="123")
+        self.lider = Musico.objects.create(
+            user=self.user_lider, nome="Líder", status="ATIVO", tipo_usuario="LIDER"
+        )
+
+        artista = Artista.objects.create(nome="Aline Barros")
+        self.musica = Musica.objects.create(titulo="Ressuscita-me", artista=artista)
+
+        self.evento = Evento.objects.create(
+            nome="Culto Futuro",
+            data_evento=timezone.now() + timedelta(days=2),
+            local="Igreja",
+        )
+        self.evento.repertorio.add(self.musica)
+        self.evento_passado = Evento.objects.create(
+            nome="Culto Passado",
+            data_evento=timezone.now() - timedelta(days=2),
+            local="Igreja",
+        )
+        self.evento_passado.repertorio.add(self.musica)
+
+        escala = Escala.objects.create(musico=self.musico, evento=self.evento)
+        escala.instrumentos.set([self.instrumento])
+        Escala.objects.create(musico=self.lider, evento=self.evento)
+
+        self.comentario = ComentarioPerformance.objects.create(
+            evento=self.evento_passado,
+            musica=self.musica,
+            autor=self.musico,
+            texto="Ótima introdução",
+        )
+        ReacaoComentario.objects.create(comentario=self.comentario, musico=self.lider)
+
+    def _auth(self, user):
+        token = RefreshToken.for_user(user).access_token
+        return {"AUTHORIZATION": f"Bearer {token}"}
+
+    async def test_sem_token_retorna_401(self):
+        response = await self.async_client.get(reverse("async-musico-me"))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_token_invalido_retorna_401(self):
+        response = await self.async_client.get(
+            reverse("async-musico-me"), headers={"AUTHORIZATION": "Bearer invalido"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_da_api_usa_claims_e_revogacao(self):
+        token = MyTokenObtainPairSerializer.get_token(self.user).access_token
+        headers = {"AUTHORIZATION": f"Bearer {token}"}
+
+        response = self.client.get(reverse("async-escala-list"), headers=headers)
+        self.assertEqual(response.json()["count"], 1)
+        me = self.client.get(reverse("async-musico-me"), headers=headers)
+        self.assertEqual(me.json()["instrumento_principal_nome"], "Violão")
+
+        # Trocar a senha revoga o token também no caminho assíncrono
+        self.user.set_password("nova")
+        self.user.save()
+        response = self.client.get(reverse("async-escala-list"), headers=headers)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_me_retorna_perfil(self):
+        response = await self.async_client.get(
+            reverse("async-musico-me"), headers=self._auth(self.user)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["nome"], "Músico")
+        self.assertEqual(response.json()["instrumento_principal_nome"], "Violão")
+
+    async def test_proximos_lista_apenas_futuros(self):
+        response = await self.async_client.get(
+            reverse("async-evento-proximos"), headers=self._auth(self.user)
+        )
+        dados = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([e["nome"] for e in dados], ["Culto Futuro"])
+        self.assertEqual(dados[0]["total_escalas"], 2)
+        self.assertEqual(dados[0]["repertorio"][0]["artista_nome"], "Aline Barros")
+
+    async def test_musico_comum_ve_apenas_proprias_escalas(self):
+        response = await self.async_client.get(
+            reverse("async-escala-list"), headers=self._auth(self.user)
+        )
+        dados = response.json()
+        self.assertEqual(dados["count"], 1)
+        self.assertEqual(dados["results"][0]["musico"], self.musico.id)
+        self.assertEqual(dados["results"][0]["instrumento_nome"], "Violão")
+
+    async def test_lider_filtra_escalas_por_musico(self):
+        response = await self.async_client.get(
+            reverse("async-escala-list"),
+            {"musico": self.lider.id},
+            headers=self._auth(self.user_lider),
+        )
+        dados = response.json()
+        self.assertEqual(dados["count"], 1)
+        self.assertEqual(dados["results"][0]["musico"], self.lider.id)
+
+    async def test_filtro_invalido_retorna_400(self):
+        response = await self.async_client.get(
+            reverse("async-escala-list"),
+            {"musico": "abc"},
+            headers=self._auth(self.user),
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_escalas_iguais_a_api_sincrona(self):
+        Escala.objects.create(musico=self.lider, evento=self.evento_passado)
+        Escala.objects.create(musico=self.musico, evento=self.evento_passado)
+        sincrono = APIClient()
+        sincrono.force_authenticate(user=self.user_lider)
+
+        for filtro in ({}, {"musico": self.lider.id}):
+            assincrona = self.client.get(
+                reverse("async-escala-list"),
+                filtro,
+                headers=self._auth(self.user_lider),
+            ).json()
+            sincrona = sincrono.get(reverse("escala-list"), filtro).json()
+
+            self.assertEqual(assincrona["count"], sincrona["count"])
+            self.assertEqual(
+                [e["id"] for e in assincrona["results"]],
+                [e["id"] for e in sincrona["results"]],
+            )
+        self.assertEqual(sincrona["count"], 2)
+        self.assertEqual(
+            [e["evento"] for e in sincrona["results"]],
+            [self.evento.id, self.evento_passado.id],
+        )
+
+    async def test_comentarios_por_evento_com_reacoes(self):
+        response = await self.async_client.get(
+            reverse("async-comentario-list"),
+            {"evento": self.evento_passado.id},
+            headers=self._auth(self.user_lider),
+        )
+        resultado = response.json()["results"][0]
+        self.assertEqual(resultado["total_reacoes"], 1)
+        self.assertTrue(resultado["eu_curto"])
+        self.assertTrue(resultado["pode_editar"])
@@ -0,0 +1,96 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.api.authentication import JWTAutenticacaoPorClaims
+from core.api.permissions import IsLiderOrReadOnly, IsMusicoOwnerOrLider
+from core.api.serializers import MyTokenObtainPairSerializer
+from core.models import Musico
+
+
+class JWTAutenticacaoPorClaimsTest(TestCase):
+    """Testes da autenticação JWT montada a partir das claims."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="lider", password="123")
+        self.lider = Musico.objects.create(
+            user=self.user, nome="Líder", tipo_usuario="LIDER"
+        )
+
+    def _token(self, user=None):
+        refresh = MyTokenObtainPairSerializer.get_token(user or self.user)
+        return str(refresh.access_token)
+
+    def _request(self, token, metodo="post"):
+        django_request = getattr(APIRequestFactory(), metodo)(
+            "/api/eventos/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        return Request(django_request)
+
+    def _autenticar(self, request):
+        user, _ = JWTAutenticacaoPorClaims().authenticate(request)
+        request.user = user
+        return user
+
+    def test_permissoes_sem_consultas_ao_banco(self):
+        token = self._token()
+        # Primeira requisição confere a versão no banco e guarda em cache
+        self._autenticar(self._request(token))
+
+        request = self._request(token)
+        with self.assertNumQueries(0):
+            user = self._autenticar(request)
+            self.assertTrue(IsLiderOrReadOnly().has_permission(request, None))
+            self.assertTrue(IsMusicoOwnerOrLider().has_permission(request, None))
+            self.assertTrue(user.musico.is_lider())
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.musico.pk, self.lider.pk)
+        # Campos fora do token são carregados sob demanda
+        self.assertEqual(user.musico.nome, "Líder")
+
+    def test_usuario_sem_musico(self):
+        user = User.objects.create_user(username="avulso", password="123")
+        token = self._token(user)
+        self._autenticar(self._request(token))
+
+        request = self._request(token)
+        with self.assertNumQueries(0):
+            autenticado = self._autenticar(request)
+            self.assertFalse(hasattr(autenticado, "musico"))
+            self.assertFalse(IsLiderOrReadOnly().has_permission(request, None))
+
+    def test_troca_de_senha_revoga_token(self):
+        token = self._token()
+
+        self.user.set_password("nova")
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar(self._request(token))
+
+    def test_mudanca_de_papel_revoga_token(self):
+        token = self._token()
+        self._autenticar(self._request(token))
+
+        self.lider.tipo_usuario = "MUSICO"
+        self.lider.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar(self._request(token))
+        # Novo login traz o papel atualizado
+        user = self._autenticar(self._request(self._token()))
+        self.assertFalse(user.musico.is_lider())
+
+    def test_token_sem_versao_usa_o_banco(self):
+        token = str(AccessToken.for_user(self.user))
+
+        user = self._autenticar(self._request(token))
+
+        self.assertEqual(user.musico.nome, "Líder")
+        self.assertTrue(user.musico.is_lider())
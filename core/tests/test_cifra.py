@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Artista, Musica, Musico
+from core.services import CifraService
+from core.services.cifra_service import _tokenizar
+
+CIFRA = (
+    "{title: Digno}\n"
+    "G       D/F#    Em   C\n"
+    "Santo, santo é o Senhor\n"
+    "[G]Digno [D/F#]és, [Em7]Senhor [Refrão]\n"
+    "C  G | (2x)"
+)
+
+
+class CifraServiceTest(SimpleTestCase):
+    """Testes do transpositor de cifras."""
+
+    def test_transpoe_chordpro_e_acordes_sobre_a_letra(self):
+        transposta = CifraService.transpor(CIFRA, (7, False), 9)
+
+        self.assertEqual(
+            transposta.splitlines(),
+            [
+                "{title: Digno}",
+                "A       E/G#    F#m  D",
+                "Santo, santo é o Senhor",
+                "[A]Digno [E/G#]és, [F#m7]Senhor [Refrão]",
+                "D  A | (2x)",
+            ],
+        )
+
+    def test_tom_com_bemois_usa_bemois(self):
+        transposta = CifraService.transpor(CIFRA, (7, False), 5)
+
+        self.assertIn("F       C/E     Dm   Bb", transposta)
+
+    def test_acorde_maior_empurra_o_seguinte_sem_colar(self):
+        transposta = CifraService.transpor("E F\nletra", (4, False), 6)
+
+        self.assertEqual(transposta.splitlines()[0], "F# G")
+
+    def test_linha_de_letra_nao_vira_acorde(self):
+        self.assertEqual(CifraService.transpor("A graça", (9, False), 0), "A graça")
+
+    def test_tokeniza_uma_vez_por_conteudo(self):
+        conteudo = CIFRA + "\nlinha única deste teste"
+        CifraService.transpor(conteudo, (7, False), 2)
+        antes = _tokenizar.cache_info()
+
+        CifraService.transpor(conteudo, (7, False), 4)
+
+        depois = _tokenizar.cache_info()
+        self.assertEqual(depois.misses, antes.misses)
+        self.assertEqual(depois.hits, antes.hits + 1)
+
+    def test_interpreta_tom(self):
+        self.assertEqual(CifraService.interpretar_tom("f#m"), (6, True))
+        self.assertEqual(CifraService.interpretar_tom("Bb"), (10, False))
+        self.assertIsNone(CifraService.interpretar_tom("H"))
+
+
+class CifraAPITest(APITestCase):
+    """Testes do endpoint GET /api/musicas/{id}/cifra/."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="musico", password="123")
+        Musico.objects.create(user=self.user, nome="Músico")
+        artista = Artista.objects.create(nome="Aline Barros")
+        self.musica = Musica.objects.create(
+            titulo="Digno", artista=artista, tom="G", conteudo_cifra=CIFRA
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_transpoe_para_o_tom_pedido(self):
+        response = self.client.get(
+            reverse("musica-cifra", args=[self.musica.id]), {"tom": "A"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tom_original"], "G")
+        self.assertEqual(response.data["tom"], "A")
+        self.assertIn("[A]Digno", response.data["conteudo_cifra"])
+
+    def test_tom_invalido(self):
+        response = self.client.get(
+            reverse("musica-cifra", args=[self.musica.id]), {"tom": "X#"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
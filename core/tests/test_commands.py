@@ -0,0 +1,169 @@
+import json
+import tempfile
+from datetime import date, time, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import (
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    LembreteEnviado,
+    Musica,
+    Musico,
+    SerieEvento,
+)
+
+
+class SeedBenchmarkCommandTest(TestCase):
+    """Testes do gerador de dados sintéticos."""
+
+    def _seed(self, *args):
+        call_command(
+            "seed_benchmark",
+            "--force",
+            "--musicos=5",
+            "--eventos=10",
+            "--musicas=8",
+            "--artistas=2",
+            "--escalas-por-evento=3",
+            *args,
+            stdout=StringIO(),
+        )
+
+    def test_gera_volume_solicitado(self):
+        self._seed()
+
+        self.assertEqual(Musico.objects.count(), 5)
+        self.assertEqual(Evento.objects.count(), 10)
+        self.assertEqual(Escala.objects.count(), 30)
+        self.assertTrue(Musica.objects.exclude(conteudo_cifra="").exists())
+        # Comentários apenas nos eventos que já aconteceram
+        self.assertEqual(ComentarioPerformance.objects.count(), 5 * 3)
+
+    def test_prefixo_existente_exige_limpeza(self):
+        self._seed()
+
+        with self.assertRaises(CommandError):
+            self._seed()
+
+        self._seed("--limpar")
+        self.assertFalse(Evento.objects.exists())
+        self.assertFalse(Musico.objects.exists())
+
+
+class ImportarMusicosCommandTest(TestCase):
+    """Testes do comando de importação de músicos."""
+
+    def test_importa_arquivo_json(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = Path(diretorio, "musicos.json")
+            arquivo.write_text(
+                json.dumps(
+                    [
+                        {"nome": "Ana", "email": "ana@igreja.com"},
+                        {"nome": "Sem email"},
+                    ]
+                )
+            )
+            erros = StringIO()
+
+            call_command(
+                "importar_musicos", str(arquivo), stdout=StringIO(), stderr=erros
+            )
+
+        self.assertTrue(Musico.objects.filter(user__username="ana").exists())
+        self.assertIn("Linha 2", erros.getvalue())
+
+
+class GerarEventosRecorrentesCommandTest(TestCase):
+    """Testes do comando de geração das séries recorrentes."""
+
+    def test_estende_series_ativas(self):
+        ativa = SerieEvento.objects.create(
+            nome="Culto",
+            local="Templo",
+            dia_semana=6,
+            horario=time(19),
+            data_inicio=date.today(),
+        )
+        SerieEvento.objects.create(
+            nome="Antiga",
+            local="Templo",
+            dia_semana=6,
+            horario=time(9),
+            data_inicio=date.today(),
+            ativa=False,
+        )
+
+        call_command("gerar_eventos_recorrentes", "--dias", "14", stdout=StringIO())
+
+        self.assertEqual(Evento.objects.count(), ativa.eventos.count())
+        self.assertIn(ativa.eventos.count(), (2, 3))
+
+
+class EnviarLembretesCommandTest(TestCase):
+    """Testes do comando do agendador de lembretes."""
+
+    @patch(
+        "core.services.notification_service.NotificationService"
+        "._ensure_firebase_initialized",
+        return_value=True,
+    )
+    @patch("core.services.notification_service.messaging")
+    def test_rodada_unica(self, messaging, _firebase):
+        musico = Musico.objects.create(
+            user=User.objects.create_user(username="ana", password="123"),
+            nome="Ana",
+            fcm_token="token-ana",
+        )
+        evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now() + timedelta(hours=24, minutes=2)
+        )
+        Escala.objects.create(musico=musico, evento=evento)
+        saida = StringIO()
+
+        call_command("enviar_lembretes", stdout=saida)
+
+        self.assertIn("1 lembretes de evento", saida.getvalue())
+        self.assertTrue(LembreteEnviado.objects.filter(tipo="EVENTO").exists())
+        messaging.send_each_for_multicast.assert_called_once()
+
+
+class BenchmarkApiCommandTest(TestCase):
+    """Testes do runner de benchmark das rotas da API."""
+
+    def test_mede_todas_as_rotas_get(self):
+        call_command(
+            "seed_benchmark",
+            "--force",
+            "--musicos=3",
+            "--eventos=4",
+            "--musicas=4",
+            "--escalas-por-evento=2",
+            stdout=StringIO(),
+        )
+        saida = StringIO()
+
+        call_command("benchmark_api", "--repeticoes=1", stdout=saida)
+
+        resultado = json.loads(saida.getvalue())
+        self.assertIn("evento-list", resultado)
+        self.assertIn("async-escala-list", resultado)
+        self.assertNotIn("async-evento-stream", resultado)
+        self.assertEqual(
+            resultado["evento-detail"]["url"],
+            f"/api/eventos/{Evento.objects.latest('id').id}/",
+        )
+        # As views assíncronas autenticam pelo JWT do líder gerado
+        escalas = resultado["async-escala-list"]
+        self.assertEqual(escalas["status"], 200)
+        self.assertGreater(escalas["consultas"], 0)
+        self.assertGreater(escalas["bytes"], 0)
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Escala, Evento, Musico, RegistroAlteracao
+from core.services import AgendaService
+
+
+@patch(
+    "core.services.notification_service.NotificationService"
+    "._ensure_firebase_initialized",
+    return_value=True,
+)
+@patch("core.services.notification_service.messaging")
+class ConfirmarLoteAPITest(APITestCase):
+    """Testes de POST /api/escalas/confirmar_lote/."""
+
+    url = reverse("escala-confirmar-lote")
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="ana", password="123")
+        self.musico = Musico.objects.create(user=self.user, nome="Ana")
+        outro = Musico.objects.create(
+            user=User.objects.create_user(username="bia", password="123"), nome="Bia"
+        )
+        for nome in ("Lider 1", "Lider 2"):
+            Musico.objects.create(
+                user=User.objects.create_user(username=nome, password="123"),
+                nome=nome,
+                tipo_usuario="LIDER",
+                fcm_token=f"token-{nome}",
+            )
+
+        self.escalas = []
+        for dias in range(1, 4):
+            evento = Evento.objects.create(
+                nome=f"Culto {dias}", data_evento=timezone.now() + timedelta(days=dias)
+            )
+            self.escalas.append(
+                Escala.objects.create(musico=self.musico, evento=evento).id
+            )
+        self.escala_outro = Escala.objects.create(musico=outro, evento=evento).id
+        self.client.force_authenticate(user=self.user)
+
+    def test_confirma_com_um_update_e_uma_notificacao(self, messaging, _firebase):
+        messaging.send_each_for_multicast.return_value = Mock(
+            success_count=2, failure_count=0
+        )
+
+        # Verificação e UPDATE (com savepoint) e tokens dos líderes; o log de
+        # sincronização é gravado no commit
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                self.url, {"escalas": self.escalas, "confirmado": True}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["escalas_alteradas"], self.escalas)
+        self.assertEqual(
+            Escala.objects.filter(confirmado=True).count(), len(self.escalas)
+        )
+        messaging.send_each_for_multicast.assert_called_once()
+        _, kwargs = messaging.MulticastMessage.call_args
+        self.assertCountEqual(kwargs["tokens"], ["token-Lider 1", "token-Lider 2"])
+
+        # Repetir não altera nada nem notifica de novo
+        repetida = self.client.post(
+            self.url, {"escalas": self.escalas, "confirmado": True}, format="json"
+        )
+        self.assertEqual(repetida.data["escalas_alteradas"], [])
+        messaging.send_each_for_multicast.assert_called_once()
+
+    def test_registra_sincronizacao_e_invalida_agenda(self, messaging, _firebase):
+        AgendaService.obter_feed(self.musico.id)
+        self.assertIsNotNone(cache.get(AgendaService._chave(self.musico.id)))
+        RegistroAlteracao.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {"escalas": self.escalas[:2]}, format="json")
+
+        self.assertIsNone(cache.get(AgendaService._chave(self.musico.id)))
+        registros = set(
+            RegistroAlteracao.objects.values_list("recurso", "objeto_id", "operacao")
+        )
+        eventos = Escala.objects.filter(id__in=self.escalas[:2]).values_list(
+            "evento_id", flat=True
+        )
+        self.assertEqual(
+            registros,
+            {("escalas", i, "SALVO") for i in self.escalas[:2]}
+            | {("eventos", i, "SALVO") for i in eventos},
+        )
+
+    def test_escala_de_outro_musico_nao_altera_nenhuma(self, messaging, _firebase):
+        response = self.client.post(
+            self.url,
+            {"escalas": [*self.escalas, self.escala_outro]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Escala.objects.filter(confirmado=True).exists())
+        messaging.send_each_for_multicast.assert_not_called()
+
+    def test_lider_confirma_de_qualquer_musico(self, messaging, _firebase):
+        self.client.force_authenticate(user=User.objects.get(username="Lider 1"))
+
+        response = self.client.post(
+            self.url, {"escalas": [self.escala_outro]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Escala.objects.get(id=self.escala_outro).confirmado)
+        # O próprio líder não é notificado
+        _, kwargs = messaging.MulticastMessage.call_args
+        self.assertEqual(kwargs["tokens"], ["token-Lider 2"])
+
+    def test_ids_invalidos(self, messaging, _firebase):
+        for corpo in ({"escalas": []}, {"escalas": ["1"]}, {"escalas": [999]}):
+            response = self.client.post(self.url, corpo, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
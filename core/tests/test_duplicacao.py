@@ -0,0 +1,127 @@
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Artista, Escala, Evento, Instrumento, Musica, Musico
+from core.services import RepertorioService
+
+
+class DuplicarEventoAPITest(APITestCase):
+    """Testes do endpoint POST /api/eventos/{id}/duplicar/."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lider", password="123")
+        self.lider = Musico.objects.create(
+            user=self.user, nome="Líder", tipo_usuario="LIDER"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        agora = timezone.now().replace(microsecond=0)
+        self.evento = Evento.objects.create(
+            nome="Culto de Domingo",
+            data_evento=agora - timedelta(days=3),
+            data_hora_ensaio=agora - timedelta(days=4),
+            local="Templo",
+        )
+        self.nova_data = agora + timedelta(days=4)
+        self.violao = Instrumento.objects.create(nome="Violão")
+        artista = Artista.objects.create(nome="Aline Barros")
+        self.musicas = [
+            Musica.objects.create(titulo=f"Música {i}", artista=artista).id
+            for i in range(3)
+        ]
+        RepertorioService.adicionar(self.evento, self.musicas[::-1])
+        self._escalar(2)
+        self.url = reverse("evento-duplicar", args=[self.evento.id])
+
+    def _escalar(self, quantidade):
+        inicio = Musico.objects.count()
+        for i in range(quantidade):
+            musico = Musico.objects.create(nome=f"Músico {inicio + i}")
+            escala = Escala.objects.create(musico=musico, evento=self.evento)
+            escala.instrumentos.add(self.violao)
+
+    def _duplicar(self, **dados):
+        return self.client.post(
+            self.url, {"data_evento": self.nova_data.isoformat(), **dados}
+        )
+
+    def test_copia_repertorio_escalas_e_instrumentos(self):
+        response = self._duplicar()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        novo = Evento.objects.get(id=response.data["id"])
+        self.assertEqual(novo.data_evento, self.nova_data)
+        # Mesma antecedência do ensaio
+        self.assertEqual(novo.data_hora_ensaio, self.nova_data - timedelta(days=1))
+        self.assertEqual(
+            [musica.id for musica in novo.musicas_em_ordem()], self.musicas[::-1]
+        )
+        self.assertEqual(response.data["escalas_copiadas"], 2)
+        self.assertEqual(
+            Escala.instrumentos.through.objects.filter(escala__evento=novo).count(), 2
+        )
+
+    def test_pula_musico_indisponivel_na_nova_data(self):
+        afastado = Escala.objects.filter(evento=self.evento).first().musico
+        Musico.objects.filter(pk=afastado.pk).update(
+            status="AFASTADO",
+            data_inicio_inatividade=self.nova_data.date() - timedelta(days=1),
+            data_fim_inatividade=self.nova_data.date() + timedelta(days=1),
+        )
+
+        response = self._duplicar()
+
+        self.assertEqual(response.data["escalas_copiadas"], 1)
+        self.assertEqual(
+            response.data["musicos_indisponiveis"],
+            [{"musico_id": afastado.id, "nome": afastado.nome}],
+        )
+        self.assertFalse(
+            Escala.objects.filter(
+                evento_id=response.data["id"], musico=afastado
+            ).exists()
+        )
+
+    def test_consultas_constantes_com_a_equipe(self):
+        with CaptureQueriesContext(connection) as pequena:
+            self._duplicar()
+        self._escalar(8)
+        with CaptureQueriesContext(connection) as grande:
+            self._duplicar(data_evento=(self.nova_data + timedelta(days=7)).isoformat())
+
+        self.assertEqual(len(pequena.captured_queries), len(grande.captured_queries))
+
+    def test_data_obrigatoria_e_futura(self):
+        self.assertEqual(
+            self.client.post(self.url, {}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        response = self._duplicar(
+            data_evento=(timezone.now() - timedelta(days=1)).isoformat()
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_aceita_data_em_utc(self):
+        # Formato do toIso8601String() do Dart/JS para datas em UTC
+        utc = timezone.make_aware(self.nova_data).astimezone(dt_timezone.utc)
+        data_z = utc.isoformat().replace("+00:00", "Z")
+
+        response = self._duplicar(data_evento=data_z)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        novo = Evento.objects.get(id=response.data["id"])
+        # Como em POST /api/eventos/ (DateTimeField do DRF)
+        self.assertEqual(novo.data_evento, utc.replace(tzinfo=None))
+
+    def test_musico_comum_nao_duplica(self):
+        self.lider.tipo_usuario = "MUSICO"
+        self.lider.save()
+
+        self.assertEqual(self._duplicar().status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import (
+    Artista,
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    Instrumento,
+    Musica,
+    Musico,
+    ReacaoComentario,
+)
+
+
+class IdempotenciaAPITest(APITestCase):
+    """Testes do cabeçalho Idempotency-Key nos POSTs do app."""
+
+    def setUp(self):
+        cache.clear()
+        self.instrumento = Instrumento.objects.create(nome="Baixo")
+        self.user = User.objects.create_user(username="lider", password="123")
+        self.lider = Musico.objects.create(
+            user=self.user,
+            nome="Líder",
+            tipo_usuario="LIDER",
+            instrumento_principal=self.instrumento,
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now() - timedelta(hours=2)
+        )
+        musica = Musica.objects.create(
+            titulo="Oceans", artista=Artista.objects.create(nome="Hillsong")
+        )
+        self.evento.repertorio.add(musica)
+        self.comentario = ComentarioPerformance.objects.create(
+            evento=self.evento, musica=musica, autor=self.lider, texto="Boa!"
+        )
+        self.url_reagir = reverse(
+            "comentarioperformance-reagir", args=[self.comentario.id]
+        )
+
+    def test_repeticao_de_reacao_nao_desfaz_a_curtida(self):
+        primeira = self.client.post(self.url_reagir, HTTP_IDEMPOTENCY_KEY="r-1")
+
+        with self.assertNumQueries(0):
+            repetida = self.client.post(self.url_reagir, HTTP_IDEMPOTENCY_KEY="r-1")
+
+        self.assertEqual(repetida.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(repetida.data, primeira.data)
+        self.assertEqual(repetida["Idempotent-Replayed"], "true")
+        self.assertEqual(ReacaoComentario.objects.count(), 1)
+
+        # Chave nova é uma nova ação: desfaz a curtida
+        nova = self.client.post(self.url_reagir, HTTP_IDEMPOTENCY_KEY="r-2")
+        self.assertEqual(nova.data["status"], "removida")
+
+    def test_mesma_chave_com_outro_corpo(self):
+        url = reverse("escala-list")
+        dados = {
+            "musico": self.lider.id,
+            "evento": self.evento.id,
+            "instrumentos": [self.instrumento.id],
+        }
+        self.client.post(url, dados, format="json", HTTP_IDEMPOTENCY_KEY="e-1")
+
+        response = self.client.post(
+            url,
+            {**dados, "observacao": "outra"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="e-1",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_repeticao_de_escala_nao_duplica(self):
+        url = reverse("escala-list")
+        dados = {
+            "musico": self.lider.id,
+            "evento": self.evento.id,
+            "instrumentos": [self.instrumento.id],
+        }
+
+        respostas = [
+            self.client.post(url, dados, format="json", HTTP_IDEMPOTENCY_KEY="e-2")
+            for _ in range(2)
+        ]
+
+        self.assertEqual([r.status_code for r in respostas], [201, 201])
+        self.assertEqual(respostas[0].data["id"], respostas[1].data["id"])
+        self.assertEqual(Escala.objects.count(), 1)
+
+        # Sem a chave, a repetição cai na validação de duplicidade
+        sem_chave = self.client.post(url, dados, format="json")
+        self.assertEqual(sem_chave.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,219 @@
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Artista, Instrumento, Musica, Musico, RegistroAlteracao
+from core.services import ImportacaoService
+
+CSV_MUSICOS = (
+    "nome;email;instrumento;tipo_usuario\n"
+    "Ana Souza;ana@igreja.com;violão;\n"
+    "Ana Lima;ana@outra.com;Bateria;LIDER\n"
+    "Sem Email;;;\n"
+)
+
+
+class ImportacaoMusicosServiceTest(TestCase):
+    """Testes da importação em lote de músicos."""
+
+    def setUp(self):
+        User.objects.create_user(username="ana", email="ana@antiga.com")
+        Instrumento.objects.create(nome="Violão")
+
+    def test_importa_csv_com_relatorio_por_linha(self):
+        linhas = ImportacaoService.ler_arquivo(CSV_MUSICOS.encode(), "musicos.csv")
+
+        relatorio = ImportacaoService.importar_musicos(linhas, senha="Senha@123")
+
+        self.assertEqual(relatorio["criados"], 2)
+        self.assertEqual(relatorio["erros"], 1)
+        self.assertEqual(
+            [item["username"] for item in relatorio["linhas"][:2]], ["ana1", "ana2"]
+        )
+        self.assertIn("email", relatorio["linhas"][2]["erros"])
+
+        lider = Musico.objects.select_related("user").get(
+            id=relatorio["linhas"][1]["id"]
+        )
+        self.assertEqual(lider.tipo_usuario, "LIDER")
+        self.assertTrue(lider.user.groups.filter(name="Lideres").exists())
+        self.assertTrue(lider.user.check_password("Senha@123"))
+        self.assertEqual(lider.instrumento_principal.nome, "Bateria")
+        # Instrumento existente reaproveitado sem diferenciar maiúsculas
+        self.assertEqual(Instrumento.objects.filter(nome__iexact="violão").count(), 1)
+
+    def test_email_repetido_no_banco_ou_no_lote(self):
+        relatorio = ImportacaoService.importar_musicos(
+            [
+                {"nome": "Antiga", "email": "ana@antiga.com"},
+                {"nome": "Nova", "email": "nova@igreja.com"},
+                {"nome": "Nova de novo", "email": "nova@igreja.com"},
+            ]
+        )
+
+        self.assertEqual(relatorio["criados"], 1)
+        self.assertEqual(
+            [item["status"] for item in relatorio["linhas"]],
+            ["erro", "criado", "erro"],
+        )
+
+    def test_consultas_nao_crescem_com_o_lote(self):
+        linhas = [
+            {"nome": f"Músico {i}", "email": f"musico{i}@igreja.com"} for i in range(30)
+        ]
+
+        with CaptureQueriesContext(connection) as contexto, patch(
+            "core.services.importacao_service.make_password", wraps=make_password
+        ) as hash_:
+            relatorio = ImportacaoService.importar_musicos(linhas)
+
+        self.assertEqual(relatorio["criados"], 30)
+        self.assertLess(len(contexto.captured_queries), 15)
+        # Um só hash da senha inicial para o lote inteiro
+        hash_.assert_called_once()
+
+
+class ImportacaoMusicosAPITest(APITestCase):
+    """Testes do endpoint POST /api/musicos/importar/."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lider", password="123")
+        self.lider = Musico.objects.create(
+            user=self.user, nome="Líder", tipo_usuario="LIDER"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_lider_importa_arquivo(self):
+        arquivo = SimpleUploadedFile("musicos.csv", CSV_MUSICOS.encode())
+
+        response = self.client.post(
+            reverse("musico-importar"), {"arquivo": arquivo}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["criados"], 2)
+
+    def test_musico_comum_nao_importa(self):
+        self.lider.tipo_usuario = "MUSICO"
+        self.lider.save()
+
+        response = self.client.post(
+            reverse("musico-importar"),
+            [{"nome": "Ana", "email": "ana@igreja.com"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(User.objects.filter(email="ana@igreja.com").exists())
+
+
+class ImportacaoMusicasServiceTest(TestCase):
+    """Testes da importação em lote de músicas e artistas."""
+
+    def setUp(self):
+        self.artista = Artista.objects.create(nome="Aline Barros")
+        self.musica = Musica.objects.create(
+            titulo="Ressuscita-me", artista=self.artista
+        )
+
+    def test_texto_colado_deduplica_artistas_e_musicas(self):
+        linhas = ImportacaoService.ler_texto(
+            "Ressuscita-me - aline barros\n"
+            "\n"
+            "Sonda-me - ALINE  BARROS\n"
+            "Lugar Secreto – Gabriela Rocha\n"
+            "Deus de Promessas - Davi Sacer\n"
+            "deus de promessas - Davi Sacer\n"
+            "Sem separador\n"
+        )
+
+        relatorio = ImportacaoService.importar_musicas(linhas)
+
+        self.assertEqual(
+            [item["status"] for item in relatorio["linhas"]],
+            ["existente", "criada", "criada", "criada", "existente", "erro"],
+        )
+        self.assertEqual(relatorio["linhas"][0]["id"], self.musica.id)
+        self.assertEqual(relatorio["artistas_criados"], 2)
+        self.assertEqual(Artista.objects.count(), 3)
+        self.assertEqual(self.artista.musicas.count(), 2)
+        self.assertIn("artista", relatorio["linhas"][5]["erros"])
+
+    def test_le_apenas_o_catalogo_dos_artistas_do_lote(self):
+        outro = Artista.objects.create(nome="Fernandinho")
+        Musica.objects.create(titulo="Galileu", artista=outro)
+
+        with CaptureQueriesContext(connection) as contexto:
+            ImportacaoService.importar_musicas(
+                [{"titulo": "Sonda-me", "artista": "Aline Barros"}]
+            )
+
+        catalogo = [
+            q["sql"]
+            for q in contexto.captured_queries
+            if q["sql"].startswith('SELECT "musicas"."id", "musicas"."artista_id"')
+        ]
+        self.assertIn(f'"artista_id" IN ({self.artista.id})', catalogo[0])
+
+    def test_artista_com_acento_diferente_e_o_mesmo(self):
+        artista = Artista.objects.create(nome="Fernandinho Ministério")
+
+        ImportacaoService.importar_musicas(
+            [{"titulo": "Uma Nova História", "artista": "fernandinho ministerio"}]
+        )
+
+        self.assertEqual(artista.musicas.count(), 1)
+
+    def test_registra_novas_para_sincronizacao(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            relatorio = ImportacaoService.importar_musicas(
+                [{"titulo": "Rendido Estou", "artista": "Aline Barros"}]
+            )
+
+        self.assertTrue(
+            RegistroAlteracao.objects.filter(
+                recurso="musicas", objeto_id=relatorio["linhas"][0]["id"]
+            ).exists()
+        )
+
+    def test_lote_grande_com_poucas_consultas(self):
+        linhas = [
+            {"titulo": f"Música {i}", "artista": f"Artista {i % 50}"}
+            for i in range(2000)
+        ]
+
+        with CaptureQueriesContext(connection) as contexto:
+            relatorio = ImportacaoService.importar_musicas(linhas)
+
+        self.assertEqual(relatorio["criadas"], 2000)
+        # Sem consultas por linha: só os lotes do bulk_create (no SQLite,
+        # limitados pelo número de parâmetros por comando)
+        self.assertLess(len(contexto.captured_queries), 40)
+
+
+class ImportacaoMusicasAPITest(APITestCase):
+    """Testes do endpoint POST /api/musicas/importar/."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lider", password="123")
+        Musico.objects.create(user=self.user, nome="Líder", tipo_usuario="LIDER")
+        self.client.force_authenticate(user=self.user)
+
+    def test_importa_texto_colado(self):
+        response = self.client.post(
+            reverse("musica-importar"),
+            {"texto": "Sonda-me - Aline Barros\nRendido Estou - Aline Barros"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["criadas"], 2)
+        self.assertEqual(response.data["artistas_criados"], 1)
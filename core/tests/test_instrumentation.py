@@ -0,0 +1,96 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.instrumentation import Trace, _trace, span
+from core.models import Artista, Musica, Musico
+
+
+def _registro(logger):
+    """Dados estruturados (``extra``) da linha registrada em sggm.perf."""
+    return logger.info.call_args.kwargs["extra"]
+
+
+def _profiling(**config):
+    return override_settings(
+        SGGM_PROFILING={"HABILITADO": True, "AMOSTRAGEM": 1.0, **config}
+    )
+
+
+class SpanTest(APITestCase):
+    def test_span_sem_trace_nao_faz_nada(self):
+        with span("externo"):
+            pass
+        self.assertIsNone(_trace.get())
+
+    def test_span_acumula_no_trace_atual(self):
+        trace = Trace()
+        token = _trace.set(trace)
+        try:
+            for _ in range(2):
+                with span("externo"):
+                    pass
+        finally:
+            _trace.reset(token)
+
+        self.assertEqual(trace.resumo()["externo"]["n"], 2)
+
+
+class InstrumentacaoMiddlewareTest(APITestCase):
+    """Requisições amostradas registram spans no logger sggm.perf."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="musico", password="123")
+        Musico.objects.create(user=self.user, nome="Músico")
+        artista = Artista.objects.create(nome="Aline Barros")
+        Musica.objects.create(titulo="Ressuscita-me", artista=artista)
+        self.client.force_authenticate(user=self.user)
+
+    @_profiling()
+    def test_registra_spans_de_db_e_renderizacao(self):
+        with patch("core.instrumentation.logger") as logger:
+            response = self.client.get(reverse("musica-list"))
+
+        self.assertEqual(response.status_code, 200)
+        registro = _registro(logger)
+        self.assertEqual(registro["caminho"], reverse("musica-list"))
+        self.assertGreater(registro["spans"]["db"]["n"], 0)
+        self.assertIn("renderizacao", registro["spans"])
+
+    @_profiling(AMOSTRAGEM=0.0)
+    def test_requisicao_fora_da_amostra_nao_registra(self):
+        with patch("core.instrumentation.logger") as logger:
+            self.client.get(reverse("musica-list"))
+        logger.info.assert_not_called()
+
+    def test_desabilitado_por_padrao(self):
+        with patch("core.instrumentation.logger") as logger:
+            self.client.get(reverse("musica-list"))
+        logger.info.assert_not_called()
+
+    def test_captura_profile_de_requisicao_lenta(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            with _profiling(CAPTURA="cprofile", LIMIAR_LENTO_MS=0, DIRETORIO=diretorio):
+                with patch("core.instrumentation.logger") as logger:
+                    self.client.get(reverse("musica-list"))
+
+            arquivos = list(Path(diretorio).glob("*.prof"))
+            self.assertEqual(len(arquivos), 1)
+            self.assertEqual(_registro(logger)["profile"], str(arquivos[0]))
+
+    @_profiling()
+    async def test_view_assincrona_registra_db(self):
+        token = RefreshToken.for_user(self.user).access_token
+        with patch("core.instrumentation.logger") as logger:
+            await self.async_client.get(
+                reverse("async-musico-me"),
+                headers={"AUTHORIZATION": f"Bearer {token}"},
+            )
+
+        self.assertGreater(_registro(logger)["spans"]["db"]["n"], 0)
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Escala, Evento, LembreteEnviado, Musico
+from core.services import LembreteService
+
+
+@patch(
+    "core.services.notification_service.NotificationService"
+    "._ensure_firebase_initialized",
+    return_value=True,
+)
+@patch("core.services.notification_service.messaging")
+class LembreteServiceTest(TestCase):
+    """Testes do agendador de lembretes de eventos e ensaios."""
+
+    def setUp(self):
+        self.agora = timezone.now().replace(second=0, microsecond=0)
+
+    def _musico(self, nome, **kwargs):
+        return Musico.objects.create(
+            user=User.objects.create_user(username=nome, password="123"),
+            nome=nome,
+            fcm_token=f"token-{nome}",
+            **kwargs,
+        )
+
+    def _evento(self, horas, ensaio_horas=None, *musicos):
+        evento = Evento.objects.create(
+            nome="Culto",
+            local="Templo",
+            data_evento=self.agora + timedelta(hours=horas, minutes=2),
+            data_hora_ensaio=(
+                self.agora + timedelta(hours=ensaio_horas, minutes=2)
+                if ensaio_horas is not None
+                else None
+            ),
+        )
+        for musico in musicos:
+            Escala.objects.create(musico=musico, evento=evento)
+        return evento
+
+    def _tokens_enviados(self, messaging):
+        return sorted(
+            token
+            for chamada in messaging.MulticastMessage.call_args_list
+            for token in chamada.kwargs["tokens"]
+        )
+
+    def test_envia_uma_vez_na_janela(self, messaging, _firebase):
+        ana, bia = self._musico("ana"), self._musico("bia")
+        self._evento(24, None, ana, bia)
+        self._evento(3, 3, ana)  # daqui a 3h: só o lembrete do ensaio
+        self._evento(30, None, bia)  # fora da janela
+        inativo = self._musico("caio")
+        self._evento(24, None, inativo)
+        Musico.objects.filter(pk=inativo.pk).update(status="INATIVO")
+
+        enviados = LembreteService.processar(self.agora)
+
+        self.assertEqual(enviados, {"EVENTO": 2, "ENSAIO": 1})
+        self.assertEqual(messaging.send_each_for_multicast.call_count, 2)
+        self.assertEqual(
+            self._tokens_enviados(messaging), ["token-ana", "token-ana", "token-bia"]
+        )
+
+        # Rodada repetida (ou concorrente) não reenvia
+        messaging.reset_mock()
+        self.assertEqual(
+            LembreteService.processar(self.agora), {"EVENTO": 0, "ENSAIO": 0}
+        )
+        messaging.send_each_for_multicast.assert_not_called()
+
+    @override_settings(SGGM_LEMBRETES={"LOTE": 2})
+    def test_percorre_em_lotes(self, messaging, _firebase):
+        messaging.send_each_for_multicast.return_value = Mock(
+            success_count=1, failure_count=0
+        )
+        musicos = [self._musico(f"m{i}") for i in range(5)]
+        self._evento(24, None, *musicos)
+
+        enviados = LembreteService.processar(self.agora)
+
+        self.assertEqual(enviados["EVENTO"], 5)
+        self.assertEqual(messaging.send_each_for_multicast.call_count, 3)
+        self.assertEqual(LembreteEnviado.objects.count(), 5)
+
+    def test_reservado_por_outra_rodada_e_novo_horario(self, messaging, _firebase):
+        ana = self._musico("ana")
+        evento = self._evento(24, None, ana)
+        escala = evento.escalas.get()
+        LembreteEnviado.objects.create(
+            escala=escala,
+            tipo="EVENTO",
+            momento=evento.data_evento,
+            lote="00000000-0000-0000-0000-000000000000",
+        )
+
+        self.assertEqual(LembreteService.processar(self.agora)["EVENTO"], 0)
+
+        # Evento adiado: o novo horário tem o seu próprio lembrete
+        Evento.objects.filter(pk=evento.pk).update(
+            data_evento=evento.data_evento + timedelta(minutes=1)
+        )
+        self.assertEqual(LembreteService.processar(self.agora)["EVENTO"], 1)
+
+    def test_rodada_atrasada_recupera_lembretes(self, messaging, _firebase):
+        ana = self._musico("ana")
+        self._evento(22, None, ana)  # lembrete venceu há ~2h
+
+        # Além do ATRASO_MAXIMO_MINUTOS o lembrete é descartado...
+        self.assertEqual(LembreteService.processar(self.agora)["EVENTO"], 0)
+        # ...mas uma rodada 28 min depois do vencimento ainda o envia
+        atrasada = self.agora - timedelta(minutes=90)
+        self.assertEqual(LembreteService.processar(atrasada)["EVENTO"], 1)
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.api.throttling import consumir
+from core.models import Escala, Evento, Musico
+
+LIMITES_TESTE = {
+    "HABILITADO": True,
+    "ESCOPOS": {
+        "confirmar": {"CAPACIDADE": 2, "POR_MINUTO": 1},
+        "login": {"CAPACIDADE": 1, "POR_MINUTO": 1},
+        "login_usuario": {"CAPACIDADE": 2, "POR_MINUTO": 1},
+    },
+}
+
+
+class TokenBucketTest(SimpleTestCase):
+    """Testes do balde de fichas guardado no cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.agora = 1_000_000.0
+        relogio = patch("core.api.throttling.time.time", lambda: self.agora)
+        relogio.start()
+        self.addCleanup(relogio.stop)
+
+    def _consumir(self):
+        return consumir("limite:teste:1", capacidade=3, por_minuto=6)
+
+    def test_rajada_ate_a_capacidade_e_reposicao(self):
+        self.assertEqual([self._consumir() for _ in range(3)], [None] * 3)
+        self.assertAlmostEqual(self._consumir(), 10)
+
+        self.agora += 10
+        self.assertIsNone(self._consumir())
+        self.assertIsNotNone(self._consumir())
+
+    def test_parado_nao_acumula_alem_da_capacidade(self):
+        self._consumir()
+        self.agora += 300
+
+        self.assertEqual([self._consumir() for _ in range(3)], [None] * 3)
+        self.assertIsNotNone(self._consumir())
+
+
+@override_settings(SGGM_LIMITES=LIMITES_TESTE)
+class LimitesAPITest(APITestCase):
+    """Testes dos limites nos endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="ana", password="123")
+        self.musico = Musico.objects.create(user=self.user, nome="Ana")
+        self.client.force_authenticate(user=self.user)
+        evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now() + timedelta(days=1)
+        )
+        escala = Escala.objects.create(musico=self.musico, evento=evento)
+        self.url = reverse("escala-confirmar", args=[escala.id])
+
+    def test_429_com_retry_after_por_musico(self):
+        for _ in range(2):
+            self.assertEqual(self.client.post(self.url).status_code, 200)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+        # O balde é do músico: líder tem o seu próprio
+        lider = User.objects.create_user(username="lider", password="123")
+        Musico.objects.create(user=lider, nome="Líder", tipo_usuario="LIDER")
+        self.client.force_authenticate(user=lider)
+        self.assertEqual(self.client.post(self.url).status_code, 200)
+
+    def test_login_por_usuario(self):
+        self.client.force_authenticate(user=None)
+        url = reverse("token_obtain_pair")
+
+        self.client.post(url, {"username": "ana", "password": "errada"})
+
+        bloqueado = self.client.post(url, {"username": "ana", "password": "123"})
+        self.assertEqual(bloqueado.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        outro = self.client.post(url, {"username": "bia", "password": "123"})
+        self.assertEqual(outro.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_ignora_x_forwarded_for_forjado(self):
+        self.client.force_authenticate(user=None)
+        url = reverse("token_obtain_pair")
+        dados = {"username": "ana", "password": "errada"}
+
+        self.client.post(url, dados, HTTP_X_FORWARDED_FOR="1.1.1.1")
+        response = self.client.post(url, dados, HTTP_X_FORWARDED_FOR="2.2.2.2")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_por_usuario_de_qualquer_ip(self):
+        self.client.force_authenticate(user=None)
+        url = reverse("token_obtain_pair")
+        dados = {"username": "ana", "password": "errada"}
+
+        respostas = [
+            self.client.post(url, dados, REMOTE_ADDR=f"10.0.0.{i}") for i in range(3)
+        ]
+
+        self.assertEqual(
+            [r.status_code for r in respostas],
+            [401, 401, status.HTTP_429_TOO_MANY_REQUESTS],
+        )
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Instrumento, Musico
+from core.services import LoginService
+
+
+class LoginAPITest(APITestCase):
+    """Testes do pipeline de login (/api/login/)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="ana", password="123")
+        self.musico = Musico.objects.create(
+            user=self.user,
+            nome="Ana",
+            tipo_usuario="LIDER",
+            instrumento_principal=Instrumento.objects.create(nome="Violão"),
+        )
+        self.url = reverse("token_obtain_pair")
+
+    def _login(self, username="ana", password="123"):
+        return self.client.post(self.url, {"username": username, "password": password})
+
+    @override_settings(SGGM_LOGIN={"ULTIMO_LOGIN_INTERVALO": 60})
+    def test_uma_consulta_e_last_login_em_lote(self):
+        outro = User.objects.create_user(username="bia", password="123")
+
+        with self.assertNumQueries(1):
+            response = self._login()
+        self._login("bia")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["instrumento_principal"]["nome"], "Violão")
+        self.assertTrue(response.data["is_lider"])
+        self.assertIsNone(User.objects.get(pk=self.user.pk).last_login)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(LoginService.descarregar(), 2)
+        self.assertIsNotNone(User.objects.get(pk=self.user.pk).last_login)
+        self.assertIsNotNone(User.objects.get(pk=outro.pk).last_login)
+
+    def test_rehash_ao_trocar_o_hasher(self):
+        with override_settings(
+            PASSWORD_HASHERS=[
+                "django.contrib.auth.hashers.ScryptPasswordHasher",
+                "django.contrib.auth.hashers.MD5PasswordHasher",
+            ]
+        ):
+            response = self._login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+
+    def test_usuario_sem_musico(self):
+        User.objects.create_user(username="avulso", password="123")
+
+        response = self._login("avulso")
+
+        self.assertIsNone(response.data["musico_id"])
+        self.assertEqual(response.data["tipo_usuario"], "USER")
+        self.assertFalse(response.data["is_lider"])
+
+    def test_credenciais_invalidas(self):
+        self.assertEqual(
+            self._login(password="errada").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self._login("ninguem").status_code, status.HTTP_401_UNAUTHORIZED
+        )
@@ -0,0 +1,139 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.metrics import (
+    CACHE,
+    CONSULTAS,
+    FCM_ENVIOS,
+    LOGINS,
+    REQUISICOES,
+    medir_envio_fcm,
+    registro,
+)
+from core.models import Artista, Musica, Musico
+from core.services import AgendaService
+
+
+class MetricasMiddlewareTest(APITestCase):
+    """Requisições contabilizadas por ação do viewset."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="musico", password="123")
+        self.musico = Musico.objects.create(user=self.user, nome="Músico")
+        artista = Artista.objects.create(nome="Aline Barros")
+        Musica.objects.create(titulo="Ressuscita-me", artista=artista)
+        self.client.force_authenticate(user=self.user)
+
+    def test_conta_requisicoes_e_consultas_por_acao(self):
+        antes = REQUISICOES.valor(view="MusicaViewSet.list", status=200)
+        consultas = CONSULTAS.valor(view="MusicaViewSet.list")
+
+        self.client.get(reverse("musica-list"))
+
+        self.assertEqual(
+            REQUISICOES.valor(view="MusicaViewSet.list", status=200), antes + 1
+        )
+        self.assertGreater(CONSULTAS.valor(view="MusicaViewSet.list"), consultas)
+
+    def test_login_conta_sucesso_e_falha(self):
+        sucesso = LOGINS.valor(resultado="sucesso")
+        falha = LOGINS.valor(resultado="falha")
+
+        self.client.post(
+            reverse("token_obtain_pair"), {"username": "musico", "password": "123"}
+        )
+        self.client.post(
+            reverse("token_obtain_pair"), {"username": "musico", "password": "x"}
+        )
+
+        self.assertEqual(LOGINS.valor(resultado="sucesso"), sucesso + 1)
+        self.assertEqual(LOGINS.valor(resultado="falha"), falha + 1)
+
+    def test_cache_da_agenda_conta_hit_e_miss(self):
+        hits = CACHE.valor(cache="agenda", resultado="hit")
+
+        AgendaService.invalidar(self.musico.id)
+        AgendaService.obter_feed(self.musico.id)
+        AgendaService.obter_feed(self.musico.id)
+
+        self.assertEqual(CACHE.valor(cache="agenda", resultado="hit"), hits + 1)
+
+    def test_envio_fcm_com_erro_conta_falha(self):
+        falhas = FCM_ENVIOS.valor(tipo="escala", resultado="falha")
+
+        with self.assertRaises(RuntimeError):
+            with medir_envio_fcm("escala"):
+                raise RuntimeError("FCM indisponível")
+
+        self.assertEqual(FCM_ENVIOS.valor(tipo="escala", resultado="falha"), falhas + 1)
+
+
+class MetricasViewTest(APITestCase):
+    """Exposição em /metrics no formato de texto do Prometheus."""
+
+    @override_settings(SGGM_METRICAS={"TOKEN": "segredo"})
+    def test_exporta_formato_texto(self):
+        cabecalho = {"HTTP_AUTHORIZATION": "Bearer segredo"}
+        self.client.get(reverse("metrics"), **cabecalho)
+
+        response = self.client.get(reverse("metrics"), **cabecalho)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        texto = response.content.decode()
+        self.assertIn("# TYPE sggm_http_duracao_segundos histogram", texto)
+        self.assertIn(
+            'sggm_http_duracao_segundos_bucket{view="metricas_view.get",le="+Inf"}',
+            texto,
+        )
+
+    @override_settings(SGGM_METRICAS={"TOKEN": "segredo"})
+    def test_token_exigido_quando_configurado(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer segredo"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_sem_token_so_com_debug(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+    def test_descarta_snapshot_de_processo_encerrado(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            encerrado = Path(diretorio, "sggm-99999999.json")
+            encerrado.write_text(
+                json.dumps({"sggm_logins_total": [[["sucesso"], 1000]]})
+            )
+            local = LOGINS.valor(resultado="sucesso")
+
+            with override_settings(SGGM_METRICAS={"DIRETORIO": diretorio}):
+                texto = registro.exportar()
+
+            self.assertFalse(encerrado.exists())
+        self.assertIn(f'sggm_logins_total{{resultado="sucesso"}} {local}\n', texto)
+
+    def test_soma_snapshots_de_outros_processos(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            # Snapshot de outro worker do gunicorn
+            Path(diretorio, "sggm-1.json").write_text(
+                json.dumps({"sggm_logins_total": [[["sucesso"], 1000]]})
+            )
+            local = LOGINS.valor(resultado="sucesso")
+
+            with override_settings(SGGM_METRICAS={"DIRETORIO": diretorio}):
+                with patch("core.metrics.os.getpid", return_value=2):
+                    texto = registro.exportar()
+                self.assertTrue(Path(diretorio, "sggm-2.json").exists())
+
+        self.assertIn(f'sggm_logins_total{{resultado="sucesso"}} {local + 1000}', texto)
@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Group, User
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from django.test import TestCase
@@ -173,6 +173,32 @@ class MusicoModelTest(TestCase):
         user3.refresh_from_db()
         self.assertTrue(user3.is_staff)
 
+    def test_mudar_tipo_troca_grupo_sem_apagar_grupos(self):
+        """Só o vínculo do usuário muda; os grupos continuam existindo."""
+        Musico.objects.create(user=self.user, nome="Músico", tipo_usuario="MUSICO")
+        musico = Musico.objects.get(user=self.user)
+
+        musico.tipo_usuario = "LIDER"
+        musico.save()
+
+        self.assertEqual(
+            list(self.user.groups.values_list("name", flat=True)), ["Lideres"]
+        )
+        self.assertTrue(Group.objects.filter(name="Músicos").exists())
+
+    def test_salvar_com_update_fields_nao_valida_nem_sincroniza(self):
+        """Atualização do token FCM: apenas o UPDATE."""
+        Musico.objects.create(user=self.user, nome="Músico")
+        musico = Musico.objects.get(user=self.user)
+
+        musico.fcm_token = "novo-token"
+        with self.assertNumQueries(1):
+            musico.save(update_fields=["fcm_token"])
+
+        musico.nome = "Músico Renomeado"
+        with self.assertNumQueries(3):  # clean(), FK do usuário, UPDATE
+            musico.save()
+
     def test_str_retorna_nome(self):
         """Testa método __str__."""
         musico = Musico.objects.create(user=self.user, nome="João Silva")
@@ -424,6 +450,28 @@ class EscalaModelTest(TestCase):
         escala.refresh_from_db()
         self.assertTrue(escala.confirmado)
 
+    def test_alterar_campos_nao_chave_nao_revalida(self):
+        """Sem SELECTs de validação quando músico/evento não mudam."""
+        Escala.objects.create(musico=self.musico, evento=self.evento)
+        escala = Escala.objects.get(musico=self.musico)
+        self.musico.status = "INATIVO"
+        self.musico.save()
+
+        # Só o UPDATE: sem savepoint (o log de sincronização fica para o commit)
+        escala.confirmado = True
+        with self.assertNumQueries(1):
+            escala.save(update_fields=["confirmado"])
+        escala.observacao = "Chega às 18h"
+        with self.assertNumQueries(1):
+            escala.save()
+
+    def test_duplicidade_sem_validacao_vem_do_banco(self):
+        """Com validar=False o banco barra a duplicidade como ValidationError."""
+        Escala.objects.create(musico=self.musico, evento=self.evento)
+        with self.assertRaises(ValidationError):
+            Escala(musico=self.musico, evento=self.evento).save(validar=False)
+        self.assertEqual(Escala.objects.count(), 1)
+
     def test_cascata_delete_evento(self):
         """Testa CASCADE na deleção de evento."""
         escala = Escala.objects.create(musico=self.musico, evento=self.evento)
@@ -0,0 +1,65 @@
+import msgpack
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Artista, Musica, Musico
+
+MSGPACK = "application/msgpack"
+
+
+class MessagePackAPITest(APITestCase):
+    """Negociação de conteúdo MessagePack nas views DRF e assíncronas."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lider", password="123")
+        self.musico = Musico.objects.create(
+            user=self.user, nome="Líder", tipo_usuario="LIDER"
+        )
+        self.artista = Artista.objects.create(nome="Aline Barros")
+        Musica.objects.create(titulo="Ressuscita-me", artista=self.artista, tom="G")
+        self.client.force_authenticate(user=self.user)
+
+    def test_accept_msgpack_retorna_mesmo_conteudo_do_json(self):
+        url = reverse("musica-list")
+
+        json_response = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT=MSGPACK)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], MSGPACK)
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+        self.assertLess(len(response.content), len(json_response.content))
+
+    def test_json_continua_padrao(self):
+        response = self.client.get(reverse("musica-list"))
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_corpo_em_msgpack_e_aceito(self):
+        response = self.client.post(
+            reverse("musica-list"),
+            msgpack.packb({"titulo": "Galileu", "artista": self.artista.id}),
+            content_type=MSGPACK,
+            HTTP_ACCEPT=MSGPACK,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(msgpack.unpackb(response.content)["titulo"], "Galileu")
+
+    def test_corpo_msgpack_invalido_retorna_400(self):
+        response = self.client.post(
+            reverse("musica-list"), b"\xc1", content_type=MSGPACK
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_view_assincrona_negocia_msgpack(self):
+        token = RefreshToken.for_user(self.user).access_token
+        response = await self.async_client.get(
+            reverse("async-musico-me"),
+            headers={"AUTHORIZATION": f"Bearer {token}", "ACCEPT": MSGPACK},
+        )
+
+        self.assertEqual(response["Content-Type"], MSGPACK)
+        self.assertEqual(msgpack.unpackb(response.content)["nome"], "Líder")
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.api import permissions
+from core.api.permissions import Papel, papel_do_request
+from core.models import Musico
+
+
+class PapelTest(TestCase):
+    """Testes da resolução do papel do usuário."""
+
+    def test_papeis(self):
+        admin = User.objects.create_superuser(username="root", password="123")
+        user = User.objects.create_user(username="ana", password="123")
+        musico = Musico.objects.create(user=user, nome="Ana", tipo_usuario="ADMIN")
+
+        anonimo = Papel(AnonymousUser())
+        self.assertFalse(anonimo.autenticado)
+        self.assertIsNone(anonimo.musico)
+        self.assertFalse(anonimo.is_lider)
+
+        superusuario = Papel(admin)
+        self.assertIsNone(superusuario.musico)
+        self.assertTrue(superusuario.is_lider and superusuario.is_admin)
+
+        papel = Papel(user)
+        self.assertTrue(papel.is_lider and papel.is_admin)
+        self.assertTrue(papel.e_o_musico(musico.id))
+
+    def test_memorizado_na_requisicao(self):
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_user(username="ana", password="123")
+
+        self.assertIs(papel_do_request(request), papel_do_request(request))
+
+
+class PapelPorRequisicaoAPITest(APITestCase):
+    """Permissões, queryset e serializer compartilham o mesmo papel."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="ana", password="123")
+        self.musico = Musico.objects.create(user=self.user, nome="Ana")
+        self.client.force_authenticate(user=self.user)
+
+    def test_resolve_uma_vez_por_requisicao(self):
+        with patch.object(permissions, "Papel", wraps=Papel) as resolver:
+            response = self.client.patch(
+                reverse("musico-detail", args=[self.musico.id]),
+                {"telefone": "11999999999"},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(resolver.call_count, 1)
+
+    def test_musico_comum_nao_edita_outro_perfil(self):
+        outro = Musico.objects.create(nome="Bia")
+
+        response = self.client.patch(
+            reverse("musico-detail", args=[outro.id]), {"telefone": "1"}
+        )
+
+        # Fora da queryset do músico comum
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,202 @@
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import (
+    Artista,
+    Escala,
+    Evento,
+    Instrumento,
+    ItemRepertorio,
+    Musica,
+    Musico,
+    SerieEvento,
+)
+from core.services import RecorrenciaService
+
+# Segunda-feira
+INICIO = date(2030, 1, 7)
+
+
+class OcorrenciasTest(SimpleTestCase):
+    """Testes do cálculo das datas de uma série."""
+
+    def test_semanal_a_cada_duas_semanas_ancorada_no_inicio(self):
+        serie = SerieEvento(
+            frequencia="SEMANAL", intervalo=2, dia_semana=6, data_inicio=INICIO
+        )
+
+        datas = RecorrenciaService.ocorrencias(
+            serie, date(2030, 1, 14), date(2030, 2, 28)
+        )
+
+        # Âncora em 13/01; a partir de 14/01 a próxima é 27/01
+        self.assertEqual(
+            datas, [date(2030, 1, 27), date(2030, 2, 10), date(2030, 2, 24)]
+        )
+
+    def test_mensal_primeiro_domingo_e_ultimo_sabado(self):
+        primeiro = SerieEvento(
+            frequencia="MENSAL",
+            intervalo=1,
+            dia_semana=6,
+            semana_do_mes=1,
+            data_inicio=INICIO,
+        )
+        ultimo = SerieEvento(
+            frequencia="MENSAL",
+            intervalo=1,
+            dia_semana=5,
+            semana_do_mes=-1,
+            data_inicio=INICIO,
+        )
+
+        self.assertEqual(
+            RecorrenciaService.ocorrencias(primeiro, INICIO, date(2030, 3, 31)),
+            [date(2030, 2, 3), date(2030, 3, 3)],
+        )
+        self.assertEqual(
+            RecorrenciaService.ocorrencias(ultimo, INICIO, date(2030, 3, 31)),
+            [date(2030, 1, 26), date(2030, 2, 23), date(2030, 3, 30)],
+        )
+
+
+class RecorrenciaServiceTest(TestCase):
+    """Testes da geração em lote das ocorrências."""
+
+    def setUp(self):
+        self.modelo = Evento.objects.create(
+            nome="Culto modelo", data_evento=datetime(2029, 12, 30, 19), local="Templo"
+        )
+        violao = Instrumento.objects.create(nome="Violão")
+        self.ana = Musico.objects.create(nome="Ana")
+        self.bia = Musico.objects.create(nome="Bia")
+        for musico in (self.ana, self.bia):
+            escala = Escala.objects.create(musico=musico, evento=self.modelo)
+            escala.instrumentos.add(violao)
+        Musico.objects.filter(pk=self.bia.pk).update(
+            status="AFASTADO",
+            data_inicio_inatividade=date(2030, 1, 10),
+            data_fim_inatividade=date(2030, 1, 16),
+        )
+        artista = Artista.objects.create(nome="Aline Barros")
+        self.musicas = [
+            Musica.objects.create(titulo=f"Música {i}", artista=artista)
+            for i in range(2)
+        ]
+        ItemRepertorio.objects.create(
+            evento=self.modelo, musica=self.musicas[1], posicao=1
+        )
+        ItemRepertorio.objects.create(
+            evento=self.modelo, musica=self.musicas[0], posicao=2
+        )
+        self.serie = SerieEvento.objects.create(
+            nome="Culto de Domingo",
+            local="Templo",
+            dia_semana=6,
+            horario=time(19),
+            antecedencia_ensaio=timedelta(days=1),
+            data_inicio=INICIO,
+            evento_modelo=self.modelo,
+            copiar_repertorio=True,
+        )
+
+    def test_gera_eventos_com_escala_e_repertorio_do_modelo(self):
+        ids = RecorrenciaService.gerar(self.serie, date(2030, 1, 31))
+
+        eventos = list(Evento.objects.filter(id__in=ids).order_by("data_evento"))
+        self.assertEqual(
+            [evento.data_evento for evento in eventos],
+            [datetime(2030, 1, d, 19) for d in (13, 20, 27)],
+        )
+        self.assertEqual(eventos[0].data_hora_ensaio, datetime(2030, 1, 12, 19))
+        # Bia está afastada só na primeira ocorrência
+        self.assertEqual([evento.escalas.count() for evento in eventos], [1, 2, 2])
+        escala = Escala.objects.get(evento=eventos[1], musico=self.ana)
+        self.assertEqual(
+            list(escala.instrumentos.values_list("nome", flat=True)), ["Violão"]
+        )
+        self.assertEqual(
+            list(eventos[2].musicas_em_ordem()), [self.musicas[1], self.musicas[0]]
+        )
+
+    def test_copia_repetida_por_gerador_concorrente(self):
+        ids = RecorrenciaService.gerar(self.serie, date(2030, 1, 20))
+        eventos = list(Evento.objects.filter(id__in=ids))
+
+        # Outro gerador já copiou o modelo para os mesmos eventos
+        RecorrenciaService._copiar_modelo(self.serie, eventos)
+
+        self.assertEqual(ItemRepertorio.objects.filter(evento__in=eventos).count(), 4)
+        self.assertEqual(Escala.objects.filter(evento__in=eventos).count(), 3)
+
+    def test_estende_sem_duplicar(self):
+        RecorrenciaService.gerar(self.serie, date(2030, 1, 20))
+
+        novos = RecorrenciaService.gerar(self.serie, date(2030, 1, 31))
+
+        self.assertEqual(len(novos), 1)
+        self.assertEqual(self.serie.eventos.count(), 3)
+        self.assertEqual(RecorrenciaService.gerar(self.serie, date(2030, 1, 31)), [])
+
+    def test_consultas_nao_dependem_do_horizonte(self):
+        outra = SerieEvento.objects.get(pk=self.serie.pk)
+        outra.pk = None
+        outra.save()
+
+        with CaptureQueriesContext(connection) as curto:
+            RecorrenciaService.gerar(self.serie, date(2030, 2, 28))
+        with CaptureQueriesContext(connection) as longo:
+            RecorrenciaService.gerar(outra, date(2030, 12, 31))
+
+        self.assertEqual(len(curto.captured_queries), len(longo.captured_queries))
+
+
+class SerieEventoAPITest(APITestCase):
+    """Testes do endpoint /api/series/."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lider", password="123")
+        self.lider = Musico.objects.create(
+            user=self.user, nome="Líder", tipo_usuario="LIDER"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.dados = {
+            "nome": "Célula",
+            "tipo": "CELULA",
+            "local": "Casa da Ana",
+            "frequencia": "SEMANAL",
+            "dia_semana": 2,
+            "horario": "20:00",
+            "data_inicio": str(date.today()),
+        }
+
+    def test_criar_serie_gera_ocorrencias(self):
+        response = self.client.post(reverse("serieevento-list"), self.dados)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        serie = SerieEvento.objects.get()
+        self.assertIsNotNone(serie.gerado_ate)
+        self.assertGreaterEqual(serie.eventos.count(), 8)
+
+    def test_mensal_exige_semana_do_mes(self):
+        response = self.client.post(
+            reverse("serieevento-list"), {**self.dados, "frequencia": "MENSAL"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("semana_do_mes", response.data)
+
+    def test_musico_comum_nao_cria(self):
+        self.lider.tipo_usuario = "MUSICO"
+        self.lider.save()
+
+        response = self.client.post(reverse("serieevento-list"), self.dados)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
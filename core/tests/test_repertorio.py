@@ -0,0 +1,187 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import (
+    Artista,
+    Evento,
+    ItemRepertorio,
+    Musica,
+    Musico,
+    RegistroAlteracao,
+)
+from core.services import RepertorioService
+
+
+def _escritas(contexto):
+    return [
+        consulta["sql"]
+        for consulta in contexto.captured_queries
+        if consulta["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        and "eventos_repertorio" in consulta["sql"]
+    ]
+
+
+class RepertorioServiceTest(TestCase):
+    """Testes do repertório ordenado (ItemRepertorio)."""
+
+    def setUp(self):
+        artista = Artista.objects.create(nome="Aline Barros")
+        self.evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now() + timedelta(days=2), local="Templo"
+        )
+        self.musicas = [
+            Musica.objects.create(titulo=f"Música {i}", artista=artista)
+            for i in range(5)
+        ]
+        self.ids = [musica.id for musica in self.musicas]
+        RepertorioService.adicionar(self.evento, self.ids[:4])
+
+    def test_adiciona_na_ordem_enviada(self):
+        self.assertEqual(RepertorioService.musica_ids(self.evento), self.ids[:4])
+        self.assertEqual(
+            [musica.id for musica in self.evento.musicas_em_ordem()], self.ids[:4]
+        )
+
+    def test_mover_grava_apenas_a_linha_movida(self):
+        a, b, c, d = self.ids[:4]
+
+        with CaptureQueriesContext(connection) as contexto:
+            ordem = RepertorioService.aplicar(
+                self.evento, [{"acao": "mover", "musica": d, "posicao": 1}]
+            )
+
+        self.assertEqual(ordem, [a, d, b, c])
+        self.assertEqual(RepertorioService.musica_ids(self.evento), [a, d, b, c])
+        self.assertEqual(len(_escritas(contexto)), 1)
+
+    def test_substituir_mantem_no_lugar_o_que_ja_esta_em_ordem(self):
+        a, b, c, d, e = self.ids
+
+        with CaptureQueriesContext(connection) as contexto:
+            ordem = RepertorioService.substituir(self.evento, [b, c, d, a, e])
+
+        self.assertEqual(ordem, [b, c, d, a, e])
+        self.assertEqual(RepertorioService.musica_ids(self.evento), ordem)
+        # Só "a" muda de posição (um UPDATE) e "e" entra (um INSERT)
+        self.assertEqual(len(_escritas(contexto)), 2)
+
+    def test_renumera_quando_nao_ha_espaco(self):
+        a, b = self.ids[:2]
+        ItemRepertorio.objects.filter(evento=self.evento).update(posicao=0)
+
+        ordem = RepertorioService.aplicar(
+            self.evento, [{"acao": "inserir", "musica": self.ids[4], "posicao": 1}]
+        )
+
+        self.assertEqual(ordem[:3], [a, self.ids[4], b])
+        self.assertEqual(RepertorioService.musica_ids(self.evento), ordem)
+
+    def test_operacao_invalida_nao_grava_nada(self):
+        with self.assertRaises(ValueError):
+            RepertorioService.aplicar(
+                self.evento,
+                [
+                    {"acao": "remover", "musica": self.ids[0]},
+                    {"acao": "mover", "musica": self.ids[4], "posicao": 0},
+                ],
+            )
+
+        self.assertEqual(RepertorioService.musica_ids(self.evento), self.ids[:4])
+
+    def test_registra_evento_para_sincronizacao(self):
+        antes = RegistroAlteracao.objects.filter(
+            recurso="eventos", objeto_id=self.evento.id
+        ).count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RepertorioService.aplicar(
+                self.evento, [{"acao": "remover", "musica": self.ids[0]}]
+            )
+
+        self.assertEqual(
+            RegistroAlteracao.objects.filter(
+                recurso="eventos", objeto_id=self.evento.id
+            ).count(),
+            antes + 1,
+        )
+
+
+class RepertorioAPITest(APITestCase):
+    """Testes de PATCH /api/eventos/{id}/repertorio/ e ações relacionadas."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lider", password="123")
+        self.lider = Musico.objects.create(
+            user=self.user, nome="Líder", tipo_usuario="LIDER"
+        )
+        artista = Artista.objects.create(nome="Aline Barros")
+        self.evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now() + timedelta(days=2), local="Templo"
+        )
+        self.ids = [
+            Musica.objects.create(titulo=f"Música {i}", artista=artista).id
+            for i in range(3)
+        ]
+        RepertorioService.adicionar(self.evento, self.ids)
+        self.url = reverse("evento-reordenar-repertorio", args=[self.evento.id])
+        self.client.force_authenticate(user=self.user)
+
+    def test_aplica_operacoes_e_detalhe_segue_a_ordem(self):
+        a, b, c = self.ids
+
+        response = self.client.patch(
+            self.url,
+            {
+                "operacoes": [
+                    {"acao": "mover", "musica": c, "posicao": 0},
+                    {"acao": "remover", "musica": a},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["repertorio"], [c, b])
+        detalhe = self.client.get(reverse("evento-detail", args=[self.evento.id]))
+        self.assertEqual([m["id"] for m in detalhe.data["repertorio"]], [c, b])
+
+    def test_adicionar_repertorio_na_posicao(self):
+        artista = Artista.objects.get()
+        nova = Musica.objects.create(titulo="Nova", artista=artista)
+
+        response = self.client.post(
+            reverse("evento-adicionar-repertorio", args=[self.evento.id]),
+            {"musicas": [nova.id], "posicao": 1},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["repertorio"][1], nova.id)
+
+    def test_operacao_invalida(self):
+        response = self.client.patch(
+            self.url, {"operacoes": [{"acao": "trocar", "musica": 1}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_musico_comum_nao_reordena(self):
+        self.lider.tipo_usuario = "MUSICO"
+        self.lider.save()
+
+        response = self.client.patch(
+            self.url,
+            {"operacoes": [{"acao": "remover", "musica": self.ids[0]}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(RepertorioService.musica_ids(self.evento), self.ids)
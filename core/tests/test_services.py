@@ -5,7 +5,15 @@ from django.core.exceptions import ValidationError
 from django.test import TestCase
 from django.utils import timezone
 
-from core.models import Escala, Evento, Instrumento, Musico
+from core.models import (
+    Artista,
+    ComentarioPerformance,
+    Escala,
+    Evento,
+    Instrumento,
+    Musica,
+    Musico,
+)
 from core.services import GerenciadorEscala, NotificationService
 
 
@@ -327,3 +335,38 @@ class NotificationServiceTest(TestCase):
 
         # Firebase initialize_app não deve ser chamado pois já estava inicializado
         mock_firebase.initialize_app.assert_not_called()
+
+
+@patch(
+    "core.services.notification_service.NotificationService"
+    "._ensure_firebase_initialized",
+    return_value=True,
+)
+@patch("core.services.notification_service.messaging")
+class FeedbackEscaladosTest(TestCase):
+    """Notificação de novo feedback para os escalados do evento."""
+
+    def test_um_multicast_apos_o_commit(self, mock_messaging, _firebase):
+        evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now(), local="Templo"
+        )
+        musicos = [
+            Musico.objects.create(nome=f"Músico {i}", fcm_token=f"token-{i}")
+            for i in range(3)
+        ]
+        for musico in musicos:
+            Escala.objects.create(musico=musico, evento=evento)
+        musica = Musica.objects.create(
+            titulo="Oceans", artista=Artista.objects.create(nome="Hillsong")
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ComentarioPerformance.objects.create(
+                evento=evento, musica=musica, autor=musicos[0], texto="Boa!"
+            )
+            mock_messaging.send_each_for_multicast.assert_not_called()
+
+        mock_messaging.send_each_for_multicast.assert_called_once()
+        _, kwargs = mock_messaging.MulticastMessage.call_args
+        # O autor não é notificado
+        self.assertCountEqual(kwargs["tokens"], ["token-1", "token-2"])
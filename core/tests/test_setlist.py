@@ -0,0 +1,129 @@
+import gzip
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Artista, Evento, Musica, Musico
+from core.services import SetlistService
+
+
+class SetlistServiceTest(SimpleTestCase):
+    """Testes das partes HTTP do pacote de cifras."""
+
+    def test_negocia_codificacao_respeitando_q0(self):
+        self.assertEqual(SetlistService.negociar_codificacao("gzip, deflate"), "gzip")
+        self.assertEqual(SetlistService.negociar_codificacao("gzip;q=0"), "identity")
+        self.assertEqual(SetlistService.negociar_codificacao(""), "identity")
+
+    def test_intervalo(self):
+        self.assertEqual(SetlistService.intervalo("bytes=10-", 100), (10, 99))
+        self.assertEqual(SetlistService.intervalo("bytes=-20", 100), (80, 99))
+        self.assertEqual(SetlistService.intervalo("bytes=0-500", 100), (0, 99))
+        self.assertIs(SetlistService.intervalo("bytes=100-", 100), False)
+        self.assertIsNone(SetlistService.intervalo("bytes=0-1,5-9", 100))
+
+
+class SetlistAPITest(APITestCase):
+    """Testes do endpoint GET /api/eventos/{id}/setlist/."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="musico", password="123")
+        Musico.objects.create(user=self.user, nome="Músico")
+        artista = Artista.objects.create(nome="Aline Barros")
+        self.evento = Evento.objects.create(
+            nome="Culto de Domingo",
+            data_evento=timezone.now() + timedelta(days=3),
+            local="Templo",
+        )
+        self.digno = Musica.objects.create(
+            titulo="Digno", artista=artista, tom="G", conteudo_cifra="[G]Digno [C]és"
+        )
+        self.sonda = Musica.objects.create(
+            titulo="Sonda-me", artista=artista, tom="D", conteudo_cifra="[D]Sonda-me"
+        )
+        # Ordem de inclusão no repertório, não a do id/título
+        self.evento.repertorio.add(self.sonda)
+        self.evento.repertorio.add(self.digno)
+        self.url = reverse("evento-setlist", args=[self.evento.id])
+        self.client.force_authenticate(user=self.user)
+
+    def _dados(self, response):
+        return json.loads(gzip.decompress(response.content))
+
+    def test_pacote_gzip_na_ordem_do_repertorio_e_transposto(self):
+        response = self.client.get(
+            self.url, {"tons": f"{self.digno.id}:A"}, HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        dados = self._dados(response)
+        self.assertEqual(dados["evento"]["nome"], "Culto de Domingo")
+        self.assertEqual(
+            [musica["titulo"] for musica in dados["musicas"]], ["Sonda-me", "Digno"]
+        )
+        self.assertEqual(dados["musicas"][1]["tom"], "A")
+        self.assertEqual(dados["musicas"][1]["conteudo_cifra"], "[A]Digno [D]és")
+
+    def test_etag_revalida_e_muda_com_a_cifra(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        etag = response["ETag"]
+
+        revalidacao = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(revalidacao.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.digno.conteudo_cifra = "[G]Digno [Em]és"
+        self.digno.save()
+        alterada = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(alterada.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(alterada["ETag"], etag)
+
+    def test_range_retoma_download(self):
+        completo = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        etag = completo["ETag"]
+
+        parcial = self.client.get(
+            self.url,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_RANGE="bytes=10-",
+            HTTP_IF_RANGE=etag,
+        )
+
+        self.assertEqual(parcial.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        tamanho = len(completo.content)
+        self.assertEqual(parcial["Content-Range"], f"bytes 10-{tamanho - 1}/{tamanho}")
+        self.assertEqual(completo.content[:10] + parcial.content, completo.content)
+
+        # If-Range de uma versão antiga: devolve o pacote inteiro
+        antigo = self.client.get(
+            self.url,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_RANGE="bytes=10-",
+            HTTP_IF_RANGE='"antigo-gzip"',
+        )
+        self.assertEqual(antigo.status_code, status.HTTP_200_OK)
+
+        fora = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_RANGE=f"bytes={tamanho}-"
+        )
+        self.assertEqual(
+            fora.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+
+    def test_tons_invalidos(self):
+        for tons in ("abc", f"{self.digno.id}:X#", "99999:A"):
+            response = self.client.get(self.url, {"tons": tons})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,108 @@
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Escala, Evento, Musico
+from core.pubsub import MemoriaBackend, canal_evento, get_backend
+
+
+class MemoriaBackendTest(TestCase):
+    """Testes do backend de pub/sub em memória."""
+
+    async def test_assinante_recebe_mensagem_do_proprio_canal(self):
+        backend = MemoriaBackend()
+        async with backend.assinar("canal-a") as assinatura:
+            backend.publicar("canal-b", "ignorada")
+            backend.publicar("canal-a", "ola")
+            self.assertEqual(await assinatura.receber(timeout=1), "ola")
+
+    async def test_receber_retorna_none_no_timeout(self):
+        backend = MemoriaBackend()
+        async with backend.assinar("canal") as assinatura:
+            self.assertIsNone(await assinatura.receber(timeout=0.01))
+
+    async def test_fila_cheia_descarta_mensagem_mais_antiga(self):
+        backend = MemoriaBackend(tamanho_fila=2)
+        async with backend.assinar("canal") as assinatura:
+            for mensagem in ["1", "2", "3"]:
+                backend.publicar("canal", mensagem)
+            self.assertEqual(await assinatura.receber(timeout=1), "2")
+            self.assertEqual(await assinatura.receber(timeout=1), "3")
+
+    async def test_saida_do_contexto_remove_assinante(self):
+        backend = MemoriaBackend()
+        async with backend.assinar("canal"):
+            self.assertEqual(backend.total_assinantes("canal"), 1)
+        self.assertEqual(backend.total_assinantes("canal"), 0)
+
+
+class EventoStreamTest(TestCase):
+    """Testes do endpoint SSE por evento."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lider", password="123")
+        Musico.objects.create(user=self.user, nome="Líder", tipo_usuario="LIDER")
+        self.evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now() + timedelta(days=1), local="Igreja"
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.headers = {"AUTHORIZATION": f"Bearer {token}"}
+
+    async def test_evento_inexistente_retorna_404(self):
+        response = await self.async_client.get(
+            reverse("async-evento-stream", kwargs={"pk": 999}), headers=self.headers
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_stream_entrega_mensagem_publicada(self):
+        response = await self.async_client.get(
+            reverse("async-evento-stream", kwargs={"pk": self.evento.id}),
+            headers=self.headers,
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        conteudo = response.streaming_content
+        primeiro = await anext(conteudo)
+        self.assertIn(b"retry:", primeiro)
+
+        mensagem = json.dumps({"tipo": "confirmacao", "dados": {"escala_id": 7}})
+        get_backend().publicar(canal_evento(self.evento.id), mensagem)
+
+        evento_sse = await anext(conteudo)
+        await conteudo.aclose()
+
+        self.assertEqual(evento_sse, b'event: confirmacao\ndata: {"escala_id": 7}\n\n')
+
+
+class PublicacaoAoVivoTest(APITestCase):
+    """Ações síncronas publicam atualizações no canal do evento."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="musico", password="123")
+        self.musico = Musico.objects.create(user=self.user, nome="Músico")
+        self.evento = Evento.objects.create(
+            nome="Culto", data_evento=timezone.now() + timedelta(days=1), local="Igreja"
+        )
+        self.escala = Escala.objects.create(musico=self.musico, evento=self.evento)
+        self.client.force_authenticate(user=self.user)
+
+    def test_confirmar_publica_confirmacao(self):
+        url = reverse("escala-confirmar", kwargs={"pk": self.escala.id})
+
+        with patch.object(get_backend(), "publicar") as publicar:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url, {"confirmado": True}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        canal, mensagem = publicar.call_args[0]
+        self.assertEqual(canal, canal_evento(self.evento.id))
+        self.assertEqual(json.loads(mensagem)["tipo"], "confirmacao")
+        self.assertTrue(json.loads(mensagem)["dados"]["confirmado"])
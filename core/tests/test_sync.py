@@ -0,0 +1,219 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import (
+    Artista,
+    Escala,
+    Evento,
+    Instrumento,
+    Musica,
+    Musico,
+    RegistroAlteracao,
+)
+from core.services import SincronizacaoService
+
+
+class SincronizacaoAPITest(APITestCase):
+    """Testes do endpoint de sincronização incremental (/api/sync/)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="musico", password="123")
+        self.musico = Musico.objects.create(user=self.user, nome="Músico")
+        self.user_outro = User.objects.create_user(username="outro", password="123")
+        self.outro = Musico.objects.create(user=self.user_outro, nome="Outro")
+
+        # O log é gravado no commit: os testes executam os callbacks
+        with self.captureOnCommitCallbacks(execute=True):
+            self.artista = Artista.objects.create(nome="Fernandinho")
+            self.evento = Evento.objects.create(
+                nome="Culto",
+                data_evento=timezone.now() + timedelta(days=1),
+                local="Igreja",
+            )
+        self.url = reverse("sync")
+        self.client.force_authenticate(user=self.user)
+
+    def _sync(self, since):
+        return self.client.get(self.url, {"since": since})
+
+    def test_sem_cursor_pede_carga_completa(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["reset"])
+        self.assertEqual(response.data["cursor"], SincronizacaoService.cursor_atual())
+
+    def test_cursor_invalido_retorna_400(self):
+        self.assertEqual(self._sync("abc").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_a_frente_do_log_pede_reset(self):
+        response = self._sync(SincronizacaoService.cursor_atual() + 10)
+        self.assertTrue(response.data["reset"])
+
+    def test_retorna_apenas_alteracoes_desde_o_cursor(self):
+        cursor = SincronizacaoService.cursor_atual()
+        with self.captureOnCommitCallbacks(execute=True):
+            musica = Musica.objects.create(titulo="Galileu", artista=self.artista)
+
+        response = self._sync(cursor)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["reset"])
+        self.assertEqual(
+            [m["id"] for m in response.data["musicas"]["salvos"]], [musica.id]
+        )
+        self.assertEqual(
+            response.data["musicas"]["salvos"][0]["artista_nome"], "Fernandinho"
+        )
+        self.assertEqual(response.data["eventos"], {"salvos": [], "removidos": []})
+
+        seguinte = self._sync(response.data["cursor"])
+        self.assertEqual(seguinte.data["musicas"]["salvos"], [])
+
+    def test_remocao_gera_tombstone(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            musica = Musica.objects.create(titulo="Galileu", artista=self.artista)
+        cursor = SincronizacaoService.cursor_atual()
+        musica_id = musica.id
+        with self.captureOnCommitCallbacks(execute=True):
+            musica.delete()
+
+        response = self._sync(cursor)
+
+        self.assertEqual(response.data["musicas"]["removidos"], [musica_id])
+        self.assertEqual(response.data["musicas"]["salvos"], [])
+
+    def test_criada_e_removida_no_intervalo_vale_ultima_operacao(self):
+        cursor = SincronizacaoService.cursor_atual()
+        with self.captureOnCommitCallbacks(execute=True):
+            musica = Musica.objects.create(titulo="Galileu", artista=self.artista)
+            musica_id = musica.id
+            musica.delete()
+
+        response = self._sync(cursor)
+
+        self.assertEqual(response.data["musicas"]["salvos"], [])
+        self.assertEqual(response.data["musicas"]["removidos"], [musica_id])
+
+    def test_escala_de_outro_musico_nao_e_enviada(self):
+        cursor = SincronizacaoService.cursor_atual()
+        with self.captureOnCommitCallbacks(execute=True):
+            propria = Escala.objects.create(musico=self.musico, evento=self.evento)
+            alheia = Escala.objects.create(musico=self.outro, evento=self.evento)
+
+        response = self._sync(cursor)
+
+        escalas = response.data["escalas"]
+        self.assertEqual([e["id"] for e in escalas["salvos"]], [propria.id])
+        self.assertIn(alheia.id, escalas["removidos"])
+        # A escala aparece aninhada no evento, que também é reenviado
+        self.assertEqual(
+            [e["id"] for e in response.data["eventos"]["salvos"]], [self.evento.id]
+        )
+
+    def test_alteracao_no_repertorio_reenvia_evento(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            musica = Musica.objects.create(titulo="Galileu", artista=self.artista)
+        cursor = SincronizacaoService.cursor_atual()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evento.repertorio.add(musica)
+
+        response = self._sync(cursor)
+        evento = response.data["eventos"]["salvos"][0]
+        self.assertEqual(evento["repertorio"][0]["id"], musica.id)
+
+    def test_log_gravado_no_commit_com_um_insert(self):
+        instrumento = Instrumento.objects.create(nome="Baixo")
+        RegistroAlteracao.objects.all().delete()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            escala = Escala.objects.create(musico=self.musico, evento=self.evento)
+            escala.instrumentos.set([instrumento])
+            try:
+                with transaction.atomic():
+                    Artista.objects.create(nome="Revertido")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        # Nada é gravado antes do commit; o savepoint revertido leva o seu lote
+        self.assertFalse(RegistroAlteracao.objects.exists())
+
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(
+            set(RegistroAlteracao.objects.values_list("recurso", "objeto_id")),
+            {("escalas", escala.id), ("eventos", self.evento.id)},
+        )
+
+    def test_paginacao_por_limite(self):
+        cursor = SincronizacaoService.cursor_atual()
+        for i in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                Artista.objects.create(nome=f"Artista {i}")
+
+        primeira = SincronizacaoService.alteracoes_desde(cursor, limite=2)
+        segunda = SincronizacaoService.alteracoes_desde(primeira["cursor"], limite=2)
+
+        self.assertTrue(primeira["mais"])
+        self.assertEqual(len(primeira["alteracoes"]["artistas"]["salvos"]), 2)
+        self.assertFalse(segunda["mais"])
+        self.assertEqual(len(segunda["alteracoes"]["artistas"]["salvos"]), 1)
+
+    def test_cursor_anterior_aos_registros_expurgados_pede_reset(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Artista.objects.create(nome="Antigo")
+        cursor = SincronizacaoService.cursor_atual()
+        with self.captureOnCommitCallbacks(execute=True):
+            Artista.objects.create(nome="Novo")
+        RegistroAlteracao.objects.filter(id__lte=cursor).delete()
+
+        self.assertTrue(self._sync(cursor - 1).data["reset"])
+        self.assertFalse(self._sync(cursor).data["reset"])
+
+    @override_settings(SGGM_SINCRONIZACAO={"ATRASO_COMMIT_SEGUNDOS": 60})
+    def test_registros_recentes_aguardam_o_atraso_de_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            antigo = Artista.objects.create(nome="Antigo")
+        RegistroAlteracao.objects.update(
+            registrado_em=timezone.now() - timedelta(minutes=5)
+        )
+        cursor = SincronizacaoService.cursor_atual()
+        with self.captureOnCommitCallbacks(execute=True):
+            Artista.objects.create(nome="Recente")
+
+        # O registro recente não é entregue nem avança o cursor
+        registro = RegistroAlteracao.objects.get(
+            recurso="artistas", objeto_id=antigo.id
+        )
+        self.assertEqual(cursor, registro.id)
+        delta = SincronizacaoService.alteracoes_desde(cursor - 1)
+        self.assertEqual(delta["alteracoes"]["artistas"]["salvos"], [antigo.id])
+        self.assertEqual(delta["cursor"], cursor)
+        self.assertFalse(delta["mais"])
+
+    def test_expurgo_remove_prefixo_antigo(self):
+        cursor = SincronizacaoService.cursor_atual()
+        RegistroAlteracao.objects.filter(id__lte=cursor).update(
+            registrado_em=timezone.now() - timedelta(days=100)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Artista.objects.create(nome="Novo")
+
+        call_command("expurgar_registros_alteracao", stdout=StringIO())
+
+        self.assertFalse(RegistroAlteracao.objects.filter(id__lte=cursor).exists())
+        self.assertEqual(RegistroAlteracao.objects.count(), 1)
+        self.assertFalse(self._sync(cursor).data["reset"])
+        self.assertTrue(self._sync(cursor - 1).data["reset"])
@@ -0,0 +1,83 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.checks import cache_compartilhado
+from core.models import Musico
+
+
+class RefreshRotativoAPITest(APITestCase):
+    """Testes da rotação de refresh tokens com negação no cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="ana", password="123")
+        Musico.objects.create(user=self.user, nome="Ana")
+        response = self.client.post(
+            reverse("token_obtain_pair"), {"username": "ana", "password": "123"}
+        )
+        self.refresh = response.data["refresh"]
+
+    def _renovar(self, refresh):
+        return self.client.post(reverse("token_refresh"), {"refresh": refresh})
+
+    def test_rotaciona_sem_consultar_o_banco(self):
+        primeira = self._renovar(self.refresh)
+
+        self.assertEqual(primeira.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(primeira.data["refresh"], self.refresh)
+        self.assertIn("access", primeira.data)
+        with self.assertNumQueries(0):
+            segunda = self._renovar(primeira.data["refresh"])
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+
+    def test_reuso_revoga_a_familia(self):
+        nova = self._renovar(self.refresh).data["refresh"]
+
+        reuso = self._renovar(self.refresh)
+
+        self.assertEqual(reuso.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._renovar(nova).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revogar_no_logout(self):
+        response = self.client.post(reverse("token_revogar"), {"refresh": self.refresh})
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            self._renovar(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_revogar_com_corpo_invalido(self):
+        response = self.client.post(reverse("token_revogar"), [1], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_troca_de_senha_impede_renovar(self):
+        self.user.set_password("nova")
+        self.user.save()
+
+        response = self._renovar(self.refresh)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CacheCompartilhadoCheckTest(SimpleTestCase):
+    """Testes da checagem core.E001 (cache local fora de DEBUG)."""
+
+    LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+
+    @override_settings(DEBUG=False, EXIGIR_CACHE_COMPARTILHADO=True, CACHES=LOCMEM)
+    def test_cache_local_em_producao_e_erro(self):
+        erros = cache_compartilhado(None)
+
+        self.assertEqual([erro.id for erro in erros], ["core.E001"])
+        with self.settings(DEBUG=True):
+            self.assertEqual(cache_compartilhado(None), [])
+
+    @override_settings(DEBUG=False, EXIGIR_CACHE_COMPARTILHADO=True, CACHES=REDIS)
+    def test_cache_compartilhado_passa(self):
+        self.assertEqual(cache_compartilhado(None), [])